@@ -0,0 +1,641 @@
+"""Moduł zawiera definicje funkcji obsługujących tryb wsadowy programu (bez interakcji z użytkownikiem)
+
+Tryb wsadowy uruchamiany jest przez podanie argumentów wywołania skryptu 'main.py', np.:
+    python main.py create-db moja_baza
+    python main.py create-table moja_baza dania
+    python main.py create-table moja_baza dania_zima --shared
+    python main.py share-table moja_baza dania
+    python main.py import-csv moja_baza dania example_dishes.csv
+    python main.py set-weight moja_baza dania "zupa pomidorowa" 3
+    python main.py make-plan moja_baza dania plan 01-01-2024 31-01-2024 7
+    python main.py export-plan moja_baza dania plan 01-01-2024 31-01-2024 7 --output plan.ics
+    python main.py export-plans moja_baza dania plan 01-01-2024 31-01-2024 7 1000 --output plany.zip
+    python main.py run-jobs zadania.jsonl
+
+Plik z zadaniami (run-jobs) zawiera w każdej linii obiekt JSON z kluczem 'command' (nazwa polecenia)
+oraz kluczami odpowiadającymi argumentom polecenia, np.:
+    {"command": "make-plan", "database": "moja_baza", "table": "dania", "name": "plan",
+     "start_date": "01-01-2024", "end_date": "31-01-2024", "min_interval_time": 7}
+Wszystkie zadania z pliku wykonywane są w jednym procesie - połączenia z bazami danych oraz pamięć
+podręczna dań są wykorzystywane ponownie przez kolejne zadania. Plany tworzone z podanym ziarnem
+(--seed) trafiają do pamięci podręcznej planów, więc powtórzone zadanie nie losuje planu ponownie.
+
+Zawiera definicje następujących funkcji:
+    * build_parser - tworzy parser argumentów wywołania programu
+    * run_cli - uruchamia tryb wsadowy dla podanych argumentów wywołania
+    * run_job_file - wykonuje zadania zapisane w pliku w formacie JSON Lines
+    * run_job - wykonuje pojedyncze zadanie
+    * create_db - tworzy nową bazę danych
+    * create_table - tworzy nową tabelę w bazie danych
+    * share_table - przenosi dania z tabeli do wspólnego magazynu dań
+    * import_csv_job - importuje dania z pliku csv do tabeli
+    * set_weight - ustawia wagę dania
+    * make_plan - tworzy plan obiadów i wyświetla go w konsoli
+    * export_plan - tworzy plan obiadów i zapisuje go do pliku
+    * export_plans - tworzy wiele planów obiadów i zapisuje je do jednego pliku lub archiwum .zip
+
+Zawiera również definicję klasy BatchSession przechowującej połączenia z bazami danych pomiędzy zadaniami.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import datetime
+from classes import Database, Table, LunchPlan, PlanStore, PlanCache, instrumentation
+from database_management_functions import import_csv
+from plan_generation_functions import generate_plans, iter_plan_entries
+from plan_export_functions import EXPORTERS, export_plan as export_plan_file, export_plans as export_plans_file
+
+
+class BatchSession:
+    """Klasa przechowująca otwarte połączenia z bazami danych pomiędzy kolejnymi zadaniami
+
+    Attributes
+    ----------
+    directory : str
+        katalog, w którym znajdują się pliki z bazami danych
+    profile : str
+        nazwa profilu połączenia z atrybutu ConnectionManager.PROFILES
+    databases : dict
+        słownik z otwartymi bazami danych (instancje klasy Database) - kluczem jest nazwa bazy
+    plan_cache : obiekt klasy PlanCache
+        pamięć podręczna planów generowanych z podanym ziarnem, wspólna dla wszystkich zadań
+
+    Methods
+    ----------
+    database(name, create)
+        zwraca obiekt reprezentujący bazę danych o podanej nazwie
+    close()
+        zwalnia wszystkie połączenia z bazami danych
+    """
+
+    def __init__(self, directory='databases', profile=None, cache_directory=None):
+        """
+        Parameters
+        ----------
+        directory : str
+            katalog, w którym znajdują się pliki z bazami danych
+        profile : str, optional
+            nazwa profilu połączenia z atrybutu ConnectionManager.PROFILES
+        cache_directory : str, optional
+            katalog, w którym zapisywane są plany z pamięci podręcznej
+        """
+
+        self.directory = directory
+        self.profile = profile
+        self.databases = {}
+        self.plan_cache = PlanCache(directory=cache_directory)
+
+    def database(self, name, create=False):
+        """Zwraca obiekt reprezentujący bazę danych o podanej nazwie
+
+        Parameters
+        ----------
+        name : str
+            nazwa bazy danych (nie trzeba dodawać rozszerzenia .db)
+        create : bool
+            decyduje, czy baza danych może zostać utworzona, jeżeli nie istnieje
+
+        Returns
+        ----------
+        obiekt klasy Database
+            obiekt reprezentujący bazę danych
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli baza nie istnieje, a parametr 'create' ma wartość False
+        """
+
+        if not name.endswith('.db'):
+            name = name + '.db'
+
+        if name not in self.databases:
+            if not create and not os.path.exists(os.path.join(self.directory, name)):
+                raise ValueError(f"Baza danych '{name}' nie istnieje.")
+            os.makedirs(self.directory, exist_ok=True)
+            self.databases[name] = Database(name, self.directory, self.profile)
+
+        return self.databases[name]
+
+    def close(self):
+        """Zwalnia wszystkie połączenia z bazami danych"""
+
+        for db in self.databases.values():
+            db.close_connection()
+        self.databases = {}
+
+
+def create_db(session, database):
+    """Tworzy nową bazę danych w katalogu z bazami danych
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    database : str
+        nazwa tworzonej bazy danych
+    """
+
+    db = session.database(database, create=True)
+    print(f"Pomyślnie utworzono bazę danych '{db.name}'.")
+
+
+def create_table(session, database, table, shared=False):
+    """Tworzy nową tabelę z daniami obiadowymi w bazie danych
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    database : str
+        nazwa bazy danych
+    table : str
+        nazwa tworzonej tabeli
+    shared : bool
+        decyduje, czy tabela korzysta ze wspólnego magazynu dań
+
+    Raises
+    ----------
+    ValueError
+        zwraca wyjątek, jeżeli tabela o podanej nazwie już istnieje
+    """
+
+    db = session.database(database)
+    if db.has_table(table):
+        raise ValueError(f"Tabela '{table}' już istnieje w bazie danych '{db.name}'.")
+    if table.startswith('_'):
+        raise ValueError("Nazwy zaczynające się od znaku '_' są zarezerwowane dla tabel wewnętrznych programu.")
+
+    db.create_table(table, shared)
+    print(f"Pomyślnie utworzono tabelę '{table}' w bazie danych '{db.name}'")
+
+
+def share_table(session, database, table):
+    """Przenosi dania z tabeli do wspólnego magazynu dań
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    database : str
+        nazwa bazy danych
+    table : str
+        nazwa tabeli
+
+    Raises
+    ----------
+    ValueError
+        zwraca wyjątek, jeżeli tabela o podanej nazwie nie istnieje
+    """
+
+    db = _table(session, database, table).database
+    db.share_table(table)
+    print(f"Tabela '{table}' z bazy danych '{db.name}' korzysta ze wspólnego magazynu dań")
+
+
+def import_csv_job(session, database, table, file, chunk_size=10000, reject_file=None, progress=False,
+                   near_duplicates=None, similarity=None):
+    """Importuje dania z pliku csv do tabeli przy użyciu funkcji 'import_csv'
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    database : str
+        nazwa bazy danych
+    table : str
+        nazwa tabeli
+    file : str
+        ścieżka do pliku csv
+    chunk_size : int
+        liczba wierszy odczytywanych i walidowanych jednocześnie
+    reject_file : str, optional
+        ścieżka do pliku z odrzuconymi wierszami
+    progress : bool
+        decyduje, czy w konsoli wyświetlany jest postęp importu
+    near_duplicates : str, optional
+        sposób obsługi dań prawie identycznych z daniami z tabeli - 'flag' lub 'merge'
+    similarity : float, optional
+        próg podobieństwa nazw dań
+    """
+
+    inserted, duplicates, rejected, similar = import_csv(_table(session, database, table), file, chunk_size,
+                                                         reject_file, progress, near_duplicates, similarity)
+    print(f"Zaimportowano plik '{file}' do tabeli '{table}': dodane dania: {inserted}, "
+          f"powtórzenia: {duplicates}, odrzucone wiersze: {rejected}")
+    if similar:
+        print(f"Dania prawie identyczne z daniami z tabeli: {similar} "
+              f"({'scalone' if near_duplicates == 'merge' else 'dodane'})")
+
+
+def set_weight(session, database, table, dish_name, weight):
+    """Ustawia wagę dania wykorzystywaną przy losowaniu planu z uwzględnieniem wag
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    database : str
+        nazwa bazy danych
+    table : str
+        nazwa tabeli
+    dish_name : str
+        nazwa dania
+    weight : float
+        waga dania - liczba większa od zera
+    """
+
+    table = _table(session, database, table)
+    if not table.contains(dish_name):
+        raise ValueError(f"Danie '{dish_name}' nie istnieje w tabeli '{table.table_name}'.")
+
+    table.set_weight(dish_name, float(weight))
+    print(f"Ustawiono wagę dania '{dish_name}' na {float(weight)}")
+
+
+def make_plan(session, database, table, name, start_date, end_date, min_interval_time, store=False,
+              two_course=False, weighted=False, seed=None):
+    """Tworzy plan obiadów i wyświetla go w konsoli
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    database : str
+        nazwa bazy danych
+    table : str
+        nazwa tabeli, na podstawie której tworzony jest plan
+    name : str
+        nazwa planu
+    start_date : str
+        data początkowa planu w formacie 'dzień-miesiąc-rok'
+    end_date : str
+        data końcowa planu w formacie 'dzień-miesiąc-rok'
+    min_interval_time : int
+        odstęp czasu liczony w dniach, w którym żaden obiad nie może się powtórzyć
+    store : bool
+        decyduje, czy plan zostanie zapisany w bazie danych (z uwzględnieniem obiadów z poprzedniego planu
+        o tej samej nazwie)
+    two_course : bool
+        decyduje, czy tworzony jest plan obiadów dwudaniowych (pierwsze i drugie danie każdego dnia)
+    weighted : bool
+        decyduje, czy obiady losowane są z uwzględnieniem wag dań
+    seed : int, optional
+        ziarno generatora liczb losowych - plan z podanym ziarnem jest powtarzalny i trafia do pamięci
+        podręcznej planów sesji
+    """
+
+    lunch_plan = _lunch_plan(session, database, table, name, start_date, end_date, min_interval_time, weighted,
+                             seed)
+    lunch_plan.print_plan(_plan_entries(session, lunch_plan, store, two_course))
+
+
+def export_plan(session, database, table, name, start_date, end_date, min_interval_time, output=None,
+                store=False, two_course=False, weighted=False, seed=None, file_format=None):
+    """Tworzy plan obiadów i zapisuje go do pliku bez komunikatów i odliczania
+
+    Plan zapisywany jest strumieniowo w formacie txt, csv, jsonl lub ics (moduł plan_export_functions)
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    database : str
+        nazwa bazy danych
+    table : str
+        nazwa tabeli, na podstawie której tworzony jest plan
+    name : str
+        nazwa planu
+    start_date : str
+        data początkowa planu w formacie 'dzień-miesiąc-rok'
+    end_date : str
+        data końcowa planu w formacie 'dzień-miesiąc-rok'
+    min_interval_time : int
+        odstęp czasu liczony w dniach, w którym żaden obiad nie może się powtórzyć
+    output : str, optional
+        ścieżka do zapisywanego pliku, domyślnie nazwa planu z rozszerzeniem formatu
+    store : bool
+        decyduje, czy plan zostanie zapisany w bazie danych (z uwzględnieniem obiadów z poprzedniego planu
+        o tej samej nazwie)
+    two_course : bool
+        decyduje, czy tworzony jest plan obiadów dwudaniowych (pierwsze i drugie danie każdego dnia)
+    weighted : bool
+        decyduje, czy obiady losowane są z uwzględnieniem wag dań
+    seed : int, optional
+        ziarno generatora liczb losowych - plan z podanym ziarnem jest powtarzalny i trafia do pamięci
+        podręcznej planów sesji
+    file_format : str, optional
+        format pliku (txt, csv, jsonl lub ics), domyślnie odczytywany z rozszerzenia pliku
+    """
+
+    lunch_plan = _lunch_plan(session, database, table, name, start_date, end_date, min_interval_time, weighted,
+                             seed)
+    if output is None:
+        output = f"{name}.{file_format or 'txt'}"
+    export_plan_file(name, _plan_entries(session, lunch_plan, store, two_course), output, file_format)
+
+
+def export_plans(session, database, table, name, start_date, end_date, min_interval_time, count, output=None,
+                 root_seed=None, processes=None, file_format=None):
+    """Tworzy wiele planów obiadów i zapisuje je do jednego pliku lub archiwum .zip
+
+    Plany tworzone są równolegle (funkcja generate_plans), a kolejne plany otrzymują nazwy z numerem,
+    np. 'plan_1', 'plan_2'. Ziarno każdego planu wyznaczane jest z ziarna głównego, więc wynik z tym samym
+    ziarnem głównym jest zawsze taki sam
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    database : str
+        nazwa bazy danych
+    table : str
+        nazwa tabeli, na podstawie której tworzone są plany
+    name : str
+        nazwa planów
+    start_date : str
+        data początkowa planów w formacie 'dzień-miesiąc-rok'
+    end_date : str
+        data końcowa planów w formacie 'dzień-miesiąc-rok'
+    min_interval_time : int
+        odstęp czasu liczony w dniach, w którym żaden obiad nie może się powtórzyć
+    count : int
+        liczba tworzonych planów
+    output : str, optional
+        ścieżka do zapisywanego pliku lub archiwum, domyślnie nazwa planów z rozszerzeniem .zip
+    root_seed : int, optional
+        ziarno główne, z którego wyznaczane są ziarna kolejnych planów
+    processes : int, optional
+        liczba procesów roboczych, domyślnie liczba rdzeni procesora
+    file_format : str, optional
+        format plików (txt, csv, jsonl lub ics), domyślnie odczytywany z rozszerzenia pliku
+        (csv dla archiwum .zip)
+    """
+
+    lunch_plan = _lunch_plan(session, database, table, name, start_date, end_date, min_interval_time)
+    if output is None:
+        output = f"{name}.zip"
+
+    specs = [(f"{name}_{number}", lunch_plan.start_date, lunch_plan.end_date, lunch_plan.min_interval_time, None)
+             for number in range(1, int(count) + 1)]
+    dish_names, plans = generate_plans(lunch_plan.table, specs, processes, root_seed=root_seed)
+    export_plans_file(((plan_name, iter_plan_entries(dish_names, plan_start_date, dish_ids))
+                       for plan_name, plan_start_date, dish_ids in plans), output, file_format)
+    print(f"Zapisano {len(plans)} planów w pliku '{output}'")
+
+
+def _plan_entries(session, lunch_plan, store, two_course):
+    """Zwraca obiady z planu - jeżeli parametr 'store' ma wartość True, plan jest też zapisywany w bazie"""
+
+    if two_course:
+        if store:
+            raise ValueError("Plany obiadów dwudaniowych nie mogą być zapisywane w bazie danych.")
+        return lunch_plan.iter_two_course_plan()
+    if not store:
+        if lunch_plan.seed is None:
+            return lunch_plan.iter_plan()
+        return session.plan_cache.make_plan(lunch_plan)
+
+    # plan zapisywany w bazie zależy od obiadów z poprzedniego planu, dlatego nie trafia do pamięci podręcznej
+    plan_store = PlanStore(lunch_plan.database)
+    lunch_plan.make_plan(plan_store)
+    plan_store.save(lunch_plan)
+    return lunch_plan.lunch_plan
+
+
+def _table(session, database, table):
+    """Zwraca obiekt klasy Table, sprawdzając wcześniej, czy tabela istnieje"""
+
+    db = session.database(database)
+    if not db.has_table(table):
+        raise ValueError(f"Tabela '{table}' nie istnieje w bazie danych '{db.name}'.")
+    return Table(db, table)
+
+
+def _lunch_plan(session, database, table, name, start_date, end_date, min_interval_time, weighted=False,
+                seed=None):
+    """Waliduje parametry planu obiadów i zwraca obiekt klasy LunchPlan"""
+
+    table = _table(session, database, table)
+    start_date = _parse_date(start_date)
+    end_date = _parse_date(end_date)
+    min_interval_time = int(min_interval_time)
+    number_of_dishes = table.count_dishes()
+
+    if end_date < start_date:
+        raise ValueError("Data końcowa nie może być wcześniejsza od daty początkowej!")
+    if min_interval_time < 2 or min_interval_time > number_of_dishes:
+        raise ValueError(f"Minimalny odstęp czasu musi być liczbą większą lub równą 2 oraz nie większą "
+                         f"niż {number_of_dishes}!")
+
+    return LunchPlan(table.database, table, (name, start_date, end_date, min_interval_time), weighted, seed)
+
+
+def _parse_date(date):
+    """Zamienia datę w formacie 'dzień-miesiąc-rok' na obiekt klasy datetime.date"""
+
+    if isinstance(date, datetime.date):
+        return date
+    return datetime.datetime.strptime(date, '%d-%m-%Y').date()
+
+
+COMMANDS = {
+    'create-db': create_db,
+    'create-table': create_table,
+    'share-table': share_table,
+    'import-csv': import_csv_job,
+    'set-weight': set_weight,
+    'make-plan': make_plan,
+    'export-plan': export_plan,
+    'export-plans': export_plans,
+}
+
+
+def run_job(session, job):
+    """Wykonuje pojedyncze zadanie
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    job : dict
+        słownik z nazwą polecenia (klucz 'command') oraz jego argumentami
+
+    Raises
+    ----------
+    ValueError
+        zwraca wyjątek, jeżeli polecenie o podanej nazwie nie istnieje
+    """
+
+    job = dict(job)
+    command = job.pop('command', None)
+    if command not in COMMANDS:
+        raise ValueError(f"Nieznane polecenie '{command}'. Dostępne polecenia: {list(COMMANDS)}")
+
+    COMMANDS[command](session, **job)
+
+
+def run_job_file(session, job_file):
+    """Wykonuje zadania zapisane w pliku w formacie JSON Lines
+
+    Błąd w jednym zadaniu nie przerywa wykonywania kolejnych - informacja o nim wyświetlana jest
+    na standardowym wyjściu błędów wraz z numerem linii pliku
+
+    Parameters
+    ----------
+    session : obiekt klasy BatchSession
+        sesja przechowująca połączenia z bazami danych
+    job_file : str
+        ścieżka do pliku z zadaniami
+
+    Returns
+    ----------
+    int
+        liczba zadań zakończonych błędem
+    """
+
+    failed = 0
+
+    with open(job_file, 'r') as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                run_job(session, json.loads(line))
+            except (ValueError, TypeError, OSError, sqlite3.Error) as error:
+                failed += 1
+                print(f"Zadanie w linii {line_number} zakończyło się błędem: {error}", file=sys.stderr)
+
+    return failed
+
+
+def build_parser():
+    """Tworzy parser argumentów wywołania programu w trybie wsadowym
+
+    Returns
+    ----------
+    obiekt klasy argparse.ArgumentParser
+        parser argumentów wywołania
+    """
+
+    parser = argparse.ArgumentParser(prog='main.py', description="Tryb wsadowy programu do tworzenia planów obiadów")
+    parser.add_argument('--directory', default='databases', help="katalog z plikami baz danych")
+    parser.add_argument('--profile', default=None, help="profil połączenia z bazą danych, np. 'wal' lub 'bulk'")
+    parser.add_argument('--cache-dir', default=None,
+                        help="katalog, w którym zapisywane są plany tworzone z podanym ziarnem")
+    parser.add_argument('--instrument', action='store_true',
+                        help="mierzy czas operacji i zlicza polecenia SQL - podsumowanie wyświetlane jest na końcu")
+    parser.add_argument('--instrument-json', default=None,
+                        help="plik JSON, do którego zapisywane są statystyki zebrane z opcją --instrument")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparser = subparsers.add_parser('create-db', help="tworzy nową bazę danych")
+    subparser.add_argument('database')
+
+    subparser = subparsers.add_parser('create-table', help="tworzy nową tabelę w bazie danych")
+    subparser.add_argument('database')
+    subparser.add_argument('table')
+    subparser.add_argument('--shared', action='store_true',
+                           help="tabela korzysta ze wspólnego magazynu dań "
+                                "(nazwy dań zapisywane są raz dla całej bazy)")
+
+    subparser = subparsers.add_parser('share-table', help="przenosi dania z tabeli do wspólnego magazynu dań")
+    subparser.add_argument('database')
+    subparser.add_argument('table')
+
+    subparser = subparsers.add_parser('import-csv', help="importuje dania z pliku csv do tabeli")
+    subparser.add_argument('database')
+    subparser.add_argument('table')
+    subparser.add_argument('file')
+    subparser.add_argument('--chunk-size', type=int, default=10000)
+    subparser.add_argument('--reject-file', default=None)
+    subparser.add_argument('--progress', action='store_true', help="wyświetla postęp importu")
+    subparser.add_argument('--near-duplicates', choices=('flag', 'merge'), default=None,
+                           help="zapisuje do osobnego pliku (flag) lub scala z istniejącymi (merge) dania "
+                                "o nazwach prawie identycznych z daniami z tabeli")
+    subparser.add_argument('--similarity', type=float, default=None,
+                           help="próg podobieństwa nazw dań z przedziału (0, 1]")
+
+    subparser = subparsers.add_parser('set-weight', help="ustawia wagę dania")
+    subparser.add_argument('database')
+    subparser.add_argument('table')
+    subparser.add_argument('dish_name')
+    subparser.add_argument('weight', type=float)
+
+    for command, help_text in (('make-plan', "tworzy plan obiadów i wyświetla go w konsoli"),
+                               ('export-plan', "tworzy plan obiadów i zapisuje go do pliku")):
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument('database')
+        subparser.add_argument('table')
+        subparser.add_argument('name')
+        subparser.add_argument('start_date', help="data w formacie 'dzień-miesiąc-rok'")
+        subparser.add_argument('end_date', help="data w formacie 'dzień-miesiąc-rok'")
+        subparser.add_argument('min_interval_time', type=int)
+        subparser.add_argument('--store', action='store_true', help="zapisuje plan w bazie danych")
+        subparser.add_argument('--two-course', action='store_true',
+                               help="tworzy plan obiadów dwudaniowych (pierwsze i drugie danie każdego dnia)")
+        subparser.add_argument('--weighted', action='store_true', help="losuje obiady z uwzględnieniem wag dań")
+        subparser.add_argument('--seed', type=int, default=None,
+                               help="ziarno generatora liczb losowych - plan jest powtarzalny")
+        if command == 'export-plan':
+            subparser.add_argument('--output', default=None)
+            subparser.add_argument('--format', dest='file_format', choices=tuple(EXPORTERS),
+                                   default=None, help="format pliku, domyślnie odczytywany z rozszerzenia")
+
+    subparser = subparsers.add_parser('export-plans', help="tworzy wiele planów obiadów i zapisuje je do "
+                                                           "jednego pliku lub archiwum .zip")
+    subparser.add_argument('database')
+    subparser.add_argument('table')
+    subparser.add_argument('name')
+    subparser.add_argument('start_date', help="data w formacie 'dzień-miesiąc-rok'")
+    subparser.add_argument('end_date', help="data w formacie 'dzień-miesiąc-rok'")
+    subparser.add_argument('min_interval_time', type=int)
+    subparser.add_argument('count', type=int)
+    subparser.add_argument('--output', default=None)
+    subparser.add_argument('--format', dest='file_format', choices=tuple(EXPORTERS), default=None,
+                           help="format plików, domyślnie odczytywany z rozszerzenia (csv dla archiwum .zip)")
+    subparser.add_argument('--root-seed', type=int, default=None,
+                           help="ziarno główne, z którego wyznaczane są ziarna kolejnych planów")
+    subparser.add_argument('--processes', type=int, default=None, help="liczba procesów roboczych")
+
+    subparser = subparsers.add_parser('run-jobs', help="wykonuje zadania z pliku w formacie JSON Lines")
+    subparser.add_argument('job_file')
+
+    return parser
+
+
+def run_cli(argv):
+    """Uruchamia tryb wsadowy dla podanych argumentów wywołania
+
+    Parameters
+    ----------
+    argv : list
+        lista argumentów wywołania (bez nazwy skryptu)
+
+    Returns
+    ----------
+    int
+        kod wyjścia programu - 0, jeżeli wszystkie operacje zakończyły się powodzeniem
+    """
+
+    arguments = vars(build_parser().parse_args(argv))
+    session = BatchSession(arguments.pop('directory'), arguments.pop('profile'), arguments.pop('cache_dir'))
+    instrument_json = arguments.pop('instrument_json')
+    if arguments.pop('instrument') or instrument_json:
+        instrumentation.enable()
+
+    try:
+        if arguments['command'] == 'run-jobs':
+            return 1 if run_job_file(session, arguments['job_file']) else 0
+        run_job(session, arguments)
+        return 0
+    except (ValueError, OSError, sqlite3.Error) as error:
+        print(f"Błąd: {error}", file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+        if instrument_json:
+            instrumentation.write_snapshot(instrument_json)
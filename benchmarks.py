@@ -0,0 +1,330 @@
+"""Skrypt mierzący czas wykonywania najważniejszych operacji programu
+
+Skrypt działa bez dostępu do sieci i bez istniejących baz danych - tabele z syntetycznymi daniami
+('danie 1', 'danie 2', ...) tworzone są w tymczasowych plikach SQLite, usuwanych po zakończeniu pomiarów.
+Mierzony jest czas wykonania następujących operacji:
+    * insert - dodanie pojedynczego dania (Table.insert),
+    * import_csv - import pliku csv o podanej liczbie wierszy (tak jak w funkcji 'csv_reader'),
+    * list_dishes - odczyt dań z tabeli bez pamięci podręcznej (cold) i z pamięcią podręczną (warm),
+    * list_tables - odczyt listy tabel bez pamięci podręcznej (cold) i z pamięcią podręczną (warm),
+    * make_plan - wygenerowanie planu dla podanych długości planu i stosunków min_interval_time do liczby dań.
+
+Wyniki zapisywane są w pliku JSON. Jeżeli podano plik z wynikami bazowymi (--baseline), dla każdego
+pomiaru wyświetlany jest stosunek czasu do czasu bazowego, a pomiary wolniejsze o więcej niż wskazany
+próg oznaczane są jako regresje (z opcją --fail-on-regression skrypt kończy się wtedy kodem 1).
+
+Przykłady użycia:
+    python benchmarks.py --sizes 10 1000 100000 --output wyniki.json
+    python benchmarks.py --output wyniki.json --baseline bazowe.json --threshold 1.2
+    python benchmarks.py --sizes 1000000 --horizons 365 --repeat 1
+
+Zawiera definicje następujących funkcji:
+    * measure - mierzy czas wykonania funkcji
+    * build_table - tworzy tabelę z syntetycznymi daniami
+    * run_benchmarks - wykonuje wszystkie pomiary dla podanych parametrów
+    * compare_results - porównuje wyniki z wynikami bazowymi
+    * main - obsługuje argumenty wywołania skryptu
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import datetime
+import argparse
+import platform
+import statistics
+import tempfile
+from classes import Database, Table, LunchPlan, connection_manager
+from database_management_functions import import_csv
+
+
+def measure(function, repeat=3, number=1, setup=None):
+    """Mierzy czas wykonania funkcji
+
+    Parameters
+    ----------
+    function : callable
+        mierzona funkcja (bez argumentów)
+    repeat : int
+        liczba powtórzeń pomiaru
+    number : int
+        liczba wywołań funkcji w jednym pomiarze - wynik jest dzielony przez tę liczbę
+    setup : callable, optional
+        funkcja wywoływana przed każdym pomiarem (jej czas nie jest mierzony)
+
+    Returns
+    ----------
+    dict
+        słownik z najkrótszym i medianowym czasem jednego wywołania funkcji w sekundach
+    """
+
+    timings = []
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {'min': min(timings), 'median': statistics.median(timings), 'repeat': repeat, 'number': number}
+
+
+def _dishes(size, prefix='danie'):
+    """Zwraca generator syntetycznych dań w postaci krotek (dish_name, which_course)"""
+
+    return ((f"{prefix} {number}", number % 2 + 1) for number in range(size))
+
+
+def build_table(db, table_name, size):
+    """Tworzy tabelę z syntetycznymi daniami
+
+    Parameters
+    ----------
+    db : obiekt klasy Database
+        baza danych, w której tworzona jest tabela
+    table_name : str
+        nazwa tworzonej tabeli
+    size : int
+        liczba dań w tabeli
+
+    Returns
+    ----------
+    obiekt klasy Table
+        utworzona tabela
+    """
+
+    db.create_table(table_name)
+    table = Table(db, table_name)
+    table.insert_many(_dishes(size))
+    return table
+
+
+def _benchmark_insert(db, table, repeat, insert_count):
+    """Mierzy czas dodania pojedynczego dania do tabeli"""
+
+    counter = iter(range(sys.maxsize))
+    return measure(lambda: table.insert(f"nowe danie {next(counter)}", 1), repeat, insert_count)
+
+
+def _benchmark_import(db, size, repeat, directory):
+    """Mierzy czas importu pliku csv z 'size' wierszami do pustej tabeli"""
+
+    file_path = os.path.join(directory, f"dishes_{size}.csv")
+    with open(file_path, 'w', newline='') as file:
+        file.writelines(f"{dish_name};{which_course}\n" for dish_name, which_course in _dishes(size))
+
+    tables = iter(range(sys.maxsize))
+    current = {}
+
+    def setup():
+        current['table'] = Table(db, f"import_{size}_{next(tables)}")
+        db.create_table(current['table'].table_name)
+
+    return measure(lambda: import_csv(current['table'], file_path, show_progress=False), repeat, setup=setup)
+
+
+def _benchmark_list_dishes(db, table, repeat):
+    """Mierzy czas odczytu dań z tabeli bez pamięci podręcznej i z pamięcią podręczną"""
+
+    cold = measure(table.list_dishes, repeat, setup=db.dish_caches.clear)
+    table.list_dishes()
+    warm = measure(table.list_dishes, repeat, number=100)
+    return cold, warm
+
+
+def _benchmark_list_tables(db, repeat):
+    """Mierzy czas odczytu listy tabel bez pamięci podręcznej i z pamięcią podręczną"""
+
+    def reset():
+        db.schema_version = None
+
+    cold = measure(db.list_tables, repeat, setup=reset)
+    db.list_tables()
+    warm = measure(db.list_tables, repeat, number=100)
+    return cold, warm
+
+
+def _benchmark_make_plan(db, table, size, horizon, ratio, repeat):
+    """Mierzy czas wygenerowania planu o podanej długości i stosunku min_interval_time do liczby dań"""
+
+    min_interval_time = min(max(int(size * ratio), 2), size)
+    start_date = datetime.date(2024, 1, 1)
+    end_date = start_date + datetime.timedelta(days=horizon - 1)
+    lunch_plan = LunchPlan(db, table, ('benchmark', start_date, end_date, min_interval_time), seed=0)
+    return min_interval_time, measure(lunch_plan.make_plan, repeat)
+
+
+def run_benchmarks(sizes, horizons, ratios, repeat=3, insert_count=100, progress=True):
+    """Wykonuje wszystkie pomiary dla podanych parametrów
+
+    Parameters
+    ----------
+    sizes : list
+        liczby dań w syntetycznych tabelach
+    horizons : list
+        długości planów liczone w dniach
+    ratios : list
+        stosunki min_interval_time do liczby dań w tabeli (min_interval_time wynosi co najmniej 2)
+    repeat : int
+        liczba powtórzeń każdego pomiaru
+    insert_count : int
+        liczba dań dodawanych pojedynczo w jednym pomiarze metody Table.insert
+    progress : bool
+        decyduje, czy w konsoli wyświetlane są nazwy kolejnych pomiarów
+
+    Returns
+    ----------
+    dict
+        słownik z informacjami o środowisku ('meta') oraz wynikami pomiarów ('results'), w którym
+        kluczem jest nazwa pomiaru wraz z parametrami, np. 'make_plan[size=1000,days=365,interval=10]'
+    """
+
+    results = {}
+
+    def record(name, timing, **params):
+        key = f"{name}[{','.join(f'{param}={value}' for param, value in params.items())}]"
+        results[key] = dict(timing, params=params)
+        if progress:
+            print(f"{key}: {timing['median'] * 1000:.3f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            db = Database(f"benchmark_{size}.db", directory)
+            try:
+                table = build_table(db, 'dishes', size)
+
+                record('import_csv', _benchmark_import(db, size, repeat, directory), size=size)
+
+                cold, warm = _benchmark_list_dishes(db, table, repeat)
+                record('list_dishes', cold, size=size, cache='cold')
+                record('list_dishes', warm, size=size, cache='warm')
+
+                cold, warm = _benchmark_list_tables(db, repeat)
+                record('list_tables', cold, size=size, cache='cold')
+                record('list_tables', warm, size=size, cache='warm')
+
+                for horizon in horizons:
+                    for ratio in ratios:
+                        min_interval_time, timing = _benchmark_make_plan(db, table, size, horizon, ratio, repeat)
+                        record('make_plan', timing, size=size, days=horizon, interval=min_interval_time)
+
+                # dodawanie dań zmienia liczbę dań w tabeli, dlatego jest mierzone na końcu
+                record('insert', _benchmark_insert(db, table, repeat, insert_count), size=size)
+            finally:
+                db.close_connection()
+                connection_manager.close_all()
+
+    return {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def compare_results(results, baseline, threshold=1.2):
+    """Porównuje wyniki z wynikami bazowymi
+
+    Porównywane są mediany czasów pomiarów występujących w obu plikach
+
+    Parameters
+    ----------
+    results : dict
+        wyniki zwrócone przez funkcję 'run_benchmarks'
+    baseline : dict
+        wyniki bazowe w tej samej postaci
+    threshold : float
+        stosunek czasu do czasu bazowego, powyżej którego pomiar uznawany jest za regresję
+
+    Returns
+    ----------
+    list
+        lista krotek (nazwa pomiaru, czas bazowy, czas, stosunek, czy regresja) posortowana według nazwy
+    """
+
+    comparison = []
+
+    for key in sorted(results['results']):
+        if key not in baseline['results']:
+            continue
+        baseline_time = baseline['results'][key]['median']
+        current_time = results['results'][key]['median']
+        ratio = current_time / baseline_time if baseline_time else float('inf')
+        comparison.append((key, baseline_time, current_time, ratio, ratio > threshold))
+
+    return comparison
+
+
+def _print_comparison(comparison):
+    """Wyświetla porównanie wyników z wynikami bazowymi w postaci tabeli"""
+
+    width = max((len(key) for key, *_ in comparison), default=10)
+    print(f"{'pomiar':<{width}}  {'bazowy [ms]':>12}  {'obecny [ms]':>12}  {'stosunek':>8}")
+    for key, baseline_time, current_time, ratio, regression in comparison:
+        flag = '  REGRESJA' if regression else ''
+        print(f"{key:<{width}}  {baseline_time * 1000:>12.3f}  {current_time * 1000:>12.3f}  {ratio:>8.2f}{flag}")
+
+
+def main(argv=None):
+    """Obsługuje argumenty wywołania skryptu, wykonuje pomiary i zapisuje wyniki
+
+    Parameters
+    ----------
+    argv : list, optional
+        lista argumentów wywołania (bez nazwy skryptu), domyślnie sys.argv[1:]
+
+    Returns
+    ----------
+    int
+        kod wyjścia - 1, jeżeli wykryto regresję, a podano opcję --fail-on-regression, w przeciwnym razie 0
+    """
+
+    parser = argparse.ArgumentParser(description="Pomiary czasu wykonywania operacji programu do tworzenia "
+                                                 "planów obiadów")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 100000],
+                        help="liczby dań w syntetycznych tabelach (od 10 do 1000000)")
+    parser.add_argument('--horizons', type=int, nargs='+', default=[7, 365, 3650],
+                        help="długości planów liczone w dniach")
+    parser.add_argument('--ratios', type=float, nargs='+', default=[0.01, 0.1, 0.5],
+                        help="stosunki min_interval_time do liczby dań")
+    parser.add_argument('--repeat', type=int, default=3, help="liczba powtórzeń każdego pomiaru")
+    parser.add_argument('--insert-count', type=int, default=100,
+                        help="liczba dań dodawanych pojedynczo w jednym pomiarze metody Table.insert")
+    parser.add_argument('--output', default='benchmark_results.json', help="plik, do którego zapisywane są wyniki")
+    parser.add_argument('--baseline', default=None, help="plik z wynikami bazowymi do porównania")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="stosunek czasu do czasu bazowego, powyżej którego pomiar jest regresją")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="kończy skrypt kodem 1, jeżeli wykryto regresję")
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmarks(arguments.sizes, arguments.horizons, arguments.ratios, arguments.repeat,
+                             arguments.insert_count)
+
+    with open(arguments.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"Wyniki zapisano w pliku '{arguments.output}'")
+
+    if arguments.baseline is None:
+        return 0
+
+    with open(arguments.baseline, 'r') as file:
+        baseline = json.load(file)
+
+    comparison = compare_results(results, baseline, arguments.threshold)
+    _print_comparison(comparison)
+    regressions = sum(1 for *_, regression in comparison if regression)
+    print(f"Liczba regresji: {regressions}")
+
+    return 1 if regressions and arguments.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
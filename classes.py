@@ -1,16 +1,245 @@
 """Moduł zawiera definicje wszystkich klas wykorzystywanych w programie
 
 Zawiera definicję nstępujących klas:
+    * PooledConnection - klasa reprezentująca współdzielone połączenie z plikiem bazy danych,
+    * ConnectionManager - klasa zarządzająca połączeniami z bazami danych SQLite,
     * Database - klasa reprezenyująca bazę danych SQLite,
     * Table - klasa reprezentująca tabelę w bazie danych,
-    * LunchPlan - klasa reprezentująca plan obiadów.
+    * DishCache - klasa reprezentująca pamięć podręczną z daniami zapisanymi w tabeli,
+    * DishPool - klasa reprezentująca pulę dań, które mogą zostać wylosowane w danym dniu planu,
+    * WeightTree - klasa losująca dania z prawdopodobieństwem proporcjonalnym do ich wag (drzewo przedziałowe),
+    * WeightedDishPool - klasa reprezentująca pulę dań losowanych z uwzględnieniem ich wag,
+    * LunchPlan - klasa reprezentująca plan obiadów,
+    * PlanStore - klasa reprezentująca plany obiadów zapisane w bazie danych,
+    * PlanCache - klasa przechowująca wygenerowane plany obiadów w pamięci podręcznej,
+    * RejectWriter - klasa zapisująca odrzucone wiersze pliku csv do osobnego pliku,
+    * NearDuplicateWriter - klasa zapisująca dania prawie identyczne z daniami z tabeli do osobnego pliku,
+    * ImportProgress - klasa wyświetlająca postęp importu pliku csv,
+    * Instrumentation - klasa zbierająca statystyki wykonywania operacji na bazach danych i planach obiadów.
 """
 
 import os
+import re
+import csv
+import sys
+import json
+import atexit
+import bisect
+import weakref
+import hashlib
+import functools
 import sqlite3
 import datetime
 import random
 import time
+import math
+import unicodedata
+import uuid
+from array import array
+from itertools import islice
+from collections import deque, OrderedDict
+
+
+class PooledConnection:
+    """Klasa reprezentująca współdzielone połączenie z plikiem bazy danych
+
+    Wszystkie instancje klasy Database wskazujące na ten sam plik korzystają z jednego połączenia
+    oraz ze wspólnej pamięci podręcznej dań
+
+    Attributes
+    ----------
+    path : str
+        ścieżka do pliku z bazą danych
+    connection : instancja klasy sqlite3.Connection
+        połączenie z bazą danych
+    profile : str
+        nazwa profilu, z którym zostało otwarte połączenie
+    users : int
+        liczba instancji klasy Database korzystających z połączenia
+    pid : int
+        identyfikator procesu, w którym otwarto połączenie - połączenia nie mogą być współdzielone
+        z procesami potomnymi
+    dish_caches : dict
+        słownik z pamięcią podręczną dań (instancje klasy DishCache) dla poszczególnych tabel
+    """
+
+    def __init__(self, path, connection, profile):
+        self.path = path
+        self.connection = connection
+        self.profile = profile
+        self.users = 0
+        self.pid = os.getpid()
+        self.dish_caches = {}
+
+
+class ConnectionManager:
+    """Klasa zarządzająca połączeniami z bazami danych SQLite
+
+    Połączenia są otwierane raz dla każdego pliku i ponownie wykorzystywane przy kolejnych połączeniach
+    z tą samą bazą. Przy otwieraniu połączenia ustawiane są parametry (PRAGMA) z wybranego profilu,
+    a operacje na bazie zablokowanej przez inny proces są ponawiane z rosnącym odstępem czasu
+
+    Attributes
+    ----------
+    PROFILES : dict
+        słownik z profilami połączeń - każdy profil to słownik z wartościami parametrów PRAGMA
+    default_profile : str
+        nazwa profilu wykorzystywanego, gdy przy połączeniu nie wskazano innego
+    busy_timeout : float
+        czas w sekundach, przez jaki SQLite czeka na zwolnienie blokady bazy danych
+    retries : int
+        liczba ponownych prób wykonania operacji na zablokowanej bazie danych
+    backoff : float
+        czas w sekundach przed pierwszą ponowną próbą - przy każdej kolejnej jest podwajany
+    pool : dict
+        słownik z otwartymi połączeniami (instancje klasy PooledConnection) - kluczem jest ścieżka do pliku
+
+    Methods
+    ----------
+    connect(path, profile)
+        zwraca współdzielone połączenie z plikiem bazy danych
+    release(pooled_connection)
+        zwalnia połączenie - pozostaje ono otwarte do ponownego wykorzystania
+    close(path)
+        zamyka połączenie z plikiem bazy danych
+    close_all()
+        zamyka wszystkie otwarte połączenia
+    run_with_retry(function, *args)
+        wywołuje funkcję, ponawiając ją, gdy baza danych jest zablokowana
+    """
+
+    PROFILES = {
+        'standard': {},
+        'wal': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'temp_store': 'MEMORY', 'cache_size': -16000,
+                'mmap_size': 64 * 1024 * 1024},
+        'bulk': {'journal_mode': 'WAL', 'synchronous': 'OFF', 'temp_store': 'MEMORY', 'cache_size': -262144,
+                 'mmap_size': 1024 * 1024 * 1024},
+    }
+
+    def __init__(self, default_profile='wal', busy_timeout=5.0, retries=5, backoff=0.05):
+        """
+        Parameters
+        ----------
+        default_profile : str
+            nazwa profilu wykorzystywanego, gdy przy połączeniu nie wskazano innego
+        busy_timeout : float
+            czas w sekundach, przez jaki SQLite czeka na zwolnienie blokady bazy danych
+        retries : int
+            liczba ponownych prób wykonania operacji na zablokowanej bazie danych
+        backoff : float
+            czas w sekundach przed pierwszą ponowną próbą
+        """
+
+        self.default_profile = default_profile
+        self.busy_timeout = busy_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool = {}
+
+    def connect(self, path, profile=None):
+        """Zwraca współdzielone połączenie z plikiem bazy danych
+
+        Jeżeli połączenie z danym plikiem nie jest jeszcze otwarte - zostaje utworzone i skonfigurowane
+        zgodnie z profilem
+
+        Parameters
+        ----------
+        path : str
+            ścieżka do pliku z bazą danych
+        profile : str, optional
+            nazwa profilu z atrybutu PROFILES, domyślnie profil z atrybutu default_profile
+
+        Returns
+        ----------
+        instancja klasy PooledConnection
+            współdzielone połączenie z bazą danych
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli profil o podanej nazwie nie istnieje
+        """
+
+        profile = profile or self.default_profile
+        if profile not in self.PROFILES:
+            raise ValueError(f"Profil połączenia '{profile}' nie istnieje. Dostępne profile: {list(self.PROFILES)}")
+
+        key = os.path.abspath(path)
+        pooled_connection = self.pool.get(key)
+
+        if pooled_connection is None or pooled_connection.pid != os.getpid():
+            connection = sqlite3.connect(path, timeout=self.busy_timeout)
+            for pragma, value in self.PROFILES[profile].items():
+                self.run_with_retry(connection.execute, f"PRAGMA {pragma} = {value}")
+            pooled_connection = PooledConnection(key, connection, profile)
+            self.pool[key] = pooled_connection
+
+        pooled_connection.users += 1
+        return pooled_connection
+
+    def release(self, pooled_connection):
+        """Zwalnia połączenie - pozostaje ono otwarte do ponownego wykorzystania
+
+        Parameters
+        ----------
+        pooled_connection : instancja klasy PooledConnection
+            zwalniane połączenie
+        """
+
+        pooled_connection.users = max(pooled_connection.users - 1, 0)
+
+    def close(self, path):
+        """Zamyka połączenie z plikiem bazy danych, np. przed usunięciem pliku
+
+        Parameters
+        ----------
+        path : str
+            ścieżka do pliku z bazą danych
+        """
+
+        pooled_connection = self.pool.pop(os.path.abspath(path), None)
+        if pooled_connection is not None:
+            pooled_connection.connection.close()
+
+    def close_all(self):
+        """Zamyka wszystkie otwarte połączenia"""
+
+        for path in list(self.pool):
+            self.close(path)
+
+    def run_with_retry(self, function, *args):
+        """Wywołuje funkcję, ponawiając ją, gdy baza danych jest zablokowana przez inne połączenie
+
+        Odstęp czasu pomiędzy kolejnymi próbami jest za każdym razem podwajany
+
+        Parameters
+        ----------
+        function : callable
+            wywoływana funkcja, np. metoda execute obiektu sqlite3.Connection
+        *args
+            argumenty przekazywane do funkcji
+
+        Returns
+        ----------
+        wartość zwrócona przez funkcję
+        """
+
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                return function(*args)
+            except sqlite3.OperationalError as error:
+                message = str(error)
+                if attempt == self.retries or ('locked' not in message and 'busy' not in message):
+                    raise
+                if instrumentation.enabled:
+                    instrumentation.count('ConnectionManager.busy_retries')
+                time.sleep(delay)
+                delay *= 2
+
+
+connection_manager = ConnectionManager()
+atexit.register(connection_manager.close_all)
 
 
 class Database:
@@ -21,79 +250,445 @@ class Database:
     ----------
     name : str
         nazwa bazy danych w z rozszerzeniem '.db'
+    path : str
+        ścieżka do pliku z bazą danych
+    pooled_connection : instancja klasy PooledConnection
+        współdzielone połączenie z plikiem bazy danych zarządzane przez obiekt 'connection_manager'
     connection : instancja klasy sqlite.Connection
         obiekt pozwalający na połączenie z bazą danych
     cursor : instancja klasy sqlite.Cursor
         kursor dla połączenia z bazą danych
     list_of_tables : list
         lista zawierająca nazwy wszystkich tabel znajdujących się w bazie danych
+    table_names : set
+        zbiór z nazwami wszystkich tabel znajdujących się w bazie danych
+    shared_tables : set
+        zbiór z nazwami tabel korzystających ze wspólnego magazynu dań
+    schema_version : int
+        wartość 'PRAGMA schema_version' z momentu odczytu listy tabel
+    dish_caches : dict
+        słownik z pamięcią podręczną dań (instancje klasy DishCache) dla poszczególnych tabel
+    versioned_tables : set
+        zbiór z nazwami tabel, dla których sprawdzono istnienie wyzwalaczy numeru wersji
+    search_indexes : dict
+        słownik, w którym kluczem jest nazwa tabeli, a wartością informacja, czy tabela ma indeks FTS5
+    SCHEMA_VERSION : int
+        aktualna wersja schematu bazy danych zapisywana w 'PRAGMA user_version'
+    MIGRATIONS : dict
+        słownik, w którym kluczem jest wersja schematu, a wartością nazwa metody aktualizującej bazę do tej wersji
+    STRICT_TABLES : bool
+        informacja, czy wersja SQLite (co najmniej 3.37) pozwala tworzyć tabele z opcją STRICT
 
     Methods
     ----------
+    migrate()
+        aktualizuje schemat bazy danych do wersji SCHEMA_VERSION
     close_connection()
-        zamyka połączenie z bazą danych
-    create_table(table_name)
+        zwalnia połączenie z bazą danych
+    execute(sql, parameters)
+        wykonuje polecenie SQL, ponawiając je, gdy baza jest zablokowana
+    executemany(sql, seq_of_parameters)
+        wykonuje polecenie SQL dla wielu zestawów parametrów
+    commit()
+        zatwierdza transakcję, ponawiając próbę, gdy baza jest zablokowana
+    create_table(table_name, shared)
         tworzy tabelę w bazie danych o nazwie table_name
+    share_table(table_name)
+        przenosi dania z tabeli do wspólnego magazynu dań
+    is_shared(table_name)
+        sprawdza, czy tabela korzysta ze wspólnego magazynu dań
     drop_table(table_name)
         usuwa z bazy danych tabelę o nazwie table_name
     list_tables()
         zwraca listę z nazwami wszystkich tabel znajdujących się w bazie danych
+    has_table(table_name)
+        sprawdza, czy tabela o podanej nazwie znajduje się w bazie danych
+    table_metadata(table_name)
+        zwraca liczbę dań w tabeli oraz ich podział na pierwsze i drugie danie
     delete_database()
         usuwa plik z bazą danych z katalogu 'databases'
     """
 
-    def __init__(self, name):
+    SCHEMA_VERSION = 2
+    MIGRATIONS = {2: '_migrate_to_v2'}
+    STRICT_TABLES = sqlite3.sqlite_version_info >= (3, 37, 0)
+
+    def __init__(self, name, directory='databases', profile=None):
         """Tworzy nową bazę danych w katalogu databases
 
+        Połączenie z bazą pobierane jest z obiektu 'connection_manager', dzięki czemu kolejne połączenia
+        z tym samym plikiem wykorzystują jedno, już otwarte połączenie
+        Schemat bazy utworzonej przez wcześniejszą wersję programu jest aktualizowany metodą 'migrate'
+
         Parameters
         ----------
         name : str
             nazwa bazy danych w z rozszerzeniem '.db'
+        directory : str
+            katalog, w którym znajduje się plik z bazą danych
+        profile : str, optional
+            nazwa profilu połączenia z atrybutu ConnectionManager.PROFILES
         """
 
         self.name = name
-        self.connection = sqlite3.connect("databases\\" + self.name)
+        self.path = os.path.join(directory, self.name)
+        self.pooled_connection = connection_manager.connect(self.path, profile)
+        self.connection = self.pooled_connection.connection
         self.cursor = self.connection.cursor()
         self.list_of_tables = []
+        self.table_names = set()
+        self.shared_tables = set()
+        self.schema_version = None
+        self.dish_caches = self.pooled_connection.dish_caches
+        self.versioned_tables = set()
+        self.search_indexes = {}
+        self.connected = True
+        self.migrate()
 
     def __del__(self):
         """
-        Zamyka połączenie z bazą danych w przypadku usunięcia obiektu tej klasy np. w przypadku wyłączenia programu
+        Zwalnia połączenie z bazą danych w przypadku usunięcia obiektu tej klasy np. w przypadku wyłączenia programu
         """
-        self.connection.close()
+        if getattr(self, 'connected', False):
+            self.close_connection()
 
     def close_connection(self):
-        """Zamyka połączenie z bazą danych """
+        """Zwalnia połączenie z bazą danych
+
+        Połączenie pozostaje otwarte w obiekcie 'connection_manager' i zostanie ponownie wykorzystane
+        przy kolejnym połączeniu z tą samą bazą
+        """
+
+        if self.connected:
+            connection_manager.release(self.pooled_connection)
+            self.connected = False
+
+    def execute(self, sql, parameters=()):
+        """Wykonuje polecenie SQL, ponawiając je, gdy baza jest zablokowana przez inne połączenie
+
+        Parameters
+        ----------
+        sql : str
+            polecenie SQL
+        parameters : tuple
+            parametry polecenia
+
+        Returns
+        ----------
+        instancja klasy sqlite3.Cursor
+            kursor, z którego można odczytać wyniki zapytania
+        """
+
+        return connection_manager.run_with_retry(self.cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        """Wykonuje polecenie SQL dla wielu zestawów parametrów, ponawiając je, gdy baza jest zablokowana
+
+        Parameters
+        ----------
+        sql : str
+            polecenie SQL
+        seq_of_parameters : iterable
+            kolejne zestawy parametrów polecenia
+
+        Returns
+        ----------
+        instancja klasy sqlite3.Cursor
+            kursor, którego atrybut rowcount zawiera liczbę zmodyfikowanych wierszy
+        """
+
+        return connection_manager.run_with_retry(self.cursor.executemany, sql, seq_of_parameters)
+
+    def commit(self):
+        """Zatwierdza transakcję, ponawiając próbę, gdy baza jest zablokowana przez inne połączenie"""
+
+        connection_manager.run_with_retry(self.connection.commit)
+
+    def migrate(self):
+        """Aktualizuje schemat bazy danych do wersji SCHEMA_VERSION
+
+        Wersja schematu odczytywana jest z 'PRAGMA user_version' - bazy utworzone przed wprowadzeniem migracji
+        mają wartość 0, co odpowiada schematowi w wersji 1. Kolejne migracje (słownik MIGRATIONS) wykonywane są
+        w jednej transakcji, a po każdej z nich zapisywany jest nowy numer wersji, więc przerwana migracja
+        nie pozostawia bazy w stanie pośrednim. Dwa procesy łączące się jednocześnie z tą samą bazą
+        nie wykonają migracji dwukrotnie dzięki blokadzie zapisu zakładanej przed ponownym odczytem wersji
+
+        Returns
+        ----------
+        int
+            wersja schematu bazy danych po aktualizacji
+        """
+
+        version = self.execute('PRAGMA user_version').fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return version
+
+        self.commit()
+        self.execute('BEGIN IMMEDIATE')
+        try:
+            version = self.execute('PRAGMA user_version').fetchone()[0]
+            for target in range(version + 1, self.SCHEMA_VERSION + 1):
+                if target in self.MIGRATIONS:
+                    getattr(self, self.MIGRATIONS[target])()
+                self.execute(f'PRAGMA user_version = {target}')
+            self.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            self.schema_version = None
+            self.dish_caches.clear()
+            self.search_indexes.clear()
+            self.versioned_tables.clear()
+
+        return max(version, self.SCHEMA_VERSION)
+
+    def _migrate_to_v2(self):
+        """Przebudowuje tabele z daniami do schematu w wersji 2
+
+        Każda tabela z kolumnami dish_name i which_course jest tworzona na nowo (STRICT, UNIQUE(dish_name),
+        CHECK(which_course IN (1, 2)), indeks na kolumnie which_course). Numery dań są zachowywane, więc plany
+        zapisane przez klasę PlanStore nadal wskazują właściwe dania. Z powtórzonych nazw zachowywane jest
+        danie o najmniejszym numerze (plany wskazujące powtórzenia są do niego przepinane), a wiersze
+        niespełniające ograniczeń trafiają do tabeli '_migration_rejects' zamiast zostać utracone
+        """
+
+        for (table_name, ) in self.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+            if table_name.startswith(('_', 'sqlite_')):
+                continue
+            columns = {column[1] for column in self.execute(f"PRAGMA table_info({table_name})").fetchall()}
+            if {'dish_name', 'which_course'} <= columns:
+                self._rebuild_dish_table(table_name, 'weight' in columns)
+
+    def _rebuild_dish_table(self, table_name, has_weight):
+        """Tworzy tabelę z daniami w aktualnym schemacie i przenosi do niej dania ze starej tabeli"""
+
+        new_table = f"_{table_name}_v{self.SCHEMA_VERSION}"
+        weight = 'CAST(weight AS REAL)' if has_weight else '1.0'
+
+        self.execute(self._dish_table_sql(new_table))
+        self.execute(f"INSERT INTO {new_table} (id, dish_name, which_course, weight) "
+                     f"SELECT id, dish_name, which_course, {weight} FROM {table_name} WHERE id IN "
+                     f"(SELECT MIN(id) FROM {table_name} WHERE dish_name IS NOT NULL AND which_course IN (1, 2) "
+                     f"GROUP BY dish_name)")
+
+        self.execute("CREATE TABLE IF NOT EXISTS _migration_rejects (table_name TEXT NOT NULL, "
+                     "schema_version INTEGER NOT NULL, id INTEGER, dish_name, which_course, reason TEXT)")
+        self.execute(f"INSERT INTO _migration_rejects SELECT ?, ?, id, dish_name, which_course, "
+                     f"CASE WHEN dish_name IS NULL OR COALESCE(which_course IN (1, 2), 0) = 0 "
+                     f"THEN 'brak nazwy lub nieprawidłowy numer dania' ELSE 'powtórzona nazwa dania' END "
+                     f"FROM {table_name} WHERE id NOT IN (SELECT id FROM {new_table})",
+                     (table_name, self.SCHEMA_VERSION))
+
+        if self.execute("SELECT 1 FROM sqlite_master WHERE name = '_plan_days'").fetchone():
+            self.execute(f"UPDATE _plan_days SET dish_id = COALESCE((SELECT n.id FROM {table_name} o "
+                         f"JOIN {new_table} n ON n.dish_name = o.dish_name WHERE o.id = _plan_days.dish_id), dish_id) "
+                         f"WHERE plan_id IN (SELECT plan_id FROM _plans WHERE table_name = ?) "
+                         f"AND dish_id NOT IN (SELECT id FROM {new_table})", (table_name, ))
+
+        sequence = self.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table_name, )).fetchone()
+        self.execute(f"DROP TABLE {table_name}")
+        self.execute(f"DROP TABLE IF EXISTS _{table_name}_fts")
+        self.execute(f"ALTER TABLE {new_table} RENAME TO {table_name}")
+        self.execute(f"CREATE INDEX {table_name}_which_course_idx ON {table_name} (which_course)")
+        if sequence is not None:
+            # numery usuniętych dań nie mogą zostać przydzielone nowym daniom
+            self.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequence[0], table_name))
+
+        table = Table(self, table_name)
+        table.create_version_triggers()
+        table.create_search_index()
+        self.execute("UPDATE _table_versions SET version = version + 1 WHERE table_name = ?", (table_name, ))
+
+    def _dish_table_sql(self, table_name):
+        """Zwraca polecenie SQL tworzące tabelę z daniami w aktualnym schemacie"""
 
-        self.connection.close()
+        return (f"CREATE TABLE {table_name} (id INTEGER PRIMARY KEY AUTOINCREMENT, dish_name TEXT NOT NULL UNIQUE, "
+                f"which_course INTEGER NOT NULL CHECK (which_course IN (1, 2)), weight REAL NOT NULL DEFAULT 1)"
+                f"{' STRICT' if self.STRICT_TABLES else ''}")
 
-    def create_table(self, table_name):
+    def create_table(self, table_name, shared=False):
         """Tworzy tabelę w bazie danych
 
+        Nazwy dań w tabeli są unikalne, a numer dania musi być cyfrą 1 lub 2 - ograniczenia te sprawdzane są
+        przez bazę danych
+        Tabela korzystająca ze wspólnego magazynu dań (parametr 'shared') nie przechowuje nazw dań - nazwy
+        zapisywane są raz w tabeli '_dishes', a tabela '_<nazwa tabeli>_members' zawiera jedynie numery dań,
+        numery dania (1 lub 2) i wagi. Pod nazwą tabeli tworzony jest widok z kolumnami id, dish_name,
+        which_course i weight, dzięki czemu z tabeli można korzystać tak samo jak ze zwykłej tabeli
+
         Parameters
         ----------
         table_name : str
             nazwa tworzonej tabeli
+        shared : bool
+            decyduje, czy tabela korzysta ze wspólnego magazynu dań
+        """
+
+        if shared:
+            self._create_members_table(table_name)
+            self._create_shared_view(table_name)
+        else:
+            self.execute(self._dish_table_sql(table_name))
+            self.execute(f"CREATE INDEX {table_name}_which_course_idx ON {table_name} (which_course)")
+        Table(self, table_name).create_version_triggers()
+        Table(self, table_name).create_search_index()
+        self.commit()
+        self.schema_version = None
+
+    def share_table(self, table_name):
+        """Przenosi dania z tabeli do wspólnego magazynu dań
+
+        Nazwy dań trafiają do tabeli '_dishes' (dania, które już się w niej znajdują, nie są zapisywane
+        ponownie), a tabela zostaje zastąpiona widokiem o tej samej nazwie. Dania otrzymują numery z tabeli '_dishes',
+        więc numery dań w planach zapisanych przez klasę PlanStore są odpowiednio zmieniane
+        Cała operacja wykonywana jest w jednej transakcji
+
+        Parameters
+        ----------
+        table_name : str
+            nazwa tabeli
+        """
+
+        if self.is_shared(table_name):
+            return
+
+        self.commit()
+        self.execute('BEGIN IMMEDIATE')
+        try:
+            self._create_members_table(table_name)
+            self.execute(f"INSERT OR IGNORE INTO _dishes (dish_name) SELECT dish_name FROM {table_name} ORDER BY id")
+            self.execute(f"INSERT INTO _{table_name}_members (dish_id, which_course, weight) "
+                         f"SELECT d.id, t.which_course, t.weight FROM {table_name} t "
+                         f"JOIN _dishes d ON d.dish_name = t.dish_name")
+
+            if self.execute("SELECT 1 FROM sqlite_master WHERE name = '_plan_days'").fetchone():
+                # numery dań usuniętych wcześniej z tabeli zamieniane są na ujemne, aby nie wskazywały
+                # innych dań ze wspólnego magazynu
+                self.execute(f"UPDATE _plan_days SET dish_id = COALESCE((SELECT d.id FROM {table_name} t "
+                             f"JOIN _dishes d ON d.dish_name = t.dish_name WHERE t.id = _plan_days.dish_id), "
+                             f"-dish_id) WHERE plan_id IN (SELECT plan_id FROM _plans WHERE table_name = ?)",
+                             (table_name, ))
+
+            self.execute(f"DROP TABLE {table_name}")
+            self.execute(f"DROP TABLE IF EXISTS _{table_name}_fts")
+            self._create_shared_view(table_name)
+            table = Table(self, table_name)
+            table.create_version_triggers()
+            table.create_search_index()
+            self.execute("UPDATE _table_versions SET version = version + 1 WHERE table_name = ?", (table_name, ))
+            self.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            self.schema_version = None
+            self.dish_caches.pop(table_name, None)
+            self.search_indexes.pop(table_name, None)
+            self.versioned_tables.discard(table_name)
+
+    def is_shared(self, table_name):
+        """Sprawdza, czy tabela korzysta ze wspólnego magazynu dań
+
+        Parameters
+        ----------
+        table_name : str
+            nazwa tabeli
+
+        Returns
+        -------
+        bool
+            True, jeżeli tabela jest widokiem na wspólny magazyn dań
         """
 
-        self.cursor.execute(f"CREATE TABLE {table_name} (id INTEGER PRIMARY KEY AUTOINCREMENT, dish_name TEXT,"
-                            f" which_course INTEGER)")
-        self.connection.commit()
+        self.list_tables()
+        return table_name in self.shared_tables
+
+    def _create_members_table(self, table_name):
+        """Tworzy wspólny magazyn dań (jeżeli nie istnieje) oraz tabelę z daniami należącymi do tabeli"""
+
+        strict = ' STRICT' if self.STRICT_TABLES else ''
+        self.execute(f"CREATE TABLE IF NOT EXISTS _dishes (id INTEGER PRIMARY KEY, dish_name TEXT NOT NULL UNIQUE)"
+                     f"{strict}")
+        self.execute(f"CREATE TABLE _{table_name}_members (dish_id INTEGER PRIMARY KEY REFERENCES _dishes (id), "
+                     f"which_course INTEGER NOT NULL CHECK (which_course IN (1, 2)), "
+                     f"weight REAL NOT NULL DEFAULT 1){strict}")
+        self.execute(f"CREATE INDEX _{table_name}_members_which_course_idx ON _{table_name}_members (which_course)")
+
+    def _create_shared_view(self, table_name):
+        """Tworzy widok łączący tabelę z daniami należącymi do tabeli ze wspólnym magazynem dań
+
+        Wyzwalacze INSTEAD OF pozwalają dodawać, zmieniać i usuwać dania widoku tak jak w zwykłej tabeli -
+        usunięcie dania usuwa je jedynie z tabeli, a nazwa dania pozostaje we wspólnym magazynie
+        """
+
+        members = f"_{table_name}_members"
+        self.execute(f"CREATE VIEW {table_name} (id, dish_name, which_course, weight) AS "
+                     f"SELECT m.dish_id, d.dish_name, m.which_course, m.weight FROM {members} m "
+                     f"JOIN _dishes d ON d.id = m.dish_id")
+        self.execute(f"CREATE TRIGGER _{table_name}_view_insert INSTEAD OF INSERT ON {table_name} BEGIN "
+                     f"INSERT OR IGNORE INTO _dishes (dish_name) SELECT new.dish_name "
+                     f"WHERE new.which_course IN (1, 2); "
+                     f"INSERT INTO {members} (dish_id, which_course, weight) SELECT id, new.which_course, "
+                     f"COALESCE(new.weight, 1) FROM _dishes WHERE dish_name = new.dish_name; END")
+        self.execute(f"CREATE TRIGGER _{table_name}_view_update INSTEAD OF UPDATE ON {table_name} BEGIN "
+                     f"INSERT OR IGNORE INTO _dishes (dish_name) VALUES (new.dish_name); "
+                     f"UPDATE {members} SET dish_id = (SELECT id FROM _dishes WHERE dish_name = new.dish_name), "
+                     f"which_course = new.which_course, weight = new.weight WHERE dish_id = old.id; END")
+        self.execute(f"CREATE TRIGGER _{table_name}_view_delete INSTEAD OF DELETE ON {table_name} BEGIN "
+                     f"DELETE FROM {members} WHERE dish_id = old.id; END")
 
     def drop_table(self, table_name):
         """Usuwa tabelę w bazie danych
 
+        Usunięcie tabeli korzystającej ze wspólnego magazynu dań nie usuwa nazw dań z magazynu
+
         Parameters
         ----------
         table_name : str
             nazwa usuwanej tabeli
         """
 
-        self.cursor.execute(f'DROP TABLE {table_name}')
-        self.connection.commit()
+        if self.is_shared(table_name):
+            self.execute(f'DROP VIEW {table_name}')
+            self.execute(f'DROP TABLE _{table_name}_members')
+        else:
+            self.execute(f'DROP TABLE {table_name}')
+        self.execute(f'DROP TABLE IF EXISTS _{table_name}_fts')
+        # numer wersji jest zwiększany, aby plany zapamiętane dla usuniętej tabeli nie zostały
+        # wykorzystane po utworzeniu nowej tabeli o tej samej nazwie
+        self.execute("CREATE TABLE IF NOT EXISTS _table_versions (table_name TEXT PRIMARY KEY, "
+                     "version INTEGER NOT NULL)")
+        self.execute("UPDATE _table_versions SET version = version + 1 WHERE table_name = ?", (table_name, ))
+        # nowa tabela o tej samej nazwie otrzyma nowy identyfikator
+        self.execute("CREATE TABLE IF NOT EXISTS _table_generations (table_name TEXT PRIMARY KEY, "
+                     "generation TEXT NOT NULL)")
+        self.execute("DELETE FROM _table_generations WHERE table_name = ?", (table_name, ))
+        self.commit()
+        self.schema_version = None
+        self.dish_caches.pop(table_name, None)
+        self.search_indexes.pop(table_name, None)
+        self.versioned_tables.discard(table_name)
+
+    def data_version(self):
+        """Zwraca wartość 'PRAGMA data_version', która zmienia się, gdy inne połączenie zmodyfikuje bazę danych
+
+        Returns
+        -------
+        int
+            aktualna wartość data_version
+        """
+
+        return self.execute('PRAGMA data_version').fetchone()[0]
 
     def list_tables(self):
-        """Wykonuje zapytanie do bazy danych dotyczące listy wszystkich tabel
+        """Zwraca listę wszystkich tabel znajdujących się w bazie
+
+        Zapytanie do tabeli 'sqlite_master' wykonywane jest tylko wtedy, gdy schemat bazy danych zmienił się
+        od ostatniego odczytu (zmiana wartości 'PRAGMA schema_version') - w pozostałych przypadkach
+        zwracana jest zapamiętana lista tabel
+        Tabele wewnętrzne programu (ich nazwy zaczynają się od znaku '_') nie są uwzględniane, a tabele
+        korzystające ze wspólnego magazynu dań (widoki) są uwzględniane
 
         Returns
         -------
@@ -101,15 +696,68 @@ class Database:
             lista z nazwami wszystkich tabel znajdujących się w bazie
         """
 
-        self.cursor.execute('SELECT name from sqlite_master where type= "table"')
-        self.list_of_tables = [table[0] for table in self.cursor.fetchall()]
+        schema_version = self.execute('PRAGMA schema_version').fetchone()[0]
+
+        if schema_version != self.schema_version:
+            self.execute("SELECT name, type from sqlite_master where type IN ('table', 'view')")
+            rows = [row for row in self.cursor.fetchall() if not row[0].startswith('_')]
+            self.list_of_tables = [name for name, _ in rows]
+            self.table_names = set(self.list_of_tables)
+            self.shared_tables = {name for name, table_type in rows if table_type == 'view'}
+            self.schema_version = schema_version
+
         return self.list_of_tables
 
+    def has_table(self, table_name):
+        """Sprawdza, czy tabela o podanej nazwie znajduje się w bazie danych
+
+        Parameters
+        ----------
+        table_name : str
+            nazwa tabeli
+
+        Returns
+        -------
+        bool
+            True, jeżeli tabela znajduje się w bazie danych
+        """
+
+        self.list_tables()
+        return table_name in self.table_names
+
+    def table_metadata(self, table_name):
+        """Zwraca informacje o zawartości tabeli
+
+        Dane pobierane są z pamięci podręcznej dań tabeli (instancja klasy DishCache)
+
+        Parameters
+        ----------
+        table_name : str
+            nazwa tabeli
+
+        Returns
+        -------
+        dict
+            słownik z liczbą dań w tabeli (klucz 'rows') oraz liczbą dań z podziałem
+            na pierwsze i drugie danie (klucz 'courses')
+        """
+
+        table = Table(self, table_name)
+        return {'rows': table.count_dishes(), 'courses': table.course_counts()}
+
     def delete_database(self):
-        """Usuwa plik z bazą danych z katalogu 'databases'"""
+        """Usuwa plik z bazą danych z katalogu 'databases'
+
+        Przed usunięciem pliku połączenie z bazą jest zamykane, a wraz z plikiem usuwane są
+        pliki pomocnicze trybu WAL
+        """
 
         self.close_connection()
-        os.remove(os.path.join(os.getcwd(), 'databases', self.name))
+        connection_manager.close(self.path)
+        os.remove(self.path)
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
 
 
 class Table:
@@ -128,10 +776,34 @@ class Table:
     ----------
     insert(dish_name, which_course)
         dodaje nowe danie w tabeli
+    insert_many(dishes, batch_size, near_duplicates, threshold, on_near_duplicate)
+        dodaje wiele dań w tabeli w ramach jednej transakcji
     delete(dish_name)
         usuwa danie z tabeli
     list_dishes()
         zwraca listę zawierającą dane z poszczególnych wierszy znajdujących się w tabeli
+    contains(dish_name)
+        sprawdza, czy danie znajduje się w tabeli
+    find_similar(dish_name, threshold, limit)
+        zwraca dania o nazwach podobnych do podanej nazwy
+    count_dishes()
+        zwraca liczbę dań w tabeli
+    course_counts()
+        zwraca liczbę dań w tabeli z podziałem na pierwsze i drugie danie
+    create_version_triggers()
+        tworzy wyzwalacze zwiększające numer wersji tabeli przy każdej zmianie jej zawartości
+    version()
+        zwraca numer wersji zawartości tabeli
+    generation()
+        zwraca identyfikator tabeli nadawany przy jej utworzeniu
+    set_weight(dish_name, weight)
+        ustawia wagę dania wykorzystywaną przy losowaniu planu z uwzględnieniem wag
+    dish_weights()
+        zwraca słownik z wagami dań
+    create_search_index()
+        tworzy indeks pełnotekstowy FTS5 z nazwami dań
+    search(query, limit)
+        wyszukuje dania, których nazwy zawierają słowa zaczynające się od podanych fragmentów
     """
 
     def __init__(self, database, table_name):
@@ -150,19 +822,140 @@ class Table:
         """Wprowadza do tabeli nowe danie, jeżeli się w niej nie znajduje
         Aby danie zostało wprowadzone parametr 'which_course' musi być cyfrą 1 lub 2
 
+        Powtórzenia odrzucane są przez ograniczenie UNIQUE tabeli (polecenie 'INSERT OR IGNORE'), więc dodanie
+        dania nie wymaga wczytania tabeli do pamięci podręcznej. Numer dania sprawdzany jest przed zapisem,
+        ponieważ tabela typu STRICT zamieniłaby np. tekst '1' na liczbę 1
+
         Parameters
         ----------
         dish_name : str
             nazwa dania
         which_course : int
             numer dania - 1 lub 2
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli parametr 'which_course' nie jest liczbą całkowitą 1 lub 2
+        """
+
+        if not self._is_valid_course(which_course):
+            raise ValueError(f"Numer dania musi być liczbą całkowitą 1 lub 2, a nie {which_course!r}.")
+
+        inserted = self._insert_batch([(dish_name, which_course)])
+        self.database.commit()
+        dish_cache = self.database.dish_caches.get(self.table_name)
+        if inserted and dish_cache is not None:
+            dish_cache.add(dish_name, which_course)
+
+    def insert_many(self, dishes, batch_size=1000, near_duplicates=None, threshold=None, on_near_duplicate=None):
+        """Wprowadza do tabeli wiele dań w ramach jednej transakcji
+
+        Dania zapisywane są partiami przy użyciu metody executemany i polecenia 'INSERT OR IGNORE',
+        a powtórzenia odrzucane są przez bazę danych dzięki ograniczeniu UNIQUE kolumny dish_name
+        Dania, których parametr 'which_course' nie jest liczbą całkowitą 1 lub 2, nie zostają wprowadzone
+        Jeżeli podano parametr 'near_duplicates', każde danie porównywane jest (przy użyciu indeksu trygramów)
+        z daniami z tabeli oraz z daniami dodanymi wcześniej w tym samym imporcie
+        W przypadku błędu cała transakcja jest wycofywana
+
+        Parameters
+        ----------
+        dishes : iterable
+            dowolny iterowalny obiekt (np. generator) zwracający krotki (dish_name, which_course)
+        batch_size : int
+            liczba dań zapisywanych w bazie przy jednym wywołaniu executemany
+        near_duplicates : str, optional
+            sposób obsługi dań prawie identycznych z daniami z tabeli: 'flag' - danie jest dodawane,
+            'merge' - danie nie jest dodawane i liczone jest jako powtórzenie; domyślnie dania nie są porównywane
+        threshold : float, optional
+            próg podobieństwa nazw, domyślnie wartość atrybutu 'threshold' klasy SimilarityIndex
+        on_near_duplicate : callable, optional
+            funkcja wywoływana dla każdego prawie identycznego dania z argumentami
+            (dish_name, nazwa podobnego dania, podobieństwo)
+
+        Returns
+        ----------
+        tuple
+            krotka zawierająca liczbę dań dodanych, pominiętych jako powtórzenia oraz odrzuconych
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli parametr 'near_duplicates' ma nieprawidłową wartość
+        """
+
+        if near_duplicates not in (None, 'flag', 'merge'):
+            raise ValueError("Parametr 'near_duplicates' musi mieć wartość 'flag' lub 'merge'.")
+
+        inserted = duplicates = rejected = 0
+        batch = []
+        similarity_index = self._dish_cache().similarity_index() if near_duplicates else None
+
+        try:
+            for dish_name, which_course in dishes:
+                if not dish_name or not self._is_valid_course(which_course):
+                    rejected += 1
+                    continue
+
+                if similarity_index is not None and dish_name not in similarity_index.grams:
+                    similar = similarity_index.find(dish_name, threshold, limit=1)
+                    if similar:
+                        if on_near_duplicate is not None:
+                            on_near_duplicate(dish_name, *similar[0])
+                        if near_duplicates == 'merge':
+                            duplicates += 1
+                            continue
+                    similarity_index.add(dish_name)
+
+                batch.append((dish_name, which_course))
+                if len(batch) >= batch_size:
+                    inserted_in_batch = self._insert_batch(batch)
+                    inserted += inserted_in_batch
+                    duplicates += len(batch) - inserted_in_batch
+                    batch = []
+
+            if batch:
+                inserted_in_batch = self._insert_batch(batch)
+                inserted += inserted_in_batch
+                duplicates += len(batch) - inserted_in_batch
+
+            self.database.commit()
+        except Exception:
+            self.database.connection.rollback()
+            raise
+        finally:
+            self.database.dish_caches.pop(self.table_name, None)
+
+        return inserted, duplicates, rejected
+
+    @staticmethod
+    def _is_valid_course(which_course):
+        """Sprawdza, czy numer dania jest liczbą całkowitą 1 lub 2 (wartości typu bool nie są akceptowane)"""
+
+        return isinstance(which_course, int) and not isinstance(which_course, bool) and which_course in (1, 2)
+
+    def _insert_batch(self, batch):
+        """Zapisuje w tabeli jedną partię dań i zwraca liczbę faktycznie dodanych wierszy
+
+        Dania tabeli korzystającej ze wspólnego magazynu zapisywane są bezpośrednio w tabelach '_dishes'
+        i '_<nazwa tabeli>_members' - dla widoku liczba zmodyfikowanych wierszy nie jest dostępna
+        Partia z nieprawidłowym numerem dania nie jest zapisywana (wyjątek ValueError)
         """
 
-        dishes_inserted = [dish[0] for dish in self.list_dishes()]
-        available_courses = [1, 2]
-        if dish_name not in dishes_inserted and which_course in available_courses:
-            self.database.cursor.execute(f"INSERT INTO {self.table_name} VALUES (?, ?, ?)", (None, dish_name, which_course))
-            self.database.connection.commit()
+        if not all(self._is_valid_course(which_course) for _, which_course in batch):
+            raise ValueError("Numer dania musi być liczbą całkowitą 1 lub 2.")
+
+        if self.database.is_shared(self.table_name):
+            self.database.executemany("INSERT OR IGNORE INTO _dishes (dish_name) VALUES (?)",
+                                      [(dish_name, ) for dish_name, _ in batch])
+            cursor = self.database.executemany(f"INSERT OR IGNORE INTO _{self.table_name}_members "
+                                               f"(dish_id, which_course) SELECT id, ? FROM _dishes WHERE dish_name = ?",
+                                               [(which_course, dish_name) for dish_name, which_course in batch])
+            return cursor.rowcount
+
+        cursor = self.database.executemany(f"INSERT OR IGNORE INTO {self.table_name} (dish_name, which_course) "
+                                           f"VALUES (?, ?)", batch)
+        return cursor.rowcount
 
     def delete(self, dish_name):
         """Usuwa z tabeli danie o podanej nazwie
@@ -173,156 +966,2296 @@ class Table:
             nazwa dania
         """
 
-        self.database.cursor.execute(f"DELETE FROM {self.table_name} WHERE dish_name =?", (dish_name, ))
-        self.database.connection.commit()
+        self.database.execute(f"DELETE FROM {self.table_name} WHERE dish_name =?", (dish_name, ))
+        self.database.commit()
+        dish_cache = self.database.dish_caches.get(self.table_name)
+        if dish_cache is not None:
+            dish_cache.remove(dish_name)
 
     def list_dishes(self):
         """Zwraca listę z danymi z poszczególnych rekordów w tabeli
 
+        Dane pobierane są z pamięci podręcznej tabeli - zapytanie do bazy wykonywane jest tylko wtedy,
+        gdy pamięć podręczna jest pusta lub tabela została zmodyfikowana przez inne połączenie
+
         Returns
         ----------
         list_of_dishes : list
             lista z danymi z poszczególnych rekordów w tabeli w postaci krotek
         """
 
-        self.database.cursor.execute(f"SELECT dish_name, which_course FROM {self.table_name}")
-        self.list_of_dishes = [dish for dish in self.database.cursor.fetchall()]
+        self.list_of_dishes = self._dish_cache().list_dishes()
         return self.list_of_dishes
 
+    def contains(self, dish_name):
+        """Sprawdza, czy danie o podanej nazwie znajduje się w tabeli
 
-class LunchPlan:
-    """Klasa reprezentująca plan obiadów
-
-    Attributes
-    ----------
-    database : instancja klasy Database
-        baza danych, w której znajduje się tabela, na podstawie której tworzony jest plan
-    table : instancja klasy Table
-        tabela, na podstawie której tworzony jest plan
-    name : str
-        nazwa własna planu
-    start_date : instancja klasy datetime.datetime
-        data początkowa planu
-    end_date : instancja klasy datetime.datetime
-        data końcowa planu
-    min_interval_time : int
-        odstęp czasu liczony w dniach, w którym żaden obiad nie może się powtórzyć
-    days : list
-        lista z datami (instancje klasy datetime.datetime) pomiędzy datą poczatkową a końcową
-    days_to_str : list
-        lista z datami w postaci stringow pomiędzy datą początkową a końcową
-    list_of_dishes : list
-        lista z danymi z poszczególnych wierszy tabeli, na podstawie której tworzony jest plan
-    lunch_plan : list
-        lista z gotowym planem obiadów - składa się z krotek zawierających dane o dniu i obiedzie
-    """
+        Sprawdzenie wykorzystuje indeks ograniczenia UNIQUE kolumny dish_name, więc nie wymaga wczytania tabeli
 
-    def __init__(self, database, table, lunch_planner_data: tuple):
-        """
         Parameters
         ----------
-        database : instancja klasy Database
-            baza danych, w której znajduje się tabela, na podstawie której tworzony jest plan
-        table : instancja klasy Table
-            tabela, na podstawie której tworzony jest plan
-        lunch_planner_data: tuple
-            krotka zawierajaca dane niezbędne do stworzenia planu: name, start_date, end_date, min_interval_time
+        dish_name : str
+            nazwa dania
+
+        Returns
+        ----------
+        bool
+            True, jeżeli danie znajduje się w tabeli
         """
 
-        self.database = database
-        self.table = table
-        self.name = lunch_planner_data[0]
-        self.start_date = lunch_planner_data[1]
-        self.end_date = lunch_planner_data[2]
-        self.min_interval_time = lunch_planner_data[3]
-        self.days = []
-        self.days_to_str = []
-        self.list_of_dishes = self.table.list_dishes()
-        self.lunch_plan = []
+        return self.database.execute(f"SELECT 1 FROM {self.table_name} WHERE dish_name = ?",
+                                     (dish_name, )).fetchone() is not None
 
-    def make_plan(self):
-        """ Zwraca wygenerowany plan obiadów w postaci listy
+    def find_similar(self, dish_name, threshold=None, limit=5):
+        """Zwraca dania o nazwach podobnych do podanej nazwy (prawie identyczne dania)
 
-        Wykorzystuje funkcję choice z modułu random do wskazania losowego obiadu z tabeli
-        Funkcja sprawdza, czy wylosowany obiad wystąpił w poprzednich dniach określonych przez atrybut min_interval_time
-        Jeżeli wystąpił - losowany jest nowy obiad i ponownie wykonywane jest wspomniane sprawdzenie
+        Porównywane są znormalizowane nazwy dań, więc np. 'Zupa pomidorowa' i 'zupa  pomidorowa'
+        mają podobieństwo równe 1. Wyszukiwanie korzysta z indeksu trygramów (instancja klasy SimilarityIndex)
+        przechowywanego w pamięci podręcznej tabeli
 
-        Returns
+        Parameters
+        ----------
+        dish_name : str
+            nazwa dania
+        threshold : float, optional
+            próg podobieństwa z przedziału (0, 1], domyślnie wartość atrybutu 'threshold' klasy SimilarityIndex
+        limit : int, optional
+            maksymalna liczba zwracanych dań
+
+        Returns
+        ----------
+        list
+            lista krotek (nazwa dania, podobieństwo) uporządkowana od najbardziej podobnego dania
+        """
+
+        return self._dish_cache().similarity_index().find(dish_name, threshold, limit)
+
+    def count_dishes(self):
+        """Zwraca liczbę dań zapisanych w tabeli
+
+        Returns
+        ----------
+        int
+            liczba dań w tabeli
+        """
+
+        return len(self._dish_cache().dishes)
+
+    def create_version_triggers(self):
+        """Tworzy wyzwalacze zwiększające numer wersji tabeli przy każdej zmianie jej zawartości
+
+        Numer wersji przechowywany jest w tabeli wewnętrznej '_table_versions'. Ponieważ wyzwalacze działają
+        w bazie danych, numer wersji zmienia się również wtedy, gdy tabelę zmodyfikuje inny proces
+        Dla tabeli korzystającej ze wspólnego magazynu dań wyzwalacze tworzone są na tabeli
+        '_<nazwa tabeli>_members'
+        Tabela otrzymuje również losowy identyfikator zapisywany w tabeli wewnętrznej '_table_generations'
+        """
+
+        storage_table = self._storage_table()
+        self.database.execute("CREATE TABLE IF NOT EXISTS _table_versions (table_name TEXT PRIMARY KEY, "
+                              "version INTEGER NOT NULL)")
+        self.database.execute("INSERT OR IGNORE INTO _table_versions VALUES (?, 0)", (self.table_name, ))
+        self.database.execute("CREATE TABLE IF NOT EXISTS _table_generations (table_name TEXT PRIMARY KEY, "
+                              "generation TEXT NOT NULL)")
+        self.database.execute("INSERT OR IGNORE INTO _table_generations VALUES (?, ?)",
+                              (self.table_name, uuid.uuid4().hex))
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            self.database.execute(f"CREATE TRIGGER IF NOT EXISTS _{self.table_name}_version_{operation.lower()} "
+                                  f"AFTER {operation} ON {storage_table} BEGIN UPDATE _table_versions "
+                                  f"SET version = version + 1 WHERE table_name = '{self.table_name}'; END")
+
+    def version(self):
+        """Zwraca numer wersji zawartości tabeli
+
+        Numer wersji zmienia się przy każdym dodaniu, zmianie lub usunięciu dania. Dla tabel utworzonych
+        wcześniej wyzwalacze są tworzone przy pierwszym wywołaniu metody
+
+        Returns
+        ----------
+        int
+            numer wersji zawartości tabeli
+        """
+
+        if self.table_name not in self.database.versioned_tables:
+            self.create_version_triggers()
+            self.database.commit()
+            self.database.versioned_tables.add(self.table_name)
+
+        return self.database.execute("SELECT version FROM _table_versions WHERE table_name = ?",
+                                     (self.table_name, )).fetchone()[0]
+
+    def generation(self):
+        """Zwraca identyfikator tabeli nadawany przy jej utworzeniu
+
+        W przeciwieństwie do numeru wersji identyfikator jest inny dla tabeli utworzonej w nowym pliku bazy
+        danych lub ponownie po usunięciu tabeli, dlatego razem z numerem wersji jednoznacznie określa
+        zawartość tabeli
+
+        Returns
+        ----------
+        str
+            identyfikator tabeli
+        """
+
+        self.version()
+        return self.database.execute("SELECT generation FROM _table_generations WHERE table_name = ?",
+                                     (self.table_name, )).fetchone()[0]
+
+    def set_weight(self, dish_name, weight):
+        """Ustawia wagę dania - danie o wadze 2 jest losowane dwa razy częściej niż danie o wadze 1
+
+        W tabelach utworzonych przed dodaniem kolumny 'weight' kolumna jest dodawana automatycznie
+
+        Parameters
+        ----------
+        dish_name : str
+            nazwa dania
+        weight : float
+            waga dania - liczba większa od zera
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli waga nie jest liczbą większą od zera
+        """
+
+        if not weight > 0:
+            raise ValueError("Waga dania musi być liczbą większą od zera.")
+
+        if not self._has_weight_column():
+            self.database.execute(f"ALTER TABLE {self.table_name} ADD COLUMN weight REAL NOT NULL DEFAULT 1")
+        self.database.execute(f"UPDATE {self.table_name} SET weight = ? WHERE dish_name = ?", (weight, dish_name))
+        self.database.commit()
+
+    def dish_weights(self):
+        """Zwraca słownik z wagami dań
+
+        Jeżeli tabela nie ma kolumny 'weight' - każde danie ma wagę 1
+
+        Returns
+        ----------
+        dict
+            słownik, w którym kluczem jest nazwa dania, a wartością jego waga
+        """
+
+        if not self._has_weight_column():
+            return {dish_name: 1.0 for dish_name, _ in self.list_dishes()}
+
+        rows = self.database.execute(f"SELECT dish_name, weight FROM {self.table_name}").fetchall()
+        return dict(rows)
+
+    def _storage_table(self):
+        """Zwraca nazwę tabeli, w której faktycznie zapisywane są dania tabeli"""
+
+        if self.database.is_shared(self.table_name):
+            return f"_{self.table_name}_members"
+        return self.table_name
+
+    def _search_tables(self):
+        """Zwraca nazwę tabeli z zawartością indeksu FTS5 oraz nazwę indeksu
+
+        Tabele korzystające ze wspólnego magazynu dań mają wspólny indeks '_dishes_fts'
+        """
+
+        if self.database.is_shared(self.table_name):
+            return '_dishes', '_dishes_fts'
+        return self.table_name, f"_{self.table_name}_fts"
+
+    def _has_weight_column(self):
+        """Sprawdza, czy tabela ma kolumnę 'weight'"""
+
+        columns = self.database.execute(f"PRAGMA table_info({self.table_name})").fetchall()
+        return any(column[1] == 'weight' for column in columns)
+
+    def create_search_index(self):
+        """Tworzy indeks pełnotekstowy FTS5 z nazwami dań
+
+        Indeks '_<nazwa tabeli>_fts' przechowuje jedynie tokeny nazw dań (tabela z zawartością zewnętrzną),
+        a wyzwalacze aktualizują go przy każdym dodaniu, zmianie i usunięciu dania - również podczas importu
+        wielu dań metodą insert_many. Wielkość liter i polskie znaki diakrytyczne nie mają znaczenia
+        przy wyszukiwaniu. Indeks tworzony dla istniejącej tabeli jest od razu wypełniany jej zawartością
+        Tabele korzystające ze wspólnego magazynu dań mają jeden wspólny indeks nazw z tabeli '_dishes'
+
+        Returns
+        ----------
+        bool
+            True, jeżeli indeks istnieje, lub False, jeżeli SQLite nie obsługuje modułu FTS5
+        """
+
+        content_table, fts_table = self._search_tables()
+        exists = self.database.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts_table, )).fetchone()
+        if exists:
+            return True
+
+        try:
+            self.database.execute(f"CREATE VIRTUAL TABLE {fts_table} USING fts5(dish_name, content='{content_table}', "
+                                  f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+        except sqlite3.OperationalError:
+            return False
+
+        self.database.execute(f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {content_table} "
+                              f"BEGIN INSERT INTO {fts_table} (rowid, dish_name) VALUES (new.id, new.dish_name); END")
+        self.database.execute(f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {content_table} "
+                              f"BEGIN INSERT INTO {fts_table} ({fts_table}, rowid, dish_name) "
+                              f"VALUES ('delete', old.id, old.dish_name); END")
+        self.database.execute(f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF dish_name "
+                              f"ON {content_table} BEGIN INSERT INTO {fts_table} ({fts_table}, rowid, dish_name) "
+                              f"VALUES ('delete', old.id, old.dish_name); INSERT INTO {fts_table} "
+                              f"(rowid, dish_name) VALUES (new.id, new.dish_name); END")
+        self.database.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+        return True
+
+    def search(self, query, limit=20):
+        """Wyszukuje dania, których nazwy zawierają słowa zaczynające się od podanych fragmentów
+
+        Każde słowo zapytania musi być początkiem któregoś ze słów nazwy dania, np. zapytanie 'zup pom'
+        odnajdzie danie 'zupa pomidorowa'. Wyniki uporządkowane są według trafności (ranking bm25 indeksu
+        FTS5). Jeżeli trafień jest mniej niż 'limit', a zapytanie ma co najmniej 3 znaki, wyniki uzupełniane są
+        daniami, których nazwa zawiera zapytanie w dowolnym miejscu. Gdy SQLite nie obsługuje modułu FTS5,
+        wykorzystywane jest wyłącznie wyszukiwanie fragmentu nazwy (operator LIKE)
+        Wyszukiwanie odbywa się w bazie danych - tabela nie jest wczytywana do pamięci
+
+        Parameters
+        ----------
+        query : str
+            wyszukiwany tekst
+        limit : int
+            maksymalna liczba zwracanych dań
+
+        Returns
+        ----------
+        list
+            lista krotek (dish_name, which_course)
+        """
+
+        query = query.strip()
+        tokens = re.findall(r'\w+', query)
+        if not tokens:
+            return []
+
+        if self.table_name not in self.database.search_indexes:
+            self.database.search_indexes[self.table_name] = self.create_search_index()
+            self.database.commit()
+
+        results = []
+        if self.database.search_indexes[self.table_name]:
+            fts_table = self._search_tables()[1]
+            match = ' '.join(f'"{token}"*' for token in tokens)
+            results = self.database.execute(f"SELECT d.dish_name, d.which_course FROM {fts_table} f "
+                                            f"JOIN {self.table_name} d ON d.id = f.rowid WHERE {fts_table} MATCH ? "
+                                            f"ORDER BY f.rank LIMIT ?", (match, limit)).fetchall()
+
+        if len(results) < limit and len(query) >= 3:
+            pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            found = set(dish_name for dish_name, _ in results)
+            for row in self.database.execute(f"SELECT dish_name, which_course FROM {self.table_name} "
+                                             f"WHERE dish_name LIKE ? ESCAPE '\\' LIMIT ?",
+                                             (pattern, limit + len(found))).fetchall():
+                if row[0] not in found and len(results) < limit:
+                    results.append(row)
+
+        return results
+
+    def course_counts(self):
+        """Zwraca liczbę dań w tabeli z podziałem na pierwsze i drugie danie
+
+        Returns
+        ----------
+        dict
+            słownik, w którym kluczem jest numer dania, a wartością liczba dań
+        """
+
+        return dict(self._dish_cache().course_counts)
+
+    def _dish_cache(self):
+        """Zwraca aktualną pamięć podręczną dań dla tabeli
+
+        Pamięć podręczna jest tworzona na nowo, jeżeli jeszcze nie istnieje lub wartość 'PRAGMA data_version'
+        wskazuje, że baza danych została zmodyfikowana przez inne połączenie
+        """
+
+        data_version = self.database.data_version()
+        dish_cache = self.database.dish_caches.get(self.table_name)
+
+        if dish_cache is None or dish_cache.data_version != data_version:
+            rows = self.database.execute(f"SELECT dish_name, which_course FROM {self.table_name}").fetchall()
+            dish_cache = DishCache(rows, data_version)
+            self.database.dish_caches[self.table_name] = dish_cache
+
+        return dish_cache
+
+
+class DishCache:
+    """Klasa reprezentująca pamięć podręczną z daniami zapisanymi w tabeli
+
+    Pamięć podręczna jest aktualizowana na bieżąco przez metody insert i delete klasy Table, dzięki czemu
+    odczyt listy dań oraz zliczenie dań nie wymagają ponownego odczytu całej tabeli
+
+    Attributes
+    ----------
+    dishes : dict
+        słownik, w którym kluczem jest nazwa dania, a wartością numer dania (1 lub 2)
+    course_counts : dict
+        słownik z liczbą dań w tabeli z podziałem na pierwsze i drugie danie
+    data_version : int
+        wartość 'PRAGMA data_version' z momentu odczytu danych z tabeli
+
+    Methods
+    ----------
+    add(dish_name, which_course)
+        dodaje danie do pamięci podręcznej
+    remove(dish_name)
+        usuwa danie z pamięci podręcznej
+    contains(dish_name)
+        sprawdza, czy danie znajduje się w pamięci podręcznej
+    list_dishes()
+        zwraca listę dań w postaci krotek (dish_name, which_course)
+    similarity_index()
+        zwraca indeks trygramów nazw dań służący do wyszukiwania podobnych dań
+    """
+
+    def __init__(self, rows, data_version):
+        """
+        Parameters
+        ----------
+        rows : iterable
+            wiersze tabeli w postaci krotek (dish_name, which_course)
+        data_version : int
+            wartość 'PRAGMA data_version' z momentu odczytu wierszy
+        """
+
+        self.dishes = {}
+        self.course_counts = {1: 0, 2: 0}
+        self.data_version = data_version
+        self._similarity_index = None
+
+        for dish_name, which_course in rows:
+            self.add(dish_name, which_course)
+
+    def add(self, dish_name, which_course):
+        """Dodaje danie do pamięci podręcznej"""
+
+        if dish_name not in self.dishes:
+            self.dishes[dish_name] = which_course
+            self.course_counts[which_course] = self.course_counts.get(which_course, 0) + 1
+            if self._similarity_index is not None:
+                self._similarity_index.add(dish_name)
+
+    def remove(self, dish_name):
+        """Usuwa danie z pamięci podręcznej"""
+
+        which_course = self.dishes.pop(dish_name, None)
+        if which_course is not None:
+            self.course_counts[which_course] -= 1
+            if self._similarity_index is not None:
+                self._similarity_index.remove(dish_name)
+
+    def contains(self, dish_name):
+        """Sprawdza, czy danie znajduje się w pamięci podręcznej"""
+
+        return dish_name in self.dishes
+
+    def list_dishes(self):
+        """Zwraca listę dań w postaci krotek (dish_name, which_course)"""
+
+        return list(self.dishes.items())
+
+    def similarity_index(self):
+        """Zwraca indeks trygramów nazw dań (instancja klasy SimilarityIndex)
+
+        Indeks budowany jest przy pierwszym użyciu, a następnie aktualizowany razem z pamięcią podręczną
+        """
+
+        if self._similarity_index is None:
+            self._similarity_index = SimilarityIndex(self.dishes)
+        return self._similarity_index
+
+
+class SimilarityIndex:
+    """Klasa reprezentująca indeks służący do wyszukiwania dań o podobnych nazwach
+
+    Nazwy dań są normalizowane (małe litery, bez polskich znaków i znaków interpunkcyjnych, pojedyncze spacje),
+    dzięki czemu np. 'Zupa pomidorowa' i 'zupa  pomidorowa' mają tę samą postać. Podobieństwo nazw to
+    współczynnik Jaccarda zbiorów trygramów (trzyznakowych fragmentów słów) znormalizowanych nazw.
+    Indeks odwrotny (trygram -> nazwy dań) pozwala wyszukać podobne dania bez porównywania nazwy z każdym
+    daniem z tabeli - kandydaci pobierani są tylko dla najrzadszych trygramów, których liczba wynika
+    z progu podobieństwa, a następnie odrzucani na podstawie liczby trygramów
+
+    Attributes
+    ----------
+    threshold : float
+        domyślny próg podobieństwa (od 0 do 1), od którego dania uznawane są za prawie identyczne
+    normalized_names : dict
+        słownik, w którym kluczem jest znormalizowana nazwa, a wartością zbiór nazw dań
+    grams : dict
+        słownik, w którym kluczem jest nazwa dania, a wartością zbiór jej trygramów
+    postings : dict
+        słownik, w którym kluczem jest trygram, a wartością zbiór nazw dań, w których występuje
+
+    Methods
+    ----------
+    normalize(dish_name)
+        zwraca znormalizowaną nazwę dania
+    trigrams(normalized_name)
+        zwraca zbiór trygramów znormalizowanej nazwy dania
+    add(dish_name)
+        dodaje danie do indeksu
+    remove(dish_name)
+        usuwa danie z indeksu
+    find(dish_name, threshold, limit)
+        zwraca dania podobne do podanego dania
+    """
+
+    __slots__ = ('normalized_names', 'grams', 'postings')
+
+    threshold = 0.75
+
+    _PUNCTUATION = re.compile(r'[\W_]+')
+    _COMBINING = re.compile('[\u0300-\u036f]')
+    _LETTERS = str.maketrans({'ł': 'l', 'ø': 'o', 'ß': 'ss'})
+
+    def __init__(self, dish_names=()):
+        """
+        Parameters
+        ----------
+        dish_names : iterable
+            nazwy dań dodawane do indeksu
+        """
+
+        self.normalized_names = {}
+        self.grams = {}
+        self.postings = {}
+
+        for dish_name in dish_names:
+            self.add(dish_name)
+
+    def __len__(self):
+        return len(self.grams)
+
+    @classmethod
+    def normalize(cls, dish_name):
+        """Zwraca znormalizowaną nazwę dania - bez wielkich liter, znaków diakrytycznych i interpunkcji"""
+
+        decomposed = unicodedata.normalize('NFKD', dish_name.casefold().translate(cls._LETTERS))
+        return cls._PUNCTUATION.sub(' ', cls._COMBINING.sub('', decomposed)).strip()
+
+    @staticmethod
+    def trigrams(normalized_name):
+        """Zwraca zbiór trygramów znormalizowanej nazwy dania
+
+        Każde słowo uzupełniane jest dwiema spacjami na początku i jedną na końcu, dzięki czemu
+        trygramy uwzględniają również początki i końce słów
+        """
+
+        return frozenset([padded[i:i + 3] for padded in [f"  {word} " for word in normalized_name.split()]
+                          for i in range(len(padded) - 2)])
+
+    def add(self, dish_name):
+        """Dodaje danie do indeksu"""
+
+        if dish_name in self.grams:
+            return
+        normalized_name = self.normalize(dish_name)
+        grams = self.trigrams(normalized_name)
+        self.grams[dish_name] = grams
+        self.normalized_names.setdefault(normalized_name, set()).add(dish_name)
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(dish_name)
+
+    def remove(self, dish_name):
+        """Usuwa danie z indeksu"""
+
+        grams = self.grams.pop(dish_name, None)
+        if grams is None:
+            return
+        normalized_name = self.normalize(dish_name)
+        names = self.normalized_names[normalized_name]
+        names.discard(dish_name)
+        if not names:
+            del self.normalized_names[normalized_name]
+        for gram in grams:
+            names = self.postings[gram]
+            names.discard(dish_name)
+            if not names:
+                del self.postings[gram]
+
+    def find(self, dish_name, threshold=None, limit=5):
+        """Zwraca dania podobne do podanego dania
+
+        Danie o dokładnie takiej samej nazwie nie jest zwracane. Dania o tej samej znormalizowanej nazwie
+        mają podobieństwo równe 1
+
+        Parameters
+        ----------
+        dish_name : str
+            nazwa dania
+        threshold : float, optional
+            próg podobieństwa z przedziału (0, 1], domyślnie wartość atrybutu 'threshold'
+        limit : int, optional
+            maksymalna liczba zwracanych dań, domyślnie 5 (None oznacza brak ograniczenia)
+
+        Returns
+        ----------
+        list
+            lista krotek (nazwa dania, podobieństwo) uporządkowana od najbardziej podobnego dania
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli próg podobieństwa nie należy do przedziału (0, 1]
+        """
+
+        if threshold is None:
+            threshold = self.threshold
+        if not 0 < threshold <= 1:
+            raise ValueError("Próg podobieństwa musi należeć do przedziału (0, 1].")
+
+        normalized_name = self.normalize(dish_name)
+        grams = self.trigrams(normalized_name)
+        similar = {name: 1.0 for name in self.normalized_names.get(normalized_name, ()) if name != dish_name}
+
+        if grams:
+            # danie o podobieństwie >= threshold musi zawierać co najmniej jeden z (len(grams) - wymagana
+            # liczba wspólnych trygramów + 1) trygramów, więc wystarczy przejrzeć najrzadsze z nich
+            required = math.ceil(threshold * len(grams) - 1e-9)
+            rarest = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+            candidates = set()
+            for gram in rarest[:len(grams) - required + 1]:
+                candidates.update(self.postings.get(gram, ()))
+
+            candidates.discard(dish_name)
+            size = len(grams)
+            shortest, longest = threshold * size, size / threshold
+            index_grams = self.grams
+            for name in candidates:
+                other = index_grams[name]
+                if shortest <= len(other) <= longest:
+                    common = len(grams & other)
+                    if common >= required:
+                        similarity = common / (size + len(other) - common)
+                        if similarity >= threshold and name not in similar:
+                            similar[name] = similarity
+
+        return sorted(similar.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+class DishPool:
+    """Klasa reprezentująca pulę dań, które mogą zostać wylosowane w danym dniu planu
+
+    Dania wylosowane w ostatnich (min_interval_time - 1) dniach trafiają do okna wykluczeń
+    i na ten czas są usuwane z puli. Dodanie i usunięcie dania z puli odbywa się w czasie stałym
+    (zamiana z ostatnim elementem listy), dzięki czemu koszt wylosowania obiadu na jeden dzień
+    nie zależy ani od liczby dań w tabeli, ani od wartości min_interval_time.
+
+    Attributes
+    ----------
+    rng : obiekt udostępniający metodę randrange (np. moduł random)
+        generator liczb losowych wykorzystywany do losowania dań
+    eligible : list
+        lista nazw dań, które mogą zostać wylosowane
+    positions : dict
+        słownik przechowujący pozycję każdego dania na liście 'eligible'
+    window : collections.deque
+        kolejka z nazwami dań wylosowanych w ostatnich dniach
+    window_size : int
+        liczba ostatnich dni, w których obiad nie może się powtórzyć
+
+    Methods
+    ----------
+    seed_window(history)
+        wypełnia okno wykluczeń daniami z ostatnich dni poprzedniego planu
+    draw()
+        losuje danie z puli i przesuwa okno wykluczeń o jeden dzień
+    iter_days(start_date, end_date)
+        losuje obiady na kolejne dni z podanego przedziału
+    """
+
+    __slots__ = ('rng', 'eligible', 'positions', 'window', 'window_size')
+
+    def __init__(self, dish_names, min_interval_time, rng=random):
+        """
+        Parameters
+        ----------
+        dish_names : iterable
+            nazwy dań (lub numery dań z katalogu dań planu), z których losowany jest plan
+        min_interval_time : int
+            odstęp czasu liczony w dniach, w którym żaden obiad nie może się powtórzyć
+        rng : obiekt udostępniający metodę randrange, domyślnie moduł random
+            generator liczb losowych wykorzystywany do losowania dań
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli liczba dań jest mniejsza od min_interval_time - wówczas
+            nie da się stworzyć planu spełniającego warunek niepowtarzania się obiadów
+        """
+
+        self.rng = rng
+        self.eligible = list(dict.fromkeys(dish_names))
+        self.positions = {dish: i for i, dish in enumerate(self.eligible)}
+        self.window = deque()
+        self.window_size = max(min_interval_time - 1, 0)
+
+        if len(self.eligible) <= self.window_size or not self.eligible:
+            raise ValueError(f"Liczba dań ({len(self.eligible)}) jest zbyt mała, aby stworzyć plan, w którym obiad "
+                             f"nie powtarza się przez {min_interval_time} dni.")
+
+    def _remove(self, dish):
+        """Usuwa danie z puli w czasie stałym, zastępując je ostatnim elementem listy"""
+
+        position = self.positions.pop(dish)
+        last_dish = self.eligible.pop()
+        if last_dish != dish:
+            self.eligible[position] = last_dish
+            self.positions[last_dish] = position
+
+    def _add(self, dish):
+        """Dodaje danie na koniec puli w czasie stałym"""
+
+        self.positions[dish] = len(self.eligible)
+        self.eligible.append(dish)
+
+    def seed_window(self, history):
+        """Wypełnia okno wykluczeń daniami z ostatnich dni poprzedniego planu
+
+        Dania, których nie ma już w puli (np. usunięte z tabeli) lub które powtarzają się w historii,
+        zajmują w oknie jedynie miejsce (wartość None), dzięki czemu pozostałe dania opuszczają okno
+        we właściwym dniu
+
+        Parameters
+        ----------
+        history : list
+            nazwy dań z ostatnich dni poprzedniego planu uporządkowane od najstarszego
+        """
+
+        recent_dishes = list(history)[-self.window_size:] if self.window_size else []
+        seen = set()
+        entries = []
+
+        for dish in reversed(recent_dishes):
+            entries.append(dish if dish in self.positions and dish not in seen else None)
+            seen.add(dish)
+
+        for dish in reversed(entries):
+            if dish is not None:
+                self._remove(dish)
+            self.window.append(dish)
+
+    def _pick(self):
+        """Wybiera losowe danie z puli (każde danie z jednakowym prawdopodobieństwem)"""
+
+        return self.eligible[self.rng.randrange(len(self.eligible))]
+
+    def draw(self):
+        """Losuje danie z puli i przesuwa okno wykluczeń o jeden dzień
+
+        Wylosowane danie trafia do okna wykluczeń, a danie, które z niego wypada, wraca do puli
+
+        Returns
+        ----------
+        dish : str
+            nazwa wylosowanego dania
+        """
+
+        dish = self._pick()
+        self._remove(dish)
+        self.window.append(dish)
+
+        if len(self.window) > self.window_size:
+            leaving_dish = self.window.popleft()
+            if leaving_dish is not None:
+                self._add(leaving_dish)
+
+        return dish
+
+    def iter_days(self, start_date, end_date):
+        """Losuje obiady na kolejne dni z podanego przedziału
+
+        Parameters
+        ----------
+        start_date : instancja klasy datetime.date
+            data początkowa
+        end_date : instancja klasy datetime.date
+            data końcowa
+
+        Yields
+        ----------
+        tuple
+            krotka zawierająca dane o dniu (instancja klasy datetime.date) i obiedzie (str)
+        """
+
+        date = start_date
+        one_day = datetime.timedelta(days=1)
+
+        while date <= end_date:
+            yield date, self.draw()
+            date += one_day
+
+
+class WeightTree:
+    """Klasa losująca dania z prawdopodobieństwem proporcjonalnym do ich wag
+
+    Wagi dań przechowywane są w liściach drzewa przedziałowego, a każdy węzeł przechowuje sumę wag
+    swoich dzieci. Zmiana wagi jednego dania (np. wyłączenie go z losowania przez ustawienie wagi 0)
+    oraz wylosowanie dania wymagają jedynie przejścia jednej ścieżki od liścia do korzenia,
+    czyli czasu O(log n). Sumy w węzłach są zawsze wyliczane na nowo z wartości dzieci, dzięki czemu
+    nie kumulują się błędy zaokrągleń, a danie z wagą 0 nigdy nie zostanie wylosowane
+
+    Attributes
+    ----------
+    dishes : list
+        lista nazw dań
+    indexes : dict
+        słownik przechowujący pozycję każdego dania na liście 'dishes'
+    size : int
+        liczba liści drzewa (najmniejsza potęga dwójki nie mniejsza od liczby dań)
+    sums : array.array
+        sumy wag w węzłach drzewa - korzeń ma numer 1, a dzieci węzła i mają numery 2i oraz 2i + 1
+
+    Methods
+    ----------
+    set_weight(dish, weight)
+        zmienia wagę dania
+    draw(rng)
+        losuje danie
+    """
+
+    __slots__ = ('dishes', 'indexes', 'size', 'sums')
+
+    def __init__(self, weights):
+        """
+        Parameters
+        ----------
+        weights : dict
+            słownik, w którym kluczem jest nazwa dania, a wartością jego waga (liczba większa od zera)
+        """
+
+        self.dishes = list(weights)
+        self.indexes = {dish: i for i, dish in enumerate(self.dishes)}
+        self.size = 1
+        while self.size < len(self.dishes):
+            self.size *= 2
+
+        sums = array('d', bytes(16 * self.size))
+        for i, dish in enumerate(self.dishes):
+            sums[self.size + i] = weights[dish]
+        for node in range(self.size - 1, 0, -1):
+            sums[node] = sums[2 * node] + sums[2 * node + 1]
+        self.sums = sums
+
+    def set_weight(self, dish, weight):
+        """Zmienia wagę dania i przelicza sumy na ścieżce od liścia do korzenia
+
+        Parameters
+        ----------
+        dish : str
+            nazwa dania
+        weight : float
+            nowa waga dania - waga 0 wyłącza danie z losowania
+        """
+
+        sums = self.sums
+        node = self.size + self.indexes[dish]
+        sums[node] = weight
+        node //= 2
+        while node:
+            sums[node] = sums[2 * node] + sums[2 * node + 1]
+            node //= 2
+
+    def draw(self, rng=random):
+        """Losuje danie z prawdopodobieństwem proporcjonalnym do jego wagi
+
+        Parameters
+        ----------
+        rng : obiekt udostępniający metodę random, domyślnie moduł random
+            generator liczb losowych
+
+        Returns
+        ----------
+        str
+            nazwa wylosowanego dania
+        """
+
+        sums = self.sums
+        value = rng.random() * sums[1]
+        node = 1
+
+        while node < self.size:
+            node *= 2
+            left_sum = sums[node]
+            # prawe poddrzewo z sumą 0 nie jest wybierane nawet wtedy, gdy zaokrąglenie przesunęło wartość
+            # poza lewe poddrzewo
+            if value >= left_sum and sums[node + 1]:
+                value -= left_sum
+                node += 1
+
+        return self.dishes[node - self.size]
+
+
+class WeightedDishPool(DishPool):
+    """Klasa reprezentująca pulę dań losowanych z prawdopodobieństwem proporcjonalnym do ich wag
+
+    Wagi dań przechowywane są w drzewie przedziałowym (instancja klasy WeightTree). Danie trafiające
+    do okna wykluczeń otrzymuje w drzewie wagę 0, a danie opuszczające okno odzyskuje swoją wagę,
+    dzięki czemu każde losowanie wybiera od razu danie z puli - bez odrzucania dań z okna wykluczeń -
+    w czasie O(log n) niezależnie od wag dań i wartości min_interval_time
+
+    Attributes
+    ----------
+    weights : dict
+        słownik z wagami dań
+    tree : instancja klasy WeightTree
+        drzewo z wagami dań z puli
+    """
+
+    __slots__ = ('weights', 'tree')
+
+    def __init__(self, dish_weights, min_interval_time, rng=random):
+        """
+        Parameters
+        ----------
+        dish_weights : dict
+            słownik, w którym kluczem jest nazwa dania, a wartością jego waga (liczba większa od zera)
+        min_interval_time : int
+            odstęp czasu liczony w dniach, w którym żaden obiad nie może się powtórzyć
+        rng : obiekt udostępniający metody randrange i random, domyślnie moduł random
+            generator liczb losowych wykorzystywany do losowania dań
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli liczba dań jest mniejsza od min_interval_time
+        """
+
+        super().__init__(dish_weights, min_interval_time, rng)
+        self.weights = dish_weights
+        self.tree = WeightTree(dish_weights)
+
+    def _remove(self, dish):
+        """Usuwa danie z puli, ustawiając jego wagę w drzewie na 0"""
+
+        super()._remove(dish)
+        self.tree.set_weight(dish, 0.0)
+
+    def _add(self, dish):
+        """Przywraca danie do puli razem z jego wagą"""
+
+        super()._add(dish)
+        self.tree.set_weight(dish, self.weights[dish])
+
+    def _pick(self):
+        """Wybiera danie z puli z prawdopodobieństwem proporcjonalnym do jego wagi"""
+
+        return self.tree.draw(self.rng)
+
+
+class LunchPlan:
+    """Klasa reprezentująca plan obiadów
+
+    Plan przechowywany jest w zwartej postaci: nazwy dań zapisywane są raz w katalogu dań (lista dish_names),
+    a plan jest tablicą array('I') z numerami dań z katalogu, w której pozycja odpowiada liczbie dni od daty
+    początkowej planu. Krotki zawierające dane o dniu i obiedzie tworzone są dopiero przy odczycie planu
+    (atrybuty lunch_plan, days, metoda iter_entries), np. do wyświetlenia lub zapisania planu
+
+    Attributes
+    ----------
+    database : instancja klasy Database
+        baza danych, w której znajduje się tabela, na podstawie której tworzony jest plan
+    table : instancja klasy Table
+        tabela, na podstawie której tworzony jest plan
+    name : str
+        nazwa własna planu
+    start_date : instancja klasy datetime.datetime
+        data początkowa planu
+    end_date : instancja klasy datetime.datetime
+        data końcowa planu
+    min_interval_time : int
+        odstęp czasu liczony w dniach, w którym żaden obiad nie może się powtórzyć
+    dish_names : list
+        katalog dań - nazwy dań (internowane), których numerem jest pozycja na liście
+        Dania są jedynie dopisywane do katalogu, dzięki czemu numery dań w planie pozostają aktualne
+    dish_ids : dict
+        słownik, w którym kluczem jest nazwa dania, a wartością jego numer w katalogu dań
+    dish_courses : array.array
+        numer dania (1 lub 2) dla każdego dania z katalogu
+    table_dish_ids : array.array
+        numery dań z katalogu, które znajdują się obecnie w tabeli
+    plan_ids : array.array
+        numery dań z katalogu na kolejne dni planu
+    dish_days : dict
+        słownik, w którym kluczem jest numer dania, a wartością zbiór pozycji dni z tym daniem w planie
+        - tworzony przy pierwszej naprawie planu (metoda repair)
+    soup_ids : array.array
+        numery pierwszych dań na kolejne dni planu obiadów dwudaniowych
+    main_ids : array.array
+        numery drugich dań na kolejne dni planu obiadów dwudaniowych
+    weighted : bool
+        decyduje, czy obiady losowane są z uwzględnieniem wag dań zapisanych w tabeli
+    seed : int
+        ziarno generatora liczb losowych planu lub None, jeżeli plan nie jest powtarzalny
+    rng : instancja klasy random.Random
+        generator liczb losowych planu - dwa plany utworzone z tym samym ziarnem i tymi samymi
+        parametrami są identyczne, niezależnie od innych planów generowanych w tym samym czasie
+    days : list
+        lista z datami (instancje klasy datetime.datetime) pomiędzy datą poczatkową a końcową
+    days_to_str : list
+        lista z datami w postaci stringow pomiędzy datą początkową a końcową
+    list_of_dishes : list
+        lista z danymi z poszczególnych wierszy tabeli, na podstawie której tworzony jest plan
+    lunch_plan : list
+        lista z gotowym planem obiadów - składa się z krotek zawierających dane o dniu i obiedzie
+    two_course_plan : list
+        lista z gotowym planem obiadów dwudaniowych - składa się z krotek zawierających dane o dniu,
+        pierwszym daniu i drugim daniu
+    """
+
+    __slots__ = ('database', 'table', 'name', 'start_date', 'end_date', 'min_interval_time', 'dish_names',
+                 'dish_ids', 'dish_courses', 'table_dish_ids', 'plan_ids', 'dish_days', 'soup_ids', 'main_ids',
+                 'weighted', 'seed', 'rng')
+
+    def __init__(self, database, table, lunch_planner_data: tuple, weighted=False, seed=None):
+        """
+        Parameters
+        ----------
+        database : instancja klasy Database
+            baza danych, w której znajduje się tabela, na podstawie której tworzony jest plan
+        table : instancja klasy Table
+            tabela, na podstawie której tworzony jest plan
+        lunch_planner_data: tuple
+            krotka zawierajaca dane niezbędne do stworzenia planu: name, start_date, end_date, min_interval_time
+        weighted : bool
+            decyduje, czy obiady losowane są z uwzględnieniem wag dań zapisanych w tabeli
+        seed : int, optional
+            ziarno generatora liczb losowych planu
+        """
+
+        self.database = database
+        self.table = table
+        self.name = lunch_planner_data[0]
+        self.start_date = lunch_planner_data[1]
+        self.end_date = lunch_planner_data[2]
+        self.min_interval_time = lunch_planner_data[3]
+        self.dish_names = []
+        self.dish_ids = {}
+        self.dish_courses = array('B')
+        self.table_dish_ids = array('I')
+        self.plan_ids = array('I')
+        self.dish_days = None
+        self.soup_ids = array('I')
+        self.main_ids = array('I')
+        self.weighted = weighted
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._load_dishes()
+
+    def _load_dishes(self):
+        """Odczytuje dania z tabeli i dopisuje do katalogu dań te, których w nim jeszcze nie ma"""
+
+        table_dish_ids = array('I')
+
+        for dish_name, which_course in self.table.list_dishes():
+            dish_id = self.dish_ids.get(dish_name)
+            if dish_id is None:
+                dish_id = len(self.dish_names)
+                dish_name = sys.intern(dish_name)
+                self.dish_ids[dish_name] = dish_id
+                self.dish_names.append(dish_name)
+                self.dish_courses.append(which_course)
+            else:
+                self.dish_courses[dish_id] = which_course
+            table_dish_ids.append(dish_id)
+
+        self.table_dish_ids = table_dish_ids
+
+    @property
+    def list_of_dishes(self):
+        """Lista dań z tabeli w postaci krotek (dish_name, which_course) tworzona na podstawie katalogu dań"""
+
+        return [(self.dish_names[dish_id], self.dish_courses[dish_id]) for dish_id in self.table_dish_ids]
+
+    @property
+    def lunch_plan(self):
+        """Lista z planem obiadów w postaci krotek zawierających dane o dniu i obiedzie"""
+
+        return list(self.iter_entries())
+
+    @property
+    def days(self):
+        """Lista z datami kolejnych dni planu"""
+
+        return [date for date, _ in self.iter_entries()]
+
+    @property
+    def days_to_str(self):
+        """Lista z datami kolejnych dni planu w postaci 'dzień-miesiąc-rok'"""
+
+        return [date.strftime('%d-%m-%Y') for date in self.days]
+
+    @property
+    def two_course_plan(self):
+        """Lista z planem obiadów dwudaniowych w postaci krotek zawierających dane o dniu i obu daniach"""
+
+        one_day = datetime.timedelta(days=1)
+        return [(self.start_date + offset * one_day, self.dish_names[soup_id], self.dish_names[main_id])
+                for offset, (soup_id, main_id) in enumerate(zip(self.soup_ids, self.main_ids))]
+
+    def iter_entries(self, first_offset=0, last_offset=None):
+        """Zwraca kolejne obiady z gotowego planu w postaci krotek
+
+        Parameters
+        ----------
+        first_offset : int
+            pozycja pierwszego dnia (liczba dni od daty początkowej planu)
+        last_offset : int, optional
+            pozycja dnia, na którym kończy się odczyt (bez tego dnia), domyślnie koniec planu
+
+        Yields
+        ----------
+        tuple
+            krotka zawierająca dane o dniu (instancja klasy datetime.date) i obiedzie (str)
+        """
+
+        dish_names = self.dish_names
+        one_day = datetime.timedelta(days=1)
+        date = self.start_date + first_offset * one_day
+
+        for dish_id in islice(self.plan_ids, first_offset, last_offset):
+            yield date, dish_names[dish_id]
+            date += one_day
+
+    def _number_of_days(self):
+        """Zwraca liczbę dni pomiędzy datą początkową a końcową planu (włącznie)"""
+
+        return max((self.end_date - self.start_date).days + 1, 0)
+
+    def iter_plan(self, history=(), rng=None):
+        """Generuje plan obiadów dzień po dniu
+
+        W przeciwieństwie do metody make_plan nie tworzy listy z całym planem - przechowuje jedynie pulę dań
+        oraz okno wykluczeń z ostatnich dni, dzięki czemu zużycie pamięci nie zależy od długości planu
+
+        Parameters
+        ----------
+        history : iterable
+            nazwy dań z ostatnich dni poprzedzających plan (od najstarszego) - dania te nie zostaną
+            wylosowane, dopóki nie minie min_interval_time dni od ich podania
+        rng : instancja klasy random.Random, optional
+            generator liczb losowych wykorzystywany do losowania dań, domyślnie atrybut rng
+
+        Yields
+        ----------
+        tuple
+            krotka zawierająca dane o dniu (instancja klasy datetime.date) i obiedzie (str)
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli w tabeli jest mniej dań niż wynosi min_interval_time
+        """
+
+        dish_pool = self._dish_pool(rng)
+        dish_pool.seed_window([self.dish_ids.get(dish) for dish in history])
+        for date, dish_id in dish_pool.iter_days(self.start_date, self.end_date):
+            yield date, self.dish_names[dish_id]
+
+    def _dish_pool(self, rng=None):
+        """Zwraca pulę numerów dań, z której losowany jest plan - z uwzględnieniem wag dań lub bez"""
+
+        rng = rng or self.rng
+
+        if self.weighted:
+            weights = self.table.dish_weights()
+            return WeightedDishPool({dish_id: weights.get(self.dish_names[dish_id], 1.0)
+                                     for dish_id in self.table_dish_ids}, self.min_interval_time, rng)
+        return DishPool(self.table_dish_ids, self.min_interval_time, rng)
+
+    def make_plan(self, plan_store=None, rng=None):
+        """ Zwraca wygenerowany plan obiadów w postaci listy
+
+        Obiady losowane są z puli dań (obiekt klasy DishPool), z której na bieżąco usuwane są dania
+        występujące w poprzednich dniach określonych przez atrybut min_interval_time
+        Dzięki temu każde losowanie kończy się powodzeniem, a wygenerowanie obiadu na jeden dzień
+        zajmuje stały czas niezależnie od liczby dań w tabeli
+        Jeżeli podano parametr plan_store - dania z ostatnich dni poprzedzających plan, zapisane w bazie
+        dla planu o tej samej nazwie, również nie zostaną powtórzone
+        Plan zapisywany jest w atrybucie plan_ids w postaci tablicy z numerami dań
+
+        Parameters
+        ----------
+        plan_store : instancja klasy PlanStore, optional
+            plany zapisane w bazie danych, na podstawie których uwzględniane są obiady z poprzednich dni
+        rng : instancja klasy random.Random, optional
+            generator liczb losowych wykorzystywany do losowania dań, domyślnie atrybut rng
+
+        Returns
+        ----------
+        lunch_plan : list
+            lista z gotowym planem obiadów - składa się z krotek zawierających dane o dniu i obiedzie
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli w tabeli jest mniej dań niż wynosi min_interval_time
+        """
+
+        history = ()
+        if plan_store is not None:
+            history = plan_store.last_dishes(self.name, self.table.table_name, self.start_date,
+                                             self.min_interval_time - 1)
+
+        dish_pool = self._dish_pool(rng)
+        dish_pool.seed_window([self.dish_ids.get(dish) for dish in history])
+        self.set_plan_ids(array('I', (dish_pool.draw() for _ in range(self._number_of_days()))))
+
+        return self.lunch_plan
+
+    def set_plan(self, lunch_plan):
+        """Zapisuje w obiekcie gotowy plan obiadów, np. odczytany z pliku
+
+        Parameters
+        ----------
+        lunch_plan : iterable
+            krotki zawierające dane o dniu i obiedzie dla kolejnych dni, począwszy od daty początkowej planu
+
+        Returns
+        ----------
+        lunch_plan : list
+            lista z planem obiadów
+        """
+
+        self.set_plan_ids(array('I', (self.dish_ids[dish] for _, dish in lunch_plan)))
+        return self.lunch_plan
+
+    def set_plan_ids(self, plan_ids):
+        """Zapisuje w obiekcie gotowy plan obiadów w postaci tablicy z numerami dań z katalogu dań
+
+        Parameters
+        ----------
+        plan_ids : array.array
+            numery dań na kolejne dni, począwszy od daty początkowej planu
+        """
+
+        self.plan_ids = plan_ids
+        self.dish_days = None
+
+    def _two_course_pools(self, soup_interval, main_interval):
+        """Zwraca pule pierwszych i drugich dań, sprawdzając wcześniej, czy w tabeli jest ich wystarczająco dużo"""
+
+        intervals = {1: soup_interval or self.min_interval_time, 2: main_interval or self.min_interval_time}
+        course_names = {1: 'pierwszych', 2: 'drugich'}
+        dishes_by_course = {1: [], 2: []}
+
+        for dish_id in self.table_dish_ids:
+            which_course = self.dish_courses[dish_id]
+            if which_course in dishes_by_course:
+                dishes_by_course[which_course].append(dish_id)
+
+        for which_course, dish_ids in dishes_by_course.items():
+            if len(dish_ids) < intervals[which_course]:
+                raise ValueError(f"Liczba {course_names[which_course]} dań w tabeli ({len(dish_ids)}) jest "
+                                 f"mniejsza niż odstęp czasu wynoszący {intervals[which_course]} dni.")
+
+        return DishPool(dishes_by_course[1], intervals[1], self.rng), \
+            DishPool(dishes_by_course[2], intervals[2], self.rng)
+
+    def iter_two_course_plan(self, soup_interval=None, main_interval=None):
+        """Generuje plan obiadów dwudaniowych dzień po dniu
+
+        Na każdy dzień losowane jest jedno pierwsze danie (which_course = 1) i jedno drugie danie
+        (which_course = 2) - każde z osobnej puli dań i z osobnym minimalnym odstępem czasu
+        Sprawdzenie, czy w tabeli jest wystarczająco dużo dań każdego rodzaju, wykonywane jest od razu
+        przy wywołaniu metody - jeszcze przed rozpoczęciem losowania
+
+        Parameters
+        ----------
+        soup_interval : int, optional
+            odstęp czasu liczony w dniach, w którym pierwsze danie nie może się powtórzyć,
+            domyślnie wartość atrybutu min_interval_time
+        main_interval : int, optional
+            odstęp czasu liczony w dniach, w którym drugie danie nie może się powtórzyć,
+            domyślnie wartość atrybutu min_interval_time
+
+        Returns
+        ----------
+        generator
+            generator zwracający krotki zawierające dane o dniu (instancja klasy datetime.date),
+            pierwszym daniu i drugim daniu
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli w tabeli jest za mało pierwszych lub drugich dań
+        """
+
+        return self._iter_two_courses(*self._two_course_pools(soup_interval, main_interval))
+
+    def _iter_two_courses(self, soup_pool, main_pool):
+        """Losuje z podanych pul pierwsze i drugie danie na kolejne dni planu"""
+
+        date = self.start_date
+        one_day = datetime.timedelta(days=1)
+
+        while date <= self.end_date:
+            yield date, self.dish_names[soup_pool.draw()], self.dish_names[main_pool.draw()]
+            date += one_day
+
+    def make_two_course_plan(self, soup_interval=None, main_interval=None):
+        """Zwraca wygenerowany plan obiadów dwudaniowych w postaci listy
+
+        Plan zapisywany jest w atrybutach soup_ids i main_ids w postaci tablic z numerami dań
+
+        Parameters
+        ----------
+        soup_interval : int, optional
+            odstęp czasu liczony w dniach, w którym pierwsze danie nie może się powtórzyć
+        main_interval : int, optional
+            odstęp czasu liczony w dniach, w którym drugie danie nie może się powtórzyć
+
+        Returns
+        ----------
+        two_course_plan : list
+            lista krotek zawierających dane o dniu, pierwszym daniu i drugim daniu
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli w tabeli jest za mało pierwszych lub drugich dań
+        """
+
+        soup_pool, main_pool = self._two_course_pools(soup_interval, main_interval)
+        self.soup_ids = array('I')
+        self.main_ids = array('I')
+
+        for _ in range(self._number_of_days()):
+            self.soup_ids.append(soup_pool.draw())
+            self.main_ids.append(main_pool.draw())
+
+        return self.two_course_plan
+
+    def extend(self, new_end_date):
+        """Wydłuża gotowy plan obiadów do nowej daty końcowej
+
+        Losowane są jedynie obiady na nowe dni - okno wykluczeń wypełniane jest obiadami z ostatnich dni
+        dotychczasowego planu, dzięki czemu warunek niepowtarzania się obiadów jest zachowany na styku
+        Liczba nowych dni liczona jest od dnia następującego po ostatnim wylosowanym obiedzie, więc dla planu,
+        który nie został jeszcze wylosowany, losowane są obiady na wszystkie dni do nowej daty końcowej
+
+        Parameters
+        ----------
+        new_end_date : instancja klasy datetime.date
+            nowa data końcowa planu
+
+        Returns
+        ----------
+        list
+            lista krotek zawierających dane o dniu i obiedzie dla dodanych dni
+        """
+
+        if new_end_date <= self.end_date:
+            return []
+
+        self._load_dishes()
+        history = self.plan_ids[-(self.min_interval_time - 1):] if self.min_interval_time > 1 else []
+        dish_pool = self._dish_pool()
+        dish_pool.seed_window(history)
+
+        first_offset = len(self.plan_ids)
+        next_date = self.start_date + datetime.timedelta(days=first_offset)
+        self.plan_ids.extend(dish_pool.draw() for _ in range((new_end_date - next_date).days + 1))
+        self.end_date = new_end_date
+        if self.dish_days is not None:
+            for offset in range(first_offset, len(self.plan_ids)):
+                self.dish_days.setdefault(self.plan_ids[offset], set()).add(offset)
+
+        return list(self.iter_entries(first_offset))
+
+    def repair(self, removed_dishes):
+        """Zastępuje w gotowym planie obiady, które zostały usunięte z tabeli
+
+        Zmieniane są tylko dni z usuniętymi daniami. Nowy obiad na dany dzień nie może wystąpić
+        w (min_interval_time - 1) dniach przed ani po tym dniu, dzięki czemu warunek niepowtarzania się
+        obiadów jest zachowany wokół zmienionych dni. Dni z danym obiadem wyszukiwane są przy użyciu
+        słownika dish_days, więc koszt naprawy zależy od liczby zmienionych dni, a nie od długości planu
+        Nowe obiady losowane są dla wszystkich dni przed wprowadzeniem zmian w planie, więc w przypadku
+        błędu plan pozostaje niezmieniony
+
+        Parameters
+        ----------
+        removed_dishes : iterable
+            nazwy dań usuniętych z tabeli
+
+        Returns
+        ----------
+        list
+            lista krotek zawierających dane o dniu i nowym obiedzie dla zmienionych dni
+
+        Raises
+        ----------
+        ValueError
+            zwraca wyjątek, jeżeli dla któregoś dnia nie ma dania spełniającego warunek niepowtarzania się obiadów
+        """
+
+        removed_ids = {self.dish_ids[dish] for dish in removed_dishes if dish in self.dish_ids}
+        self._load_dishes()
+        dish_ids = [dish_id for dish_id in self.table_dish_ids if dish_id not in removed_ids]
+        window_size = self.min_interval_time - 1
+        one_day = datetime.timedelta(days=1)
+
+        if self.dish_days is None:
+            self.dish_days = {}
+            for offset, dish_id in enumerate(self.plan_ids):
+                self.dish_days.setdefault(dish_id, set()).add(offset)
+
+        offsets = sorted(offset for dish_id in removed_ids for offset in self.dish_days.get(dish_id, ()))
+        replacements = {}
+
+        for offset in offsets:
+            neighbours = [replacements.get(day, self.plan_ids[day])
+                          for day in range(max(offset - window_size, 0), min(offset + window_size + 1,
+                                                                               len(self.plan_ids)))]
+            excluded = removed_ids.union(neighbours)
+            replacements[offset] = self._draw_excluding(dish_ids, excluded, self.rng)
+
+        for dish_id in removed_ids:
+            self.dish_days.pop(dish_id, None)
+        repaired_entries = []
+        for offset, new_dish_id in replacements.items():
+            self.plan_ids[offset] = new_dish_id
+            self.dish_days.setdefault(new_dish_id, set()).add(offset)
+            repaired_entries.append((self.start_date + offset * one_day, self.dish_names[new_dish_id]))
+
+        return repaired_entries
+
+    @staticmethod
+    def _draw_excluding(dish_names, excluded, rng=random, attempts=32):
+        """Losuje danie (lub numer dania) spoza zbioru 'excluded'
+
+        Najpierw wykonywanych jest kilka losowań z całej listy dań - dopiero gdy żadne nie zakończy się
+        powodzeniem, tworzona jest lista dozwolonych dań
+        """
+
+        if dish_names:
+            for attempt in range(attempts):
+                dish = rng.choice(dish_names)
+                if dish not in excluded:
+                    if attempt and instrumentation.enabled:
+                        instrumentation.count('LunchPlan.repair_rejections', attempt)
+                    return dish
+
+        if instrumentation.enabled:
+            instrumentation.count('LunchPlan.repair_rejections', attempts if dish_names else 0)
+            instrumentation.count('LunchPlan.repair_fallbacks')
+
+        allowed_dishes = [dish for dish in dish_names if dish not in excluded]
+        if not allowed_dishes:
+            raise ValueError("W tabeli nie ma dania, które mogłoby zastąpić usunięte danie bez naruszenia "
+                             "minimalnego odstępu czasu pomiędzy powtórzeniami obiadów.")
+        return rng.choice(allowed_dishes)
+
+    @staticmethod
+    def format_entry(entry):
+        """Zamienia obiad z planu na tekst w postaci 'dzień-miesiąc-rok --> danie'
+
+        Dla planu obiadów dwudaniowych oba dania rozdzielone są znakiem '+'
+
+        Parameters
+        ----------
+        entry : tuple
+            krotka zawierająca dane o dniu i obiedzie (lub o dniu, pierwszym daniu i drugim daniu)
+
+        Returns
+        ----------
+        str
+            obiad w postaci tekstu
+        """
+
+        return f"{entry[0].strftime('%d-%m-%Y')} --> {' + '.join(entry[1:])}"
+
+    def print_plan(self, lunch_plan=None):
+        """Wyświetla w konsoli plan obiadów
+
+        Ponadto zamienia daty znajdujące się w tabeli lunch_plan na datę w formacie dzień-miesiąc-rok
+
+        Parameters
+        ----------
+        lunch_plan : iterable, optional
+            plan obiadów do wyświetlenia, np. generator zwrócony przez metodę iter_plan lub iter_two_course_plan
+            Domyślnie wyświetlany jest gotowy plan zapisany w obiekcie
+        """
+
+        if lunch_plan is None:
+            lunch_plan = self.iter_entries()
+
+        start_date_str = self.start_date.strftime('%d-%m-%Y')
+        end_date_str = self.end_date.strftime('%d-%m-%Y')
+
+        print(f"Oto plan '{self.name}' wygenerowany dla okresu {start_date_str} - {end_date_str}:")
+        for x in lunch_plan:
+            print(self.format_entry(x))
+
+    def save_plan(self, lunch_plan=None, file_name=None, interactive=True):
+        """Zapisuje plan obiadów do pliku z rozszerzeniem .txt
+
+        Plik zapisywany jest w katalogu roboczym
+
+        Parameters
+        ----------
+        lunch_plan : iterable, optional
+            plan obiadów do zapisania, np. generator zwrócony przez metodę iter_plan lub iter_two_course_plan
+            Domyślnie zapisywany jest gotowy plan zapisany w obiekcie
+        file_name : str, optional
+            ścieżka do zapisywanego pliku, domyślnie nazwa planu z rozszerzeniem .txt
+        interactive : bool
+            decyduje, czy w konsoli wyświetlane są komunikaty dla użytkownika - w trybie wsadowym
+            plik zapisywany jest bez komunikatów i bez odliczania
+        """
+
+        if lunch_plan is None:
+            lunch_plan = self.iter_entries()
+
+        if file_name is None:
+            file_name = f"{self.name}.txt"
+
+        if interactive:
+            print("Plan w postaci pliku .txt zostanie zapisany w katalogu roboczym.")
+
+        with open(file_name, 'w', buffering=1 << 16) as file:
+            file.writelines(self.format_entry(x) + "\n" for x in lunch_plan)
+
+        if not interactive:
+            return
+
+        for x in range(3, 0, -1):
+            print(x)
+            time.sleep(1)
+
+        if os.path.exists(file_name):
+            print("Plik został pomyślnie zapisany w katalogu roboczym.")
+
+    def _offset(self, date):
+        """Zwraca pozycję dnia w planie liczoną jako liczba dni od daty początkowej planu"""
+
+        return (date - self.start_date).days
+
+    def dish_for(self, date):
+        """Zwraca obiad zaplanowany na dany dzień
+
+        Pozycja dnia w planie wyznaczana jest na podstawie liczby dni od daty początkowej planu,
+        dzięki czemu wyszukanie obiadu nie wymaga przeglądania całego planu
+
+        Parameters
+        ----------
+        date : instancja klasy datetime.date
+            dzień, dla którego wyszukiwany jest obiad
+
+        Returns
+        ----------
+        str lub None
+            nazwa dania lub None, jeżeli dzień nie został uwzględniony w planie
+        """
+
+        offset = self._offset(date)
+        if 0 <= offset < len(self.plan_ids):
+            return self.dish_names[self.plan_ids[offset]]
+        return None
+
+    def dishes_between(self, first_date, last_date):
+        """Zwraca fragment planu obiadów pomiędzy podanymi datami (włącznie)
+
+        Daty spoza planu są przycinane do jego zakresu
+
+        Parameters
+        ----------
+        first_date : instancja klasy datetime.date
+            data początkowa fragmentu planu
+        last_date : instancja klasy datetime.date
+            data końcowa fragmentu planu
+
+        Returns
+        ----------
+        list
+            lista krotek zawierających dane o dniu i obiedzie
+        """
+
+        first_offset = max(self._offset(first_date), 0)
+        last_offset = self._offset(last_date)
+        if last_offset < first_offset:
+            return []
+        return list(self.iter_entries(first_offset, last_offset + 1))
+
+    def lunch_for_today(self):
+        """Pyta użytkownika, czy chce aby wyświetlony został obiad z planu na dzień dziesiejszy
+
+        W przypadku twierdzącej odpowiedzi wyświetla obiad
+        Gdy dzisiejszy dzień nie został uwzlędniony w planie - wyświetlony zostaje stosowny komunikat
+        """
+
+        today = datetime.date.today()
+        today_str = today.strftime('%d-%m-%Y')
+
+        while True:
+            user_choice = input("Czy chcesz, aby wyświetlony został obiad na dzisiaj? Wpisz 'tak' lub 'nie': ")
+
+            if user_choice == 'nie':
+                break
+            elif user_choice == 'tak':
+                lunch_for_today = self.dish_for(today)
+                if lunch_for_today is None:
+                    print(f"Dzisiejszy dzień tj. {today_str} nie został uwzględniony w planie.")
+                else:
+                    print(f"Obiad na dzisiaj ({today_str}) to: {lunch_for_today}.")
+                break
+            else:
+                print("Możesz wpisać tylko 'tak' lub 'nie'")
+
+
+class PlanStore:
+    """Klasa reprezentująca plany obiadów zapisane w bazie danych
+
+    Plany zapisywane są w dwóch tabelach wewnętrznych (ich nazwy zaczynają się od znaku '_', dlatego
+    nie są wyświetlane na liście tabel):
+        * _plans - informacje o planach (nazwa, tabela z daniami, zakres dat, odstęp czasu),
+        * _plan_days - obiady na poszczególne dni w postaci (plan_id, date, dish_id), gdzie dish_id
+          jest identyfikatorem dania w tabeli, na podstawie której utworzono plan.
+    Klucz główny (plan_id, date) oraz indeks na kolumnie date pozwalają na szybkie zapytania o zakres dat
+
+    Attributes
+    ----------
+    database : instancja klasy Database
+        baza danych, w której zapisywane są plany
+
+    Methods
+    ----------
+    save(lunch_plan, entries)
+        zapisuje plan obiadów w bazie danych
+    list_plans(table_name)
+        zwraca listę zapisanych planów
+    dishes_between(plan_id, first_date, last_date)
+        zwraca obiady z zapisanego planu pomiędzy podanymi datami
+    last_dishes(name, table_name, before_date, count)
+        zwraca obiady z ostatnich dni przed podaną datą dla planów o podanej nazwie
+    """
+
+    def __init__(self, database):
+        """Tworzy tabele wewnętrzne z planami, jeżeli jeszcze nie istnieją
+
+        Parameters
+        ----------
+        database : instancja klasy Database
+            baza danych, w której zapisywane są plany
+        """
+
+        self.database = database
+        self.database.execute("CREATE TABLE IF NOT EXISTS _plans (plan_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                              "name TEXT, table_name TEXT, start_date TEXT, end_date TEXT, "
+                              "min_interval_time INTEGER)")
+        self.database.execute("CREATE INDEX IF NOT EXISTS _plans_name_idx ON _plans (name, table_name)")
+        self.database.execute("CREATE TABLE IF NOT EXISTS _plan_days (plan_id INTEGER NOT NULL, date TEXT NOT NULL, "
+                              "dish_id INTEGER NOT NULL, PRIMARY KEY (plan_id, date)) WITHOUT ROWID")
+        self.database.execute("CREATE INDEX IF NOT EXISTS _plan_days_date_idx ON _plan_days (date)")
+        self.database.commit()
+
+    def save(self, lunch_plan, entries=None):
+        """Zapisuje plan obiadów w bazie danych
+
+        Obiady zapisywane są strumieniowo w ramach jednej transakcji, więc parametr 'entries' może być
+        generatorem zwróconym przez metodę LunchPlan.iter_plan
+
+        Parameters
+        ----------
+        lunch_plan : instancja klasy LunchPlan
+            zapisywany plan obiadów
+        entries : iterable, optional
+            krotki zawierające dane o dniu i obiedzie, domyślnie gotowy plan zapisany w obiekcie lunch_plan
+
+        Returns
+        ----------
+        int
+            identyfikator zapisanego planu
+
+        Raises
+        ----------
+        ValueError
+            jeżeli danie z planu nie istnieje już w tabeli - plan nie zostaje wtedy zapisany
+        """
+
+        if entries is None:
+            entries = lunch_plan.iter_entries()
+
+        table_name = lunch_plan.table.table_name
+        dish_ids = dict((dish_name, dish_id) for dish_id, dish_name in
+                        self.database.execute(f"SELECT id, dish_name FROM {table_name}").fetchall())
+
+        def rows(plan_id):
+            for date, dish_name in entries:
+                if dish_name not in dish_ids:
+                    raise ValueError(f"Danie '{dish_name}' z planu '{lunch_plan.name}' nie istnieje w tabeli "
+                                     f"'{table_name}'. Plan nie został zapisany.")
+                yield plan_id, date.isoformat(), dish_ids[dish_name]
+
+        try:
+            cursor = self.database.execute("INSERT INTO _plans (name, table_name, start_date, end_date, "
+                                           "min_interval_time) VALUES (?, ?, ?, ?, ?)",
+                                           (lunch_plan.name, table_name, lunch_plan.start_date.isoformat(),
+                                            lunch_plan.end_date.isoformat(), lunch_plan.min_interval_time))
+            plan_id = cursor.lastrowid
+            self.database.executemany("INSERT INTO _plan_days VALUES (?, ?, ?)", rows(plan_id))
+            self.database.commit()
+        except Exception:
+            self.database.connection.rollback()
+            raise
+
+        return plan_id
+
+    def list_plans(self, table_name=None):
+        """Zwraca listę zapisanych planów
+
+        Parameters
+        ----------
+        table_name : str, optional
+            nazwa tabeli z daniami - jeżeli zostanie podana, zwracane są tylko plany utworzone na jej podstawie
+
+        Returns
+        ----------
+        list
+            lista krotek (plan_id, name, table_name, start_date, end_date, min_interval_time)
+        """
+
+        sql = "SELECT plan_id, name, table_name, start_date, end_date, min_interval_time FROM _plans"
+        if table_name is None:
+            rows = self.database.execute(sql).fetchall()
+        else:
+            rows = self.database.execute(sql + " WHERE table_name = ?", (table_name, )).fetchall()
+
+        return [(plan_id, name, table, datetime.date.fromisoformat(start_date),
+                 datetime.date.fromisoformat(end_date), min_interval_time)
+                for plan_id, name, table, start_date, end_date, min_interval_time in rows]
+
+    def dishes_between(self, plan_id, first_date, last_date):
+        """Zwraca obiady z zapisanego planu pomiędzy podanymi datami (włącznie)
+
+        Parameters
+        ----------
+        plan_id : int
+            identyfikator planu
+        first_date : instancja klasy datetime.date
+            data początkowa
+        last_date : instancja klasy datetime.date
+            data końcowa
+
+        Returns
+        ----------
+        list
+            lista krotek zawierających dane o dniu i obiedzie
+        """
+
+        row = self.database.execute("SELECT table_name FROM _plans WHERE plan_id = ?", (plan_id, )).fetchone()
+        if row is None:
+            return []
+
+        rows = self.database.execute(f"SELECT p.date, d.dish_name FROM _plan_days p JOIN {row[0]} d "
+                                     f"ON d.id = p.dish_id WHERE p.plan_id = ? AND p.date BETWEEN ? AND ? "
+                                     f"ORDER BY p.date", (plan_id, first_date.isoformat(),
+                                                          last_date.isoformat())).fetchall()
+        return [(datetime.date.fromisoformat(date), dish_name) for date, dish_name in rows]
+
+    def last_dishes(self, name, table_name, before_date, count):
+        """Zwraca obiady z 'count' dni bezpośrednio poprzedzających podaną datę dla planów o podanej nazwie
+
+        Odczytywane są jedynie dni z przedziału od (before_date - count) do dnia przed before_date, korzystając
+        z indeksu kolumny date - plan zapisany dawno temu nie wpływa więc na nowy plan. Jeżeli ten sam dzień
+        występuje w kilku planach, wykorzystywany jest plan rozpoczęty najpóźniej
+        Lista zawiera zawsze 'count' pozycji - dni, dla których nie zapisano obiadu, oraz dni z daniami usuniętymi
+        później z tabeli mają wartość None, dzięki czemu pozycja dania na liście odpowiada jego dniu
+
+        Parameters
+        ----------
+        name : str
+            nazwa planu
+        table_name : str
+            nazwa tabeli z daniami, na podstawie której utworzono plan
+        before_date : instancja klasy datetime.date
+            data, przed którą wyszukiwane są obiady
+        count : int
+            liczba dni
+
+        Returns
+        ----------
+        list
+            nazwy dań (lub None) dla kolejnych dni uporządkowane od najstarszego
+        """
+
+        if count <= 0:
+            return []
+
+        first_date = before_date - datetime.timedelta(days=count)
+        rows = self.database.execute(f"SELECT p.date, d.dish_name FROM _plan_days p "
+                                     f"JOIN _plans s ON s.plan_id = p.plan_id "
+                                     f"LEFT JOIN {table_name} d ON d.id = p.dish_id "
+                                     f"WHERE s.name = ? AND s.table_name = ? AND p.date >= ? AND p.date < ? "
+                                     f"ORDER BY s.start_date DESC, s.plan_id DESC",
+                                     (name, table_name, first_date.isoformat(), before_date.isoformat())).fetchall()
+        last_days = {}
+        for date, dish_name in rows:
+            last_days.setdefault(date, dish_name)
+
+        return [last_days.get((first_date + datetime.timedelta(days=offset)).isoformat()) for offset in range(count)]
+
+
+class PlanCache:
+    """Klasa przechowująca wygenerowane plany obiadów w pamięci podręcznej
+
+    Plan generowany przy użyciu generatora liczb losowych z ustalonym ziarnem jest zawsze taki sam,
+    dlatego może zostać zapamiętany. Kluczem jest plik bazy danych, nazwa tabeli, jej identyfikator
+    (metoda Table.generation), numer wersji jej zawartości (metoda Table.version), zakres dat,
+    min_interval_time, sposób losowania oraz ziarno.
+    Plany przechowywane są w pamięci (najdawniej używane są usuwane po przekroczeniu limitu) oraz
+    opcjonalnie w katalogu na dysku w postaci plików JSON
+
+    Attributes
+    ----------
+    max_size : int
+        maksymalna liczba planów przechowywanych w pamięci
+    directory : str
+        katalog, w którym zapisywane są plany, lub None, jeżeli plany nie są zapisywane na dysku
+    plans : collections.OrderedDict
+        plany przechowywane w pamięci uporządkowane od najdawniej używanego - każdy plan zapisany jest
+        w zwartej postaci jako krotka (katalog dań planu, tablica z numerami dań)
+    hits : int
+        liczba planów odczytanych z pamięci podręcznej
+    misses : int
+        liczba planów wygenerowanych od nowa
+
+    Methods
+    ----------
+    make_plan(lunch_plan)
+        zwraca plan obiadów z pamięci podręcznej lub generuje go i zapamiętuje
+    key(lunch_plan)
+        zwraca klucz planu w pamięci podręcznej
+    clear()
+        usuwa wszystkie plany z pamięci
+    """
+
+    def __init__(self, max_size=128, directory=None):
+        """
+        Parameters
+        ----------
+        max_size : int
+            maksymalna liczba planów przechowywanych w pamięci
+        directory : str, optional
+            katalog, w którym zapisywane są plany
+        """
+
+        self.max_size = max_size
+        self.directory = directory
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, lunch_plan):
+        """Zwraca klucz planu w pamięci podręcznej
+
+        Parameters
+        ----------
+        lunch_plan : instancja klasy LunchPlan
+            plan obiadów
+
+        Returns
+        ----------
+        tuple
+            klucz planu
+        """
+
+        table = lunch_plan.table
+        return (os.path.abspath(table.database.path), table.table_name, table.generation(), table.version(),
+                lunch_plan.start_date.isoformat(), lunch_plan.end_date.isoformat(), lunch_plan.min_interval_time,
+                lunch_plan.weighted, lunch_plan.seed)
+
+    def make_plan(self, lunch_plan):
+        """Zwraca plan obiadów z pamięci podręcznej lub generuje go i zapamiętuje
+
+        Jeżeli plan nie ma ziarna (atrybut seed ma wartość None), nie jest powtarzalny - jest więc zawsze
+        generowany od nowa i nie jest zapamiętywany
+
+        Parameters
+        ----------
+        lunch_plan : instancja klasy LunchPlan
+            plan obiadów - wynik zapisywany jest w jego atrybucie lunch_plan
+
+        Returns
         ----------
         lunch_plan : list
-            lista z gotowym planem obiadów - składa się z krotek zawierających dane o dniu i obiedzie
+            lista krotek zawierających dane o dniu i obiedzie
         """
 
-        delta = self.end_date - self.start_date
-        self.days = [self.start_date + datetime.timedelta(days=i) for i in range(delta.days + 1)]
+        if lunch_plan.seed is None:
+            return lunch_plan.make_plan()
 
-        for date in self.days:
-            while True:
-                dinner = random.choice(self.list_of_dishes)
-                if dinner[0] not in [x[1] for x in self.lunch_plan[-self.min_interval_time + 1:]]:
-                    self.lunch_plan.append((date, dinner[0]))
-                    break
+        key = self.key(lunch_plan)
+        cached_plan = self.plans.get(key)
 
-        return self.lunch_plan
+        if cached_plan is not None:
+            self.plans.move_to_end(key)
+            self.hits += 1
+            dish_names, plan_ids = cached_plan
+            if dish_names != lunch_plan.dish_names:
+                # katalog dań planu różni się od katalogu, dla którego zapamiętano numery dań
+                plan_ids = (lunch_plan.dish_ids[dish_names[dish_id]] for dish_id in plan_ids)
+            lunch_plan.set_plan_ids(array('I', plan_ids))
+            return lunch_plan.lunch_plan
 
-    def print_plan(self):
-        """Wyświetla w konsoli plan obiadów
+        entries = self._load(key, lunch_plan)
+        if entries is not None:
+            self.hits += 1
+            lunch_plan.set_plan(entries)
+        else:
+            self.misses += 1
+            # nowy generator z tym samym ziarnem - wynik nie zależy od wcześniejszych losowań z atrybutu rng
+            lunch_plan.make_plan(rng=random.Random(lunch_plan.seed))
+            self._save(key, lunch_plan.iter_entries())
 
-        Ponadto zamienia daty znajdujące się w tabeli lunch_plan na datę w formacie dzień-miesiąc-rok
+        self._remember(key, (lunch_plan.dish_names, array('I', lunch_plan.plan_ids)))
+        return lunch_plan.lunch_plan
+
+    def clear(self):
+        """Usuwa wszystkie plany z pamięci (pliki na dysku pozostają bez zmian)"""
+
+        self.plans.clear()
+
+    def _remember(self, key, cached_plan):
+        """Zapamiętuje plan w pamięci, usuwając najdawniej używany plan po przekroczeniu limitu"""
+
+        self.plans[key] = cached_plan
+        self.plans.move_to_end(key)
+        while len(self.plans) > self.max_size:
+            self.plans.popitem(last=False)
+
+    def _path(self, key):
+        """Zwraca ścieżkę do pliku z planem o podanym kluczu"""
+
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _load(self, key, lunch_plan):
+        """Odczytuje plan z dysku - zwraca None, jeżeli planu nie ma w katalogu lub zawiera on dania,
+        których nie ma w tabeli planu (plan jest wtedy generowany od nowa)"""
+
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return None
+
+        with open(self._path(key), 'r') as file:
+            entries = [(datetime.date.fromisoformat(date), dish) for date, dish in json.load(file)]
+
+        table_dishes = set(dish_name for dish_name, _ in lunch_plan.list_of_dishes)
+        if any(dish not in table_dishes for _, dish in entries):
+            return None
+        return entries
+
+    def _save(self, key, entries):
+        """Zapisuje plan na dysku, jeżeli podano katalog"""
+
+        if self.directory is None:
+            return
+
+        with open(self._path(key), 'w') as file:
+            json.dump([(date.isoformat(), dish) for date, dish in entries], file)
+
+
+class RejectWriter:
+    """Zapisuje odrzucone wiersze pliku csv do osobnego pliku
+
+    Plik tworzony jest dopiero przy zapisie pierwszego odrzuconego wiersza, a plik pozostały po poprzednim
+    imporcie jest usuwany przy tworzeniu obiektu, dzięki czemu nie można go pomylić z wynikiem bieżącego importu
+
+    Attributes
+    ----------
+    path : str
+        ścieżka do pliku z odrzuconymi wierszami
+    count : int
+        liczba zapisanych odrzuconych wierszy
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, rejected_rows):
+        """Zapisuje listę krotek (numer wiersza, wiersz, przyczyna odrzucenia)"""
+
+        if not rejected_rows:
+            return
+        for line_number, row, reason in rejected_rows:
+            self._writerow([line_number, reason, *row])
+        self.count += len(rejected_rows)
+
+    def _writerow(self, row):
+        """Zapisuje wiersz do pliku, tworząc plik przy pierwszym zapisie"""
+
+        if self._file is None:
+            # błędnie zakodowane bajty z pliku csv zapisywane są w niezmienionej postaci
+            self._file = open(self.path, 'w', newline='', encoding='utf-8', errors='surrogateescape')
+            self._writer = csv.writer(self._file, delimiter=';')
+        self._writer.writerow(row)
+
+    def close(self):
+        """Zamyka plik z odrzuconymi wierszami"""
+
+        if self._file is not None:
+            self._file.close()
+
+
+class NearDuplicateWriter(RejectWriter):
+    """Zapisuje dania prawie identyczne z daniami z tabeli do osobnego pliku
+
+    Każdy wiersz pliku zawiera nazwę importowanego dania, nazwę podobnego dania z tabeli, podobieństwo nazw
+    oraz wykonaną operację ('scalone' lub 'dodane')
+
+    Attributes
+    ----------
+    path : str
+        ścieżka do pliku z prawie identycznymi daniami
+    count : int
+        liczba zapisanych dań
+    action : str
+        opis operacji wykonanej na daniu
+    """
+
+    def __init__(self, path, near_duplicates):
+        super().__init__(path)
+        self.action = 'scalone' if near_duplicates == 'merge' else 'dodane'
+
+    def write(self, dish_name, similar_name, similarity):
+        """Zapisuje danie, nazwę podobnego dania oraz podobieństwo nazw"""
+
+        self._writerow([dish_name, similar_name, f"{similarity:.2f}", self.action])
+        self.count += 1
+
+
+class ImportProgress:
+    """Wyświetla postęp importu pliku csv oraz liczbę wierszy przetwarzanych na sekundę
+
+    Attributes
+    ----------
+    total_bytes : int
+        rozmiar importowanego pliku w bajtach
+    show : bool
+        decyduje, czy postęp jest wyświetlany w konsoli
+    rows : int
+        liczba przetworzonych wierszy
+    bytes_read : int
+        liczba odczytanych bajtów pliku
+    """
+
+    def __init__(self, total_bytes, show=True):
+        self.total_bytes = total_bytes
+        self.show = show
+        self.rows = 0
+        self.bytes_read = 0
+        self.start_time = time.perf_counter()
+
+    def count_bytes(self, file):
+        """Zwraca kolejne linie pliku, zapamiętując przy tym liczbę odczytanych bajtów
+
+        Pozycja odczytywana jest z bufora binarnego pliku, więc - tak jak rozmiar pliku - nie zależy
+        od kodowania znaków ani od znaków końca linii
         """
 
-        start_date_str = self.start_date.strftime('%d-%m-%Y')
-        end_date_str = self.end_date.strftime('%d-%m-%Y')
+        for line in file:
+            self.bytes_read = file.buffer.tell()
+            yield line
 
-        print(f"Oto plan '{self.name}' wygenerowany dla okresu {start_date_str} - {end_date_str}:")
-        for x in self.lunch_plan:
-            print(f"{x[0].strftime('%d-%m-%Y')} --> {x[1]}")
+    def update(self, rows):
+        """Dolicza przetworzone wiersze i wyświetla aktualny postęp"""
 
-    def save_plan(self):
-        """Zapisuje plan obiadów do pliku z rozszerzeniem .txt
+        self.rows += rows
+        if self.show:
+            elapsed = max(time.perf_counter() - self.start_time, 1e-9)
+            percent = min(100 * self.bytes_read / self.total_bytes, 100) if self.total_bytes else 100
+            print(f"\rPrzetworzono {self.rows} wierszy ({percent:.1f}%, {self.rows / elapsed:.0f} wierszy/s)",
+                  end='', flush=True)
 
-        Plik zapisywany jest w katalogu roboczym
+    def finish(self):
+        """Kończy wyświetlanie postępu"""
+
+        if self.show and self.rows:
+            print()
+
+
+class Instrumentation:
+    """Klasa zbierająca statystyki wykonywania operacji na bazach danych i planach obiadów
+
+    Pomiary są domyślnie wyłączone. Metoda enable podmienia metody klas wymienionych w atrybucie OPERATIONS
+    na wersje mierzące czas wykonania, a metoda disable przywraca metody oryginalne - gdy pomiary są
+    wyłączone, program nie wykonuje żadnego dodatkowego kodu poza sprawdzeniem atrybutu enabled w miejscach
+    zliczających ponowne losowania. Polecenia SQL zliczane są przy użyciu funkcji zwrotnej
+    sqlite3.Connection.set_trace_callback, a odczytane wiersze przy użyciu atrybutu row_factory kursora
+
+    Attributes
+    ----------
+    OPERATIONS : dict
+        słownik, w którym kluczem jest nazwa klasy, a wartością krotka z nazwami mierzonych metod
+    BUCKETS : tuple
+        górne granice przedziałów histogramu czasów wykonania w sekundach
+    enabled : bool
+        decyduje, czy pomiary są włączone
+    operations : dict
+        statystyki operacji - kluczem jest nazwa 'Klasa.metoda', a wartością słownik z liczbą wywołań,
+        łącznym, minimalnym i maksymalnym czasem oraz histogramem czasów
+    counters : dict
+        liczniki zdarzeń, np. ponownych losowań dania w trakcie tworzenia planu
+    statements : dict
+        liczba wykonań poszczególnych poleceń SQL (wartości parametrów zastąpione są znakiem '?')
+    rows_read : int
+        liczba wierszy odczytanych z baz danych
+
+    Methods
+    ----------
+    enable(summary_at_exit)
+        włącza pomiary
+    disable()
+        wyłącza pomiary i przywraca oryginalne metody
+    reset()
+        usuwa zebrane statystyki
+    record(name, seconds)
+        zapisuje czas wykonania operacji
+    count(name, amount)
+        zwiększa licznik zdarzenia
+    snapshot()
+        zwraca zebrane statystyki w postaci słownika, który można zapisać w formacie JSON
+    write_snapshot(file_name)
+        zapisuje zebrane statystyki do pliku JSON
+    summary()
+        zwraca podsumowanie statystyk w postaci tekstu
+    """
+
+    OPERATIONS = {
+        'Database': ('execute', 'executemany', 'commit', 'list_tables', 'create_table', 'drop_table'),
+        'Table': ('insert', 'insert_many', 'delete', 'list_dishes', 'contains', 'count_dishes', 'search',
+                  'find_similar'),
+        'LunchPlan': ('make_plan', 'make_two_course_plan', 'extend', 'repair'),
+        'PlanStore': ('save', 'last_dishes'),
+        'PlanCache': ('make_plan', ),
+    }
+    BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+    _LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+    def __init__(self):
+        self.enabled = False
+        self.operations = {}
+        self.counters = {}
+        self.statements = {}
+        self.rows_read = 0
+        self._originals = []
+        self._cursors = weakref.WeakSet()
+        self._exit_registered = False
+
+    def enable(self, summary_at_exit=True):
+        """Włącza pomiary
+
+        Parameters
+        ----------
+        summary_at_exit : bool
+            decyduje, czy podsumowanie statystyk zostanie wyświetlone na standardowym wyjściu błędów
+            przy zakończeniu programu
         """
 
-        file_name = f"{self.name}.txt"
-        print("Plan w postaci pliku .txt zostanie zapisany w katalogu roboczym.")
+        if self.enabled:
+            return
 
-        with open(file_name, 'w') as file:
-            for x in self.lunch_plan:
-                file.write(f"{x[0].strftime('%d-%m-%Y')} --> {x[1]}" + "\n")
+        for class_name, method_names in self.OPERATIONS.items():
+            cls = globals()[class_name]
+            for method_name in method_names:
+                method = cls.__dict__[method_name]
+                self._originals.append((cls, method_name, method))
+                setattr(cls, method_name, self._timed(f"{class_name}.{method_name}", method))
 
-        for x in range(3, 0, -1):
-            print(x)
-            time.sleep(1)
+        original_connect = ConnectionManager.connect
+        self._originals.append((ConnectionManager, 'connect', original_connect))
 
-        if os.path.exists(file_name):
-            print("Plik został pomyślnie zapisany w katalogu roboczym.")
+        def connect(manager, path, profile=None):
+            pooled_connection = original_connect(manager, path, profile)
+            pooled_connection.connection.set_trace_callback(self._trace)
+            return pooled_connection
 
-    def lunch_for_today(self):
-        """Pyta użytkownika, czy chce aby wyświetlony został obiad z planu na dzień dziesiejszy
+        ConnectionManager.connect = connect
+        for pooled_connection in connection_manager.pool.values():
+            pooled_connection.connection.set_trace_callback(self._trace)
 
-        W przypadku twierdzącej odpowiedzi wyświetla obiad
-        Gdy dzisiejszy dzień nie został uwzlędniony w planie - wyświetlony zostaje stosowny komunikat
+        self.enabled = True
+        if summary_at_exit and not self._exit_registered:
+            atexit.register(self._print_summary_at_exit)
+            self._exit_registered = True
+
+    def disable(self):
+        """Wyłącza pomiary i przywraca oryginalne metody - zebrane statystyki pozostają dostępne"""
+
+        for cls, method_name, method in reversed(self._originals):
+            setattr(cls, method_name, method)
+        self._originals = []
+
+        for pooled_connection in connection_manager.pool.values():
+            pooled_connection.connection.set_trace_callback(None)
+        for cursor in list(self._cursors):
+            cursor.row_factory = None
+        self._cursors = weakref.WeakSet()
+
+        self.enabled = False
+
+    def reset(self):
+        """Usuwa zebrane statystyki"""
+
+        self.operations = {}
+        self.counters = {}
+        self.statements = {}
+        self.rows_read = 0
+
+    def _timed(self, name, method):
+        """Zwraca wersję metody mierzącą czas jej wykonania"""
+
+        perf_counter = time.perf_counter
+        count_rows = name in ('Database.execute', 'Database.executemany')
+
+        @functools.wraps(method)
+        def timed(obj, *args, **kwargs):
+            if count_rows and obj.cursor.row_factory is None:
+                obj.cursor.row_factory = self._count_row
+                self._cursors.add(obj.cursor)
+            start = perf_counter()
+            try:
+                return method(obj, *args, **kwargs)
+            finally:
+                self.record(name, perf_counter() - start)
+
+        return timed
+
+    def _trace(self, statement):
+        """Zlicza polecenia SQL wykonane na połączeniu (funkcja zwrotna sqlite3)
+
+        SQLite przekazuje polecenia z wstawionymi wartościami parametrów, dlatego wartości tekstowe i liczbowe
+        zastępowane są znakiem '?' - w przeciwnym razie każde wykonanie polecenia byłoby liczone osobno
         """
 
-        today = datetime.date.today()
-        today_str = today.strftime('%d-%m-%Y')
+        statement = self._LITERALS.sub('?', statement)
+        self.statements[statement] = self.statements.get(statement, 0) + 1
 
-        while True:
-            user_choice = input("Czy chcesz, aby wyświetlony został obiad na dzisiaj? Wpisz 'tak' lub 'nie': ")
+    def _count_row(self, cursor, row):
+        """Zlicza wiersze odczytane przez kursor (funkcja row_factory) i zwraca wiersz bez zmian"""
 
-            if user_choice == 'nie':
-                break
-            elif user_choice == 'tak':
-                if today not in self.days:
-                    print(f"Dzisiejszy dzień tj. {today_str} nie został uwzględniony w planie.")
-                    break
-                else:
-                    for date, dinner in self.lunch_plan:
-                        if date == today:
-                            lunch_for_today = dinner
-                            print(f"Obiad na dzisiaj ({today_str}) to: {lunch_for_today}.")
-                            break
-                    break
-            else:
-                print("Możesz wpisać tylko 'tak' lub 'nie'")
+        self.rows_read += 1
+        return row
+
+    def record(self, name, seconds):
+        """Zapisuje czas wykonania operacji
+
+        Parameters
+        ----------
+        name : str
+            nazwa operacji
+        seconds : float
+            czas wykonania w sekundach
+        """
+
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = {'count': 0, 'total': 0.0, 'min': seconds, 'max': seconds,
+                     'histogram': [0] * (len(self.BUCKETS) + 1)}
+            self.operations[name] = stats
+
+        stats['count'] += 1
+        stats['total'] += seconds
+        stats['min'] = min(stats['min'], seconds)
+        stats['max'] = max(stats['max'], seconds)
+        stats['histogram'][bisect.bisect_left(self.BUCKETS, seconds)] += 1
+
+    def count(self, name, amount=1):
+        """Zwiększa licznik zdarzenia
+
+        Parameters
+        ----------
+        name : str
+            nazwa zdarzenia
+        amount : int
+            wartość, o jaką zwiększany jest licznik
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """Zwraca zebrane statystyki w postaci słownika, który można zapisać w formacie JSON
+
+        Returns
+        ----------
+        dict
+            słownik ze statystykami operacji, licznikami zdarzeń, poleceniami SQL i liczbą odczytanych wierszy
+        """
+
+        bucket_names = [f"<={bound:g}s" for bound in self.BUCKETS] + [f">{self.BUCKETS[-1]:g}s"]
+        operations = {}
+        for name, stats in sorted(self.operations.items()):
+            operations[name] = {'count': stats['count'], 'total': stats['total'], 'min': stats['min'],
+                                'max': stats['max'], 'mean': stats['total'] / stats['count'],
+                                'histogram': dict(zip(bucket_names, stats['histogram']))}
+
+        return {
+            'enabled': self.enabled,
+            'operations': operations,
+            'counters': dict(sorted(self.counters.items())),
+            'sql': {'statements': sum(self.statements.values()), 'rows_read': self.rows_read,
+                    'by_statement': dict(sorted(self.statements.items(), key=lambda item: -item[1]))},
+        }
+
+    def write_snapshot(self, file_name):
+        """Zapisuje zebrane statystyki do pliku JSON
+
+        Parameters
+        ----------
+        file_name : str
+            ścieżka do zapisywanego pliku
+        """
+
+        with open(file_name, 'w') as file:
+            json.dump(self.snapshot(), file, indent=2, ensure_ascii=False)
+
+    def summary(self, top_statements=10):
+        """Zwraca podsumowanie statystyk w postaci tekstu
+
+        Parameters
+        ----------
+        top_statements : int
+            liczba najczęściej wykonywanych poleceń SQL uwzględnionych w podsumowaniu
+
+        Returns
+        ----------
+        str
+            podsumowanie statystyk
+        """
+
+        lines = [f"{'operacja':<28} {'wywołania':>10} {'łącznie [ms]':>13} {'średnio [ms]':>13} {'max [ms]':>10}"]
+        for name, stats in sorted(self.operations.items(), key=lambda item: -item[1]['total']):
+            lines.append(f"{name:<28} {stats['count']:>10} {stats['total'] * 1000:>13.3f} "
+                         f"{stats['total'] / stats['count'] * 1000:>13.3f} {stats['max'] * 1000:>10.3f}")
+
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value}")
+
+        lines.append(f"Polecenia SQL: {sum(self.statements.values())}, odczytane wiersze: {self.rows_read}")
+        for statement, executions in sorted(self.statements.items(), key=lambda item: -item[1])[:top_statements]:
+            lines.append(f"{executions:>8} x {' '.join(statement.split())[:100]}")
+
+        return "\n".join(lines)
+
+    def _print_summary_at_exit(self):
+        """Wyświetla podsumowanie statystyk przy zakończeniu programu, jeżeli zebrano jakiekolwiek pomiary"""
+
+        if self.operations or self.counters or self.statements:
+            print(self.summary(), file=sys.stderr)
+
+
+instrumentation = Instrumentation()
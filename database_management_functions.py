@@ -7,15 +7,21 @@ Zawiera definicje następujących funkcji:
     * drop_table - usuwa tabelę z bazy danych
     * add_record - dodaje nowe danie w bazie danych
     * delete_record - usuwa wskazane danie z bazy danych
+    * search_dish - wyszukuje dania w tabeli na podstawie fragmentów nazwy
     * add_csv - umożliwia użytkownikowi dodanie dań do tabeli przy użyciu pliku .csv
     * csv_reader - odczytuje dania z pliku csv i zapisuje je w tabeli
+    * import_csv - importuje dania z pliku csv do tabeli w sposób strumieniowy
+    * read_csv_chunks - odczytuje wiersze pliku csv porcjami o stałym rozmiarze
+    * validate_chunk - waliduje porcję wierszy pliku csv
     * lunch_planner - tworzy plan obiadów na podstawie danej tabeli
 """
 
 
+import os
 import csv
-from classes import Database, Table, LunchPlan
-from validation_functions import user_choice_validation, which_course_validation, new_record_validation, add_new_dish_validation, delete_dish_validation, lunch_planner_validation
+import sqlite3
+from classes import Database, Table, LunchPlan, PlanStore, RejectWriter, NearDuplicateWriter, ImportProgress
+from validation_functions import user_choice_validation, which_course_validation, new_record_validation, add_new_dish_validation, delete_dish_validation, yes_no_validation, lunch_planner_validation
 
 
 def connect_database(database_list):
@@ -77,9 +83,10 @@ def database_management(db):
         4 - usuń danie obiadowe z istniejącej tabeli,
         5 - dodaj kilka dań obiadowych na raz z pliku .csv,
         6 - stwórz plan obiadów na podstawie wybranej tabeli,
+        7 - wyszukaj danie w istniejącej tabeli,
         0 - wróć do wyboru bazy danych
         """)
-        possible_choices = [0, 1, 2, 3, 4, 5, 6]
+        possible_choices = [0, 1, 2, 3, 4, 5, 6, 7]
         user_choice = user_choice_validation(possible_choices)
 
         if user_choice == 0:
@@ -96,6 +103,8 @@ def database_management(db):
             add_csv(db)
         elif user_choice == 6:
             lunch_planner(db)
+        elif user_choice == 7:
+            search_dish(db)
 
 
 def create_new_table(db):
@@ -122,8 +131,10 @@ def create_new_table(db):
         if new_table == '0':
             break
         else:
-            if new_table in db.list_tables():
+            if db.has_table(new_table):
                 print("Tabela o podanej nazwie już istnieje. Spróbuj podać inną nazwę.")
+            elif new_table.startswith('_'):
+                print("Nazwy zaczynające się od znaku '_' są zarezerwowane dla tabel wewnętrznych programu.")
             else:
                 db.create_table(new_table)
                 print(f"Pomyślnie utworzono tabelę '{new_table}' w bazie danych '{db.name}'")
@@ -153,7 +164,7 @@ def drop_table(db):
         if table == '0':
             break
         else:
-            if table not in db.list_tables():
+            if not db.has_table(table):
                 print("Tabela o podanej nazwie nie istnieje. Spróbuj podać inną nazwę.")
             else:
                 db.drop_table(table)
@@ -184,7 +195,7 @@ def add_record(db):
         if table_name == '0':
             break
         else:
-            if table_name not in db.list_tables():
+            if not db.has_table(table_name):
                 print("Tabela o podanej nazwie nie istnieje. Podaj nazwę istniejącej tabeli.")
             else:
                 print(f"Teraz możesz dodać nowe danie obiadowe do tabeli '{table_name}'. Podaj poniższe informacje.")
@@ -221,7 +232,7 @@ def delete_record(db):
         if table_name == '0':
             break
         else:
-            if table_name not in db.list_tables():
+            if not db.has_table(table_name):
                 print("Tabela o podanej nazwie nie istnieje. Podaj nazwę istniejącej tabeli.")
             else:
                 print(f"Teraz możesz usunąć danie obiadowe z tabeli '{table_name}'. Podaj poniższe informacje.")
@@ -236,6 +247,42 @@ def delete_record(db):
                         break
 
 
+def search_dish(db):
+    """Wyszukuje dania w tabeli wskazanej przez użytkownika
+
+    Wyszukiwanie korzysta z indeksu pełnotekstowego tabeli (metoda 'search' klasy Table), dzięki czemu
+    zwraca dania, których słowa zaczynają się od wpisanych fragmentów, bez wczytywania całej tabeli
+
+    Parameters
+    ----------
+    db : obiekt klasy Database
+        obiekt reprezentujący bazę danych
+    """
+
+    while True:
+        print('--' * 20)
+        print(f"Lista istniejących tabel w bazie danych '{db.name}': {db.list_tables()}")
+        table_name = input("Podaj nazwę tabeli, w której chcesz wyszukać danie obiadowe lub wpisz '0', "
+                           "aby wrócić do wyboru operacji na bazie danych: ")
+
+        if table_name == '0':
+            break
+        elif not db.has_table(table_name):
+            print("Tabela o podanej nazwie nie istnieje. Podaj nazwę istniejącej tabeli.")
+        else:
+            table = Table(db, table_name)
+            while True:
+                query = input("Podaj szukany fragment nazwy dania lub wpisz '0', aby wrócić do wyboru tabeli: ")
+                if query == '0':
+                    break
+
+                results = table.search(query)
+                if not results:
+                    print(f"Nie znaleziono dań pasujących do '{query}'.")
+                for dish_name, which_course in results:
+                    print(f"{dish_name} ({'pierwsze' if which_course == 1 else 'drugie'} danie)")
+
+
 def add_csv(db):
     """Umożliwia użytkownikowi dodanie rekordów (dań) do tabeli przy użyciu pliku .csv
 
@@ -257,7 +304,7 @@ def add_csv(db):
         if table_name == '0':
             break
         else:
-            if table_name not in db.list_tables():
+            if not db.has_table(table_name):
                 print("Tabela o podanej nazwie nie istnieje. Podaj nazwę istniejącej tabeli.")
             else:
                 print('**'*20)
@@ -276,9 +323,14 @@ def add_csv(db):
 def csv_reader(table):
     """Odczytuje dania z pliku csv i zapisuje je w tabeli
 
-    Wykorzystuje funkcję 'reader' z modułu 'csv' do odczytania pliku
+    Plik jest importowany przy użyciu funkcji 'import_csv'
     Jeżeli danie już istnieje w tabeli - nie zostaje ono wprowadzone ponownie
-    Jeżeli parametr 'which_course' nie jest cyfrą 1 lub 2 - danie również nie zostaje wprowadzone
+    Dania prawie identyczne z daniami z tabeli (np. różniące się wielkością liter lub literówką) są domyślnie
+    dodawane, a na prośbę użytkownika scalane z istniejącymi daniami - w obu przypadkach ich lista
+    zapisywana jest w osobnym pliku
+    Jeżeli parametr 'which_course' nie jest cyfrą 1 lub 2 lub wiersz ma nieprawidłowy format - danie
+    również nie zostaje wprowadzone, a wiersz trafia do pliku z odrzuconymi wierszami
+    Na koniec wyświetlana jest liczba dań dodanych, powtórzonych, odrzuconych oraz prawie identycznych
 
     Parameters
     ----------
@@ -292,25 +344,184 @@ def csv_reader(table):
         if file_path == '0':
             return
         else:
+            merge = yes_no_validation("Czy dania prawie identyczne z daniami z tabeli (np. różniące się "
+                                      "wielkością liter lub literówką) mają zostać scalone z istniejącymi daniami "
+                                      "zamiast zostać dodane?")
             try:
-                with open(rf"{file_path}", 'r') as file:
-                    try:
-                        reader = csv.reader(file, delimiter=';')
-                        for dish in reader:
-                            table.insert(dish[0], int(dish[1]))
-                        print(f"Pomyślnie dodano dania obiadowe z pliku .csv do tabeli '{table.table_name}' "
-                              f"z bazy danych '{table.database.name}'")
-                    except:
-                        print("Wystąpił błąd podczas odczytu pliku. Spróbuj zmienić formatowanie pliku.")
-            except:
+                inserted, duplicates, rejected, similar = import_csv(table, file_path,
+                                                                     near_duplicates='merge' if merge else 'flag')
+                print(f"Pomyślnie dodano dania obiadowe z pliku .csv do tabeli '{table.table_name}' "
+                      f"z bazy danych '{table.database.name}'")
+                print(f"Dodane dania: {inserted}, powtórzenia: {duplicates}, odrzucone wiersze: {rejected}, "
+                      f"{'scalone' if merge else 'dodane'} podobne dania: {similar}")
+                if rejected:
+                    print(f"Odrzucone wiersze zapisano w pliku '{file_path}.rejected.csv'.")
+                if similar:
+                    print(f"Listę dań podobnych do dań z tabeli zapisano w pliku '{file_path}.near_duplicates.csv'.")
+            except (csv.Error, sqlite3.Error, UnicodeDecodeError):
+                print("Wystąpił błąd podczas odczytu pliku. Spróbuj zmienić formatowanie pliku.")
+            except OSError:
                 print(f"Coś poszło nie tak. Prawdopodbnie podana ścieżka jest nieprawidłowa.")
 
 
+def import_csv(table, file_path, chunk_size=10000, reject_path=None, show_progress=True, near_duplicates=None,
+               threshold=None, near_duplicates_path=None):
+    """Importuje dania z pliku csv do tabeli w sposób strumieniowy
+
+    Plik odczytywany jest porcjami po 'chunk_size' wierszy, dzięki czemu zużycie pamięci nie zależy
+    od rozmiaru pliku. Każda porcja jest walidowana przy użyciu funkcji 'validate_chunk', a prawidłowe
+    wiersze zapisywane są w tabeli w ramach jednej transakcji przy użyciu metody 'insert_many'
+    Błędne wiersze nie przerywają importu - trafiają do pliku z odrzuconymi wierszami wraz z numerem
+    wiersza oraz przyczyną odrzucenia. Plik odczytywany jest w kodowaniu UTF-8, a bajty, których nie da się
+    odczytać, nie przerywają importu - wiersz, w którym się znajdują, również trafia do odrzuconych wierszy
+
+    Parameters
+    ----------
+    table : obiekt klasy Table
+        obiekt reprezentujący tabelę w bazie danych
+    file_path : str
+        ścieżka do pliku csv
+    chunk_size : int
+        liczba wierszy odczytywanych i walidowanych jednocześnie
+    reject_path : str, optional
+        ścieżka do pliku z odrzuconymi wierszami, domyślnie ścieżka pliku csv z dopiskiem '.rejected.csv'
+    show_progress : bool
+        decyduje, czy w konsoli wyświetlany jest postęp importu oraz liczba wierszy przetwarzanych na sekundę
+    near_duplicates : str, optional
+        sposób obsługi dań prawie identycznych z daniami z tabeli: 'flag' - danie jest dodawane,
+        'merge' - danie nie jest dodawane; w obu przypadkach danie trafia do pliku z prawie identycznymi daniami
+        Domyślnie dania nie są porównywane
+    threshold : float, optional
+        próg podobieństwa nazw dań, domyślnie wartość atrybutu 'threshold' klasy SimilarityIndex
+    near_duplicates_path : str, optional
+        ścieżka do pliku z prawie identycznymi daniami, domyślnie ścieżka pliku csv
+        z dopiskiem '.near_duplicates.csv'
+
+    Returns
+    ----------
+    tuple
+        krotka zawierająca liczbę dań dodanych, pominiętych jako powtórzenia (łącznie ze scalonymi
+        prawie identycznymi daniami), odrzuconych oraz prawie identycznych z daniami z tabeli
+    """
+
+    if reject_path is None:
+        reject_path = f"{file_path}.rejected.csv"
+    if near_duplicates_path is None:
+        near_duplicates_path = f"{file_path}.near_duplicates.csv"
+
+    rejects = RejectWriter(reject_path)
+    similar = NearDuplicateWriter(near_duplicates_path, near_duplicates)
+    progress = ImportProgress(os.path.getsize(file_path), show_progress)
+
+    with open(rf"{file_path}", 'r', newline='', encoding='utf-8', errors='surrogateescape') as file:
+        try:
+            chunks = read_csv_chunks(progress.count_bytes(file), chunk_size)
+            inserted, duplicates, rejected = table.insert_many(_validated_dishes(chunks, rejects, progress),
+                                                               near_duplicates=near_duplicates, threshold=threshold,
+                                                               on_near_duplicate=similar.write)
+        finally:
+            rejects.close()
+            similar.close()
+            progress.finish()
+
+    return inserted, duplicates, rejected + rejects.count, similar.count
+
+
+def read_csv_chunks(lines, chunk_size):
+    """Odczytuje wiersze pliku csv porcjami o stałym rozmiarze
+
+    Parameters
+    ----------
+    lines : iterable
+        kolejne linie pliku csv, np. otwarty plik
+    chunk_size : int
+        maksymalna liczba wierszy w jednej porcji
+
+    Yields
+    ----------
+    list
+        lista krotek (numer wiersza, wiersz), gdzie wiersz jest listą pól rozdzielonych średnikiem
+    """
+
+    reader = csv.reader(lines, delimiter=';')
+    chunk = []
+
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def validate_chunk(chunk):
+    """Waliduje porcję wierszy pliku csv
+
+    Parameters
+    ----------
+    chunk : list
+        lista krotek (numer wiersza, wiersz) zwrócona przez funkcję 'read_csv_chunks'
+
+    Returns
+    ----------
+    tuple
+        krotka zawierająca listę prawidłowych dań w postaci krotek (dish_name, which_course) oraz
+        listę odrzuconych wierszy w postaci krotek (numer wiersza, wiersz, przyczyna odrzucenia)
+    """
+
+    available_courses = [1, 2]
+    valid = []
+    rejected = []
+
+    for line_number, row in chunk:
+        try:
+            # bajty, których nie udało się odczytać w kodowaniu UTF-8, zapisane są jako znaki zastępcze
+            # (surrogateescape), których nie da się ponownie zakodować
+            ';'.join(row).encode('utf-8')
+        except UnicodeEncodeError:
+            rejected.append((line_number, row, "wiersz zawiera znaki niezgodne z kodowaniem UTF-8"))
+            continue
+
+        if len(row) < 2:
+            rejected.append((line_number, row, "brak średnika rozdzielającego nazwę i numer dania"))
+            continue
+
+        dish_name = row[0]
+        try:
+            which_course = int(row[1])
+        except ValueError:
+            rejected.append((line_number, row, "numer dania nie jest liczbą całkowitą"))
+            continue
+
+        if not dish_name:
+            rejected.append((line_number, row, "pusta nazwa dania"))
+        elif which_course not in available_courses:
+            rejected.append((line_number, row, "numer dania musi być cyfrą 1 lub 2"))
+        else:
+            valid.append((dish_name, which_course))
+
+    return valid, rejected
+
+
+def _validated_dishes(chunks, rejects, progress):
+    """Waliduje kolejne porcje wierszy i zwraca prawidłowe dania, a błędne wiersze zapisuje do pliku"""
+
+    for chunk in chunks:
+        valid, rejected = validate_chunk(chunk)
+        rejects.write(rejected)
+        progress.update(len(chunk))
+        yield from valid
+
+
 def lunch_planner(db):
     """Tworzy plan obiadów na podstawie danej tabeli
 
     Dane konieczne do stworzenia planu są pozyskiwane od użytkownika przy użyciu funkcji 'lunch_planner_validation'
     Funkcja tworzy plan, a następnie go wyświetla i zapisuje do pliku .txt w katalogu roboczym
+    Na prośbę użytkownika plan zapisywany jest również w bazie danych, a przy jego tworzeniu uwzględniane są
+    obiady z ostatnich dni zapisanego wcześniej planu o tej samej nazwie - domyślnie plan nie jest zapisywany
     Funkcja ma również możliwość wyświetlenia planu na dzień dzisiejszy, jeżeli taki znajduje się w planie
 
     Parameters
@@ -328,7 +539,7 @@ def lunch_planner(db):
         if table_name == '0':
             break
         else:
-            if table_name not in db.list_tables():
+            if not db.has_table(table_name):
                 print("Tabela o podanej nazwie nie istnieje. Podaj nazwę istniejącej tabeli.")
             else:
                 table = Table(db, table_name)
@@ -337,7 +548,13 @@ def lunch_planner(db):
                     continue
                 else:
                     lunch_plan = LunchPlan(db, table, lunch_planner_data)
-                    lunch_plan.make_plan()
+                    if yes_no_validation("Czy zapisać plan w bazie danych i uwzględnić obiady z poprzedniego "
+                                         "planu o tej samej nazwie?"):
+                        plan_store = PlanStore(db)
+                        lunch_plan.make_plan(plan_store)
+                        plan_store.save(lunch_plan)
+                    else:
+                        lunch_plan.make_plan()
                     lunch_plan.print_plan()
                     lunch_plan.save_plan()
                     lunch_plan.lunch_for_today()
@@ -3,12 +3,19 @@
 Na początku skrypt importuje z innych modułów funkcje pomocnicze wykorzystane w głównej funkcji programu.
 Następnie skrypt zawiera definicję głównej funkcji programu, która odpowiada za działanie całego programu.
 Na koniec skryptu główna funkcja jest wywoływana.
+Jeżeli skrypt zostanie uruchomiony z argumentami wywołania - program działa w trybie wsadowym
+(bez interakcji z użytkownikiem), który obsługiwany jest przez funkcję 'run_cli' z modułu 'batch_mode_functions'.
+Ustawienie zmiennej środowiskowej LUNCH_PLANNER_INSTRUMENTATION włącza pomiary czasu operacji (obiekt
+'instrumentation' z modułu 'classes'), których podsumowanie wyświetlane jest przy zakończeniu programu.
 """
 
 import os
+import sys
 from main_functions import create_new_database, delete_database
 from database_management_functions import connect_database
 from validation_functions import user_choice_validation
+from batch_mode_functions import run_cli
+from classes import instrumentation
 
 
 def main():
@@ -50,4 +57,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # pomiary czasu operacji można włączyć również w trybie interaktywnym, ustawiając zmienną środowiskową
+    if os.environ.get('LUNCH_PLANNER_INSTRUMENTATION'):
+        instrumentation.enable()
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     main()
@@ -0,0 +1,294 @@
+"""Moduł zawiera definicje funkcji służących do eksportu planów obiadów do plików
+
+Plany zapisywane są strumieniowo - obiady pobierane są z iteratora (np. generatora zwróconego przez metodę
+LunchPlan.iter_plan lub LunchPlan.iter_entries) i trafiają do buforowanego pliku bez tworzenia listy
+z całym planem. W jednym pliku lub archiwum .zip można zapisać wiele planów.
+
+Dostępne formaty (słownik EXPORTERS, w którym kluczem jest rozszerzenie pliku):
+    * txt - plik tekstowy w postaci 'dzień-miesiąc-rok --> danie', taki sam jak tworzony przez LunchPlan.save_plan
+    * csv - plik csv z kolumnami plan, date, dish (lub first_course i second_course dla planów dwudaniowych)
+    * jsonl - plik JSON Lines z jednym obiektem dla każdego dnia planu
+    * ics - kalendarz w formacie iCalendar z wydarzeniem całodniowym dla każdego dnia planu
+Nowy format dodaje się, dopisując do słownika EXPORTERS funkcję przyjmującą strumień tekstowy oraz
+iterator krotek (nazwa planu, obiady) - funkcja powinna odczytywać plany i obiady po kolei, bez tworzenia list.
+
+Zawiera definicje następujących funkcji:
+    * export_plan - zapisuje plan obiadów do pliku w podanym formacie
+    * export_plans - zapisuje wiele planów obiadów do jednego pliku lub do archiwum .zip
+    * write_txt - zapisuje plany obiadów w formacie tekstowym
+    * write_csv - zapisuje plany obiadów w formacie csv
+    * write_jsonl - zapisuje plany obiadów w formacie JSON Lines
+    * write_ics - zapisuje plany obiadów w formacie iCalendar
+"""
+
+import io
+import os
+import csv
+import json
+import hashlib
+import zipfile
+import datetime
+from itertools import chain, islice
+
+BUFFER_SIZE = 1 << 16
+
+
+def _date_to_str(date):
+    """Zamienia datę na tekst w formacie 'dzień-miesiąc-rok' szybciej niż metoda strftime"""
+
+    return f"{date.day:02d}-{date.month:02d}-{date.year:04d}"
+
+
+def _peek(entries):
+    """Zwraca pierwszy obiad z planu oraz iterator zwracający wszystkie obiady (łącznie z pierwszym)"""
+
+    entries = iter(entries)
+    first_entry = next(entries, None)
+    if first_entry is None:
+        return None, iter(())
+    return first_entry, chain((first_entry, ), entries)
+
+
+def write_txt(stream, plans, plan_headers=None):
+    """Zapisuje plany obiadów w formacie tekstowym 'dzień-miesiąc-rok --> danie'
+
+    Jeżeli zapisywany jest więcej niż jeden plan, obiady z każdego planu poprzedzone są wierszem z nazwą planu
+
+    Parameters
+    ----------
+    stream : obiekt plikowy
+        strumień tekstowy, do którego zapisywane są plany
+    plans : iterable
+        krotki (nazwa planu, obiady), gdzie obiady są krotkami zawierającymi dane o dniu i obiedzie
+        (lub o dniu, pierwszym daniu i drugim daniu)
+    plan_headers : bool, optional
+        decyduje, czy obiady z każdego planu poprzedzone są wierszem z nazwą planu, domyślnie tylko wtedy,
+        gdy zapisywany jest więcej niż jeden plan - sprawdzane jest to bez odczytywania obiadów z planów
+    """
+
+    if plan_headers is None:
+        plans = iter(plans)
+        first_plans = list(islice(plans, 2))
+        plan_headers = len(first_plans) > 1
+        plans = chain(first_plans, plans)
+
+    for number, (name, entries) in enumerate(plans):
+        if plan_headers:
+            stream.write(("\n" if number else "") + f"Plan '{name}':\n")
+        stream.writelines(f"{_date_to_str(entry[0])} --> {' + '.join(entry[1:])}\n" for entry in entries)
+
+
+def write_csv(stream, plans):
+    """Zapisuje plany obiadów w formacie csv
+
+    Nagłówek pliku zależy od pierwszego zapisywanego obiadu: plan, date, dish dla planów jednodaniowych
+    oraz plan, date, first_course, second_course dla planów dwudaniowych. Daty zapisywane są w formacie ISO
+
+    Parameters
+    ----------
+    stream : obiekt plikowy
+        strumień tekstowy, do którego zapisywane są plany
+    plans : iterable
+        krotki (nazwa planu, obiady)
+    """
+
+    writer = csv.writer(stream)
+    header_written = False
+
+    for name, entries in plans:
+        first_entry, entries = _peek(entries)
+        if first_entry is None:
+            continue
+        if not header_written:
+            writer.writerow(('plan', 'date', 'dish') if len(first_entry) == 2 else
+                            ('plan', 'date', 'first_course', 'second_course'))
+            header_written = True
+        writer.writerows((name, entry[0].isoformat()) + tuple(entry[1:]) for entry in entries)
+
+
+def write_jsonl(stream, plans):
+    """Zapisuje plany obiadów w formacie JSON Lines
+
+    Każdy dzień planu zapisywany jest jako obiekt {"plan": ..., "date": ..., "dish": ...} lub
+    {"plan": ..., "date": ..., "first_course": ..., "second_course": ...} dla planów dwudaniowych
+
+    Parameters
+    ----------
+    stream : obiekt plikowy
+        strumień tekstowy, do którego zapisywane są plany
+    plans : iterable
+        krotki (nazwa planu, obiady)
+    """
+
+    encoder = json.JSONEncoder(ensure_ascii=False)
+
+    for name, entries in plans:
+        for entry in entries:
+            if len(entry) == 2:
+                record = {'plan': name, 'date': entry[0].isoformat(), 'dish': entry[1]}
+            else:
+                record = {'plan': name, 'date': entry[0].isoformat(), 'first_course': entry[1],
+                          'second_course': entry[2]}
+            stream.write(encoder.encode(record) + "\n")
+
+
+def _ics_escape(text):
+    """Zamienia znaki specjalne w tekście zgodnie ze specyfikacją iCalendar (RFC 5545)"""
+
+    return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _ics_fold(line):
+    """Dzieli wiersz dłuższy niż 75 bajtów na wiersze kontynuacji zgodnie ze specyfikacją iCalendar"""
+
+    if len(line.encode('utf-8')) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    part = ''
+    limit = 75
+    for char in line:
+        if len((part + char).encode('utf-8')) > limit:
+            parts.append(part)
+            part = ''
+            limit = 74
+        part += char
+    parts.append(part)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_date(date):
+    """Zamienia datę na tekst w formacie 'RRRRMMDD'"""
+
+    return f"{date.year:04d}{date.month:02d}{date.day:02d}"
+
+
+def write_ics(stream, plans):
+    """Zapisuje plany obiadów w formacie iCalendar
+
+    Każdy dzień planu zapisywany jest jako wydarzenie całodniowe, którego tytułem jest nazwa dania
+    (lub obu dań rozdzielonych znakiem '+'). Identyfikator wydarzenia zależy od nazwy planu i daty,
+    dzięki czemu ponowny import zaktualizowanego planu zastępuje wcześniejsze wydarzenia
+
+    Parameters
+    ----------
+    stream : obiekt plikowy
+        strumień tekstowy, do którego zapisywane są plany
+    plans : iterable
+        krotki (nazwa planu, obiady)
+    """
+
+    one_day = datetime.timedelta(days=1)
+    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    stream.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//lunch-planner//plan obiadow//PL\r\n"
+                 "CALSCALE:GREGORIAN\r\n")
+
+    for name, entries in plans:
+        plan_uid = hashlib.sha1(str(name).encode('utf-8')).hexdigest()[:16]
+        for entry in entries:
+            date = entry[0]
+            stream.write(f"BEGIN:VEVENT\r\nUID:{_ics_date(date)}-{plan_uid}@lunch-planner\r\n"
+                         f"DTSTAMP:{timestamp}\r\nDTSTART;VALUE=DATE:{_ics_date(date)}\r\n"
+                         f"DTEND;VALUE=DATE:{_ics_date(date + one_day)}\r\n"
+                         f"{_ics_fold('SUMMARY:' + _ics_escape(' + '.join(entry[1:])))}"
+                         f"{_ics_fold('CATEGORIES:' + _ics_escape(str(name)))}END:VEVENT\r\n")
+
+    stream.write("END:VCALENDAR\r\n")
+
+
+EXPORTERS = {
+    'txt': write_txt,
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'ics': write_ics,
+}
+
+
+def _file_format(file_name, file_format):
+    """Zwraca nazwę formatu - podaną wprost lub odczytaną z rozszerzenia pliku"""
+
+    if file_format is None:
+        file_format = os.path.splitext(file_name)[1].lstrip('.').lower() or 'txt'
+    if file_format not in EXPORTERS:
+        raise ValueError(f"Nieznany format pliku '{file_format}'. Dostępne formaty: {', '.join(EXPORTERS)}.")
+    return file_format
+
+
+def export_plan(name, entries, file_name, file_format=None, buffer_size=BUFFER_SIZE):
+    """Zapisuje plan obiadów do pliku w podanym formacie
+
+    Parameters
+    ----------
+    name : str
+        nazwa planu
+    entries : iterable
+        krotki zawierające dane o dniu i obiedzie (lub o dniu, pierwszym daniu i drugim daniu)
+    file_name : str
+        ścieżka do zapisywanego pliku
+    file_format : str, optional
+        format pliku (klucz słownika EXPORTERS), domyślnie odczytywany z rozszerzenia pliku
+    buffer_size : int
+        rozmiar bufora zapisu w bajtach
+
+    Raises
+    ----------
+    ValueError
+        zwraca wyjątek, jeżeli format pliku nie jest obsługiwany
+    """
+
+    export_plans([(name, entries)], file_name, file_format, buffer_size=buffer_size)
+
+
+def export_plans(plans, file_name, file_format=None, archive=None, buffer_size=BUFFER_SIZE):
+    """Zapisuje wiele planów obiadów do jednego pliku lub do archiwum .zip
+
+    W archiwum każdy plan zapisywany jest jako osobny plik o nazwie planu z rozszerzeniem formatu
+
+    Parameters
+    ----------
+    plans : iterable
+        krotki (nazwa planu, obiady), gdzie obiady mogą być generatorem
+    file_name : str
+        ścieżka do zapisywanego pliku lub archiwum
+    file_format : str, optional
+        format pliku (klucz słownika EXPORTERS), domyślnie odczytywany z rozszerzenia pliku
+        Dla archiwum domyślnym formatem jest csv
+    archive : bool, optional
+        decyduje, czy plany zapisywane są w archiwum .zip, domyślnie na podstawie rozszerzenia pliku
+    buffer_size : int
+        rozmiar bufora zapisu w bajtach (dla pojedynczego pliku)
+
+    Raises
+    ----------
+    ValueError
+        zwraca wyjątek, jeżeli format pliku nie jest obsługiwany
+    """
+
+    if archive is None:
+        archive = file_name.lower().endswith('.zip')
+
+    if not archive:
+        writer = EXPORTERS[_file_format(file_name, file_format)]
+        with open(file_name, 'w', buffering=buffer_size, encoding='utf-8', newline='') as stream:
+            writer(stream, plans)
+        return
+
+    file_format = _file_format('', file_format or 'csv')
+    writer = EXPORTERS[file_format]
+    used_names = set()
+
+    with zipfile.ZipFile(file_name, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for name, entries in plans:
+            member_name = f"{name}.{file_format}"
+            number = 1
+            while member_name in used_names:
+                number += 1
+                member_name = f"{name}_{number}.{file_format}"
+            used_names.add(member_name)
+
+            member = zipfile.ZipInfo(member_name, datetime.datetime.now().timetuple()[:6])
+            member.compress_type = zipfile.ZIP_DEFLATED
+            # zamknięcie strumienia tekstowego zamyka również plik w archiwum
+            with io.TextIOWrapper(zip_file.open(member, 'w'), encoding='utf-8', newline='') as stream:
+                writer(stream, [(name, entries)])
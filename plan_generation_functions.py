@@ -0,0 +1,257 @@
+"""Moduł zawiera definicje funkcji służących do generowania wielu planów obiadów jednocześnie
+
+Zawiera definicje następujących funkcji:
+    * derive_seed - wyznacza ziarno planu na podstawie ziarna głównego i numeru planu
+    * generate_plans - generuje wiele planów obiadów równolegle w puli procesów
+    * iter_plan_entries - zwraca kolejne obiady z planu zapisanego w postaci tablicy z numerami dań
+    * generate_plans_vectorized - generuje wiele planów obiadów jednocześnie przy użyciu biblioteki NumPy
+
+Biblioteka NumPy jest opcjonalna - jest wymagana tylko przez funkcję 'generate_plans_vectorized'.
+"""
+
+import random
+import hashlib
+import datetime
+import multiprocessing
+from array import array
+from classes import DishPool
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_worker_number_of_dishes = 0
+
+
+def derive_seed(root_seed, index):
+    """Wyznacza ziarno planu na podstawie ziarna głównego i numeru planu
+
+    Ziarno jest skrótem SHA-256 obu liczb, dlatego strumienie liczb losowych kolejnych planów są od siebie
+    niezależne (w przeciwieństwie do ziaren postaci root_seed + index, które dla sąsiednich ziaren głównych
+    dawałyby te same plany przesunięte o jedną pozycję)
+
+    Parameters
+    ----------
+    root_seed : int
+        ziarno główne
+    index : int
+        numer planu
+
+    Returns
+    ----------
+    int
+        64-bitowe ziarno planu
+    """
+
+    digest = hashlib.sha256(f"{root_seed}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def _init_worker(number_of_dishes):
+    """Zapisuje liczbę dań w procesie roboczym - procesy losują numery dań, a nie ich nazwy"""
+
+    global _worker_number_of_dishes
+    _worker_number_of_dishes = number_of_dishes
+
+
+def _generate_plan_ids(spec):
+    """Generuje jeden plan obiadów w postaci tablicy z numerami dań
+
+    Tablica z liczbami całkowitymi jest znacznie tańsza w przesłaniu pomiędzy procesami niż lista krotek
+    """
+
+    name, start_date, end_date, min_interval_time, seed = spec
+    dish_pool = DishPool(range(_worker_number_of_dishes), min_interval_time, random.Random(seed))
+    number_of_days = (end_date - start_date).days + 1
+    return array('I', [dish_pool.draw() for _ in range(number_of_days)])
+
+
+def iter_plan_entries(dish_names, start_date, dish_ids):
+    """Zwraca kolejne obiady z planu zapisanego w postaci tablicy z numerami dań
+
+    Krotki tworzone są dopiero przy odczycie, dzięki czemu plan może zostać zapisany do pliku
+    bez tworzenia listy z całym planem
+
+    Parameters
+    ----------
+    dish_names : list
+        lista nazw dań, których numerem jest pozycja na liście
+    start_date : instancja klasy datetime.date
+        data początkowa planu
+    dish_ids : iterable
+        numery dań na kolejne dni planu
+
+    Yields
+    ----------
+    tuple
+        krotka zawierająca dane o dniu (instancja klasy datetime.date) i obiedzie (str)
+    """
+
+    one_day = datetime.timedelta(days=1)
+    date = start_date
+
+    for dish_id in dish_ids:
+        yield date, dish_names[dish_id]
+        date += one_day
+
+
+def _plan_from_ids(dish_names, start_date, dish_ids):
+    """Zamienia tablicę z numerami dań na listę krotek zawierających dane o dniu i obiedzie"""
+
+    return list(iter_plan_entries(dish_names, start_date, dish_ids))
+
+
+def generate_plans(table, specs, processes=None, chunksize=16, root_seed=None):
+    """Generuje wiele planów obiadów równolegle w puli procesów
+
+    Lista dań pobierana jest z tabeli tylko raz. Procesy robocze losują numery dań z tej listy i zwracają
+    je w postaci tablic, które nie są zamieniane na listy krotek - obiady można odczytać z tablicy dopiero
+    wtedy, gdy są potrzebne (funkcja iter_plan_entries). Każdy plan losowany
+    jest przy użyciu własnego generatora liczb losowych zainicjalizowanego podanym ziarnem, więc wynik
+    nie zależy od liczby procesów ani od kolejności, w jakiej procesy wykonują zadania. Plany bez ziarna
+    (seed równe None) otrzymują ziarno wyznaczone funkcją derive_seed z ziarna głównego i numeru planu
+
+    Parameters
+    ----------
+    table : obiekt klasy Table
+        tabela, na podstawie której tworzone są plany
+    specs : iterable
+        parametry kolejnych planów w postaci krotek (name, start_date, end_date, min_interval_time, seed)
+    processes : int, optional
+        liczba procesów roboczych, domyślnie liczba rdzeni procesora
+        Dla wartości 1 plany generowane są w bieżącym procesie
+    chunksize : int
+        liczba planów przekazywanych do procesu roboczego jednocześnie
+    root_seed : int, optional
+        ziarno główne, z którego wyznaczane są ziarna planów bez ziarna
+
+    Returns
+    ----------
+    tuple
+        krotka zawierająca listę nazw dań oraz listę krotek (name, start_date, dish_ids) w kolejności
+        zgodnej z 'specs', gdzie dish_ids jest tablicą array('I') z numerami dań z listy nazw dań
+
+    Raises
+    ----------
+    ValueError
+        zwraca wyjątek, jeżeli w tabeli jest mniej dań niż wynosi min_interval_time któregoś z planów
+    """
+
+    dish_names = [dish[0] for dish in table.list_dishes()]
+    # ziarna wyznaczane są w procesie głównym, przed podziałem planów pomiędzy procesy robocze
+    specs = [spec if spec[4] is not None or root_seed is None else spec[:4] + (derive_seed(root_seed, index), )
+             for index, spec in enumerate(specs)]
+
+    if processes == 1:
+        _init_worker(len(dish_names))
+        plans_ids = [_generate_plan_ids(spec) for spec in specs]
+    else:
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(len(dish_names),)) as pool:
+            plans_ids = pool.map(_generate_plan_ids, specs, chunksize)
+
+    return dish_names, [(spec[0], spec[1], dish_ids) for spec, dish_ids in zip(specs, plans_ids)]
+
+
+def generate_plans_vectorized(table, number_of_plans, start_date, end_date, min_interval_time, seed=None,
+                              as_ids=True, block_size=10000):
+    """Generuje wiele planów obiadów jednocześnie przy użyciu biblioteki NumPy
+
+    Dania reprezentowane są przez numery (indeksy na liście nazw dań). Dla każdego planu przechowywana jest
+    tablica z pulą dań oraz bufor cykliczny z daniami z ostatnich (min_interval_time - 1) dni, a losowanie
+    obiadu na dany dzień odbywa się jednocześnie dla wszystkich planów z bloku. Wylosowane danie trafia
+    do bufora, a danie wypadające z bufora zajmuje jego miejsce w puli - dzięki temu zachowany jest ten sam
+    warunek niepowtarzania się obiadów co w metodzie LunchPlan.make_plan
+
+    Parameters
+    ----------
+    table : obiekt klasy Table
+        tabela, na podstawie której tworzone są plany
+    number_of_plans : int
+        liczba generowanych planów
+    start_date : instancja klasy datetime.date
+        data początkowa planów
+    end_date : instancja klasy datetime.date
+        data końcowa planów
+    min_interval_time : int
+        odstęp czasu liczony w dniach, w którym żaden obiad nie może się powtórzyć
+    seed : int, optional
+        ziarno główne - każdy blok planów losowany jest przy użyciu osobnego, niezależnego strumienia
+        liczb losowych (numpy.random.SeedSequence.spawn), więc wynik zależy tylko od ziarna i wielkości bloku
+    as_ids : bool
+        decyduje o postaci zwracanych planów - tablica z numerami dań lub listy krotek
+    block_size : int
+        maksymalna liczba planów generowanych jednocześnie - ogranicza zużycie pamięci
+
+    Returns
+    ----------
+    tuple lub list
+        dla as_ids=True krotka zawierająca listę nazw dań oraz tablicę numpy.ndarray o wymiarach
+        (liczba planów, liczba dni) z numerami dań, a dla as_ids=False lista planów, z których każdy
+        jest listą krotek zawierających dane o dniu i obiedzie
+
+    Raises
+    ----------
+    ImportError
+        zwraca wyjątek, jeżeli biblioteka NumPy nie jest zainstalowana
+    ValueError
+        zwraca wyjątek, jeżeli w tabeli jest mniej dań niż wynosi min_interval_time
+    """
+
+    if numpy is None:
+        raise ImportError("Generowanie planów przy użyciu wektoryzacji wymaga biblioteki NumPy.")
+
+    dish_names = list(dict.fromkeys(dish[0] for dish in table.list_dishes()))
+    number_of_dishes = len(dish_names)
+    window_size = max(min_interval_time - 1, 0)
+    number_of_days = (end_date - start_date).days + 1
+
+    if number_of_dishes <= window_size or not number_of_dishes:
+        raise ValueError(f"Liczba dań ({number_of_dishes}) jest zbyt mała, aby stworzyć plan, w którym obiad "
+                         f"nie powtarza się przez {min_interval_time} dni.")
+
+    first_plans = range(0, number_of_plans, block_size)
+    block_seeds = numpy.random.SeedSequence(seed).spawn(len(first_plans))
+    plan_ids = numpy.empty((number_of_plans, max(number_of_days, 0)), dtype=numpy.uint32)
+
+    for first_plan, block_seed in zip(first_plans, block_seeds):
+        last_plan = min(first_plan + block_size, number_of_plans)
+        plan_ids[first_plan:last_plan] = _generate_block(numpy.random.default_rng(block_seed),
+                                                         last_plan - first_plan, number_of_dishes,
+                                                         window_size, number_of_days)
+
+    if as_ids:
+        return dish_names, plan_ids
+
+    return [_plan_from_ids(dish_names, start_date, dish_ids.tolist()) for dish_ids in plan_ids]
+
+
+def _generate_block(rng, number_of_plans, number_of_dishes, window_size, number_of_days):
+    """Generuje blok planów w postaci tablicy z numerami dań o wymiarach (liczba planów, liczba dni)"""
+
+    rows = numpy.arange(number_of_plans)
+    pool = numpy.tile(numpy.arange(number_of_dishes, dtype=numpy.uint32), (number_of_plans, 1))
+    window = numpy.empty((number_of_plans, max(window_size, 1)), dtype=numpy.uint32)
+    block = numpy.empty((number_of_plans, max(number_of_days, 0)), dtype=numpy.uint32)
+
+    for day in range(number_of_days):
+        if day < window_size:
+            # okno wykluczeń jeszcze się zapełnia - wylosowane danie przenoszone jest na koniec puli
+            pool_size = number_of_dishes - day
+            positions = rng.integers(0, pool_size, number_of_plans)
+            chosen = pool[rows, positions]
+            pool[rows, positions] = pool[:, pool_size - 1]
+            pool[:, pool_size - 1] = chosen
+            window[:, day] = chosen
+        else:
+            positions = rng.integers(0, number_of_dishes - window_size, number_of_plans)
+            chosen = pool[rows, positions]
+            if window_size:
+                slot = day % window_size
+                pool[rows, positions] = window[:, slot]
+                window[:, slot] = chosen
+
+        block[:, day] = chosen
+
+    return block
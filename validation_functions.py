@@ -6,6 +6,7 @@ Zawiera definicje następujących funkcji:
     * new_record_validation - pyta użytkownika, czy chce dodać lub usunąć kolejny rekord w tabeli
     * add_new_dish_validation - pyta użytkownika o nazwę dania, które chce wprowadzić do tabeli
     * delete_dish_validation - pyta użytkownika o nazwę dania, które chce usunąć z tabeli
+    * yes_no_validation - zadaje użytkownikowi pytanie, na które należy odpowiedzieć 'tak' lub 'nie'
     * lunch_planner_validation - pyta użytkownika o parametry dotyczące tworzonego planu obiadów
 """
 
@@ -113,6 +114,9 @@ def add_new_dish_validation(table):
 
     Sprwdza, czy danie znajduje się już w tabeli
     Jeżeli znajduje się - wyświetlany jest komunikat o niemożliwości ponownego wprowadzenia dania
+    Dania różniące się od dań z tabeli jedynie wielkością liter, znakami diakrytycznymi lub interpunkcją
+    również nie mogą zostać wprowadzone, a w przypadku dań o podobnych nazwach (np. z literówką)
+    użytkownik musi potwierdzić, że chce je wprowadzić
 
     Parameters
     ----------
@@ -124,15 +128,24 @@ def add_new_dish_validation(table):
     dish_name : str
         nazwa dania wprowadzanego do tabeli
     """
-    unavailable_choices = [dish[0] for dish in table.list_dishes()]
-
     while True:
         dish_name = input("Nazwa dania: ")
 
-        if dish_name not in unavailable_choices:
-            return dish_name
-        else:
+        if table.contains(dish_name):
             print(f"{dish_name.title()} już istnieje w tabeli! Podaj inne danie.")
+            continue
+
+        similar = table.find_similar(dish_name, limit=3)
+        if not similar:
+            return dish_name
+        if similar[0][1] == 1:
+            print(f"{dish_name.title()} już istnieje w tabeli jako '{similar[0][0]}'! Podaj inne danie.")
+            continue
+
+        print(f"W tabeli znajdują się podobne dania: "
+              f"{', '.join(f'{name} ({similarity:.0%})' for name, similarity in similar)}.")
+        if yes_no_validation("Czy mimo to chcesz dodać to danie?"):
+            return dish_name
 
 
 def delete_dish_validation(table):
@@ -140,6 +153,7 @@ def delete_dish_validation(table):
 
     Sprwdza, czy danie znajduje się w tabeli
     Jeżeli nie znajduje się - wyświetlany jest komunikat o niemożliwości usunięcia dania
+    wraz z podobnymi daniami znalezionymi metodą 'search' klasy Table
 
     Parameters
     ----------
@@ -152,15 +166,39 @@ def delete_dish_validation(table):
         nazwa dania usuwanego z tabeli
     """
 
-    available_choices = [dish[0] for dish in table.list_dishes()]
-
     while True:
         dish_name = input("Nazwa dania: ")
 
-        if dish_name in available_choices:
+        if table.contains(dish_name):
             return dish_name
         else:
             print(f"{dish_name.title()} nie istnieje w tabeli! Podaj inne danie do usunięcia.")
+            suggestions = table.search(dish_name, 5)
+            if suggestions:
+                print(f"Czy chodziło o: {', '.join(name for name, _ in suggestions)}?")
+
+
+def yes_no_validation(question):
+    """Zadaje użytkownikowi pytanie, na które należy odpowiedzieć 'tak' lub 'nie'
+
+    Parameters
+    ----------
+    question : str
+        treść pytania
+
+    Returns
+    ----------
+    bool
+        True, jeżeli użytkownik odpowiedział 'tak'
+    """
+
+    while True:
+        user_choice = input(f"{question} Wpisz 'tak' lub 'nie': ")
+
+        if user_choice in ('tak', 'nie'):
+            return user_choice == 'tak'
+        else:
+            print("Podano wartość spoza dostepnych możliwości!")
 
 
 def lunch_planner_validation(table):
@@ -222,7 +260,7 @@ def lunch_planner_validation(table):
 
     while True:
         try:
-            number_of_dishes = len(table.list_dishes())
+            number_of_dishes = table.count_dishes()
             min_time_interval = input(f"Podaj minimalny odstęp czasu liczony w dniach, w którym żaden obiad nie może "
                                       f"się powtórzyć (większy lub równy 2, ale nie większy niż liczba dań w bazie "
                                       f"równa {number_of_dishes}): ")